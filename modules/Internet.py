@@ -7,11 +7,10 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from Crypto.Protocol.KDF import PBKDF2
 from Crypto.Cipher import AES
+from modules import rateLimiter
 import secretstorage
 import requests
 import sqlite3
-import random
-import time
 import sys
 import os
 
@@ -21,7 +20,7 @@ def downloadImage(url: str, destinationFile: str, headers: dict = {}) -> None:
     Downloads an image from the given URL and saves it to the specified destination file.
 
     It doesn't download if the file already existst and
-    it will wait to be polite.
+    it will wait for the rate limiter of the host to be polite.
 
     Args:
         - url (str): The URL of the image to be downloaded.
@@ -34,16 +33,17 @@ def downloadImage(url: str, destinationFile: str, headers: dict = {}) -> None:
     # Check if the file already exists
     if not os.path.isfile(destinationFile):
 
+        # Be polite
+        rateLimiter.LIMITER.acquire(url)
+
         response = requests.get(url, headers=headers)
+        rateLimiter.LIMITER.update(url, response.status_code, response.headers)
 
         if response.status_code == 200:
 
             with open(destinationFile, "wb") as f:
                 f.write(response.content)
 
-        # Be polite
-        time.sleep(random.uniform(0.1, 1))
-
 
 def configureChrome() -> WebDriver:
     """
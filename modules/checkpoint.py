@@ -0,0 +1,174 @@
+import networkx as nx
+import threading
+import sqlite3
+import copy
+import json
+import time
+
+
+class GraphCheckpoint:
+    def __init__(self, path: str = "graphCheckpoint.sqlite", interval: float = 30.0):
+        """
+        Initialize the GraphCheckpoint.
+
+        It is an append-only log, in a SQLite database, of the changes
+        that a long pass makes to a graph: the nodes that are added or
+        whose search flags change and the edges that are added. The
+        changes are committed every "interval" seconds, always after
+        a whole node, so if the pass stops the log has the finished
+        nodes with their marks and none of the half-searched ones.
+        A relation that fails in the middle of its pages is removed
+        from the batch before the flush, so its edges aren't logged.
+
+        To resume, restore is called with the graph that the first
+        pass received and the result is passed to the managers again.
+        The nodes in the log are marked with their search flags so they
+        are not downloaded again, but the nodes they added are
+        now in the graph, so the resumed pass also searches them.
+        The changes of the resumed pass go to the same log.
+
+        Args:
+            - path (str): The path of the SQLite database.
+            - interval (float): The minimum seconds between commits.
+
+        Returns:
+            - None
+        """
+        self.path = path
+        self.interval = interval
+        self.lastCommit = time.monotonic()
+
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS nodes (
+                node TEXT PRIMARY KEY,
+                attributes TEXT NOT NULL
+            )
+            """)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS edges (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                u TEXT NOT NULL,
+                v TEXT NOT NULL,
+                attributes TEXT NOT NULL
+            )
+            """)
+        self.connection.commit()
+
+    def record(self, graph: nx.MultiDiGraph, nodes: list, edges: list) -> None:
+        """
+        Add changes to the log.
+
+        The nodes are stored with all their current attributes,
+        replacing the ones stored before.
+
+        Args:
+            - graph (nx.MultiDiGraph): The graph that has been modified.
+            - nodes (list): The nodes that were added or modified.
+            - edges (list): The edges that were added as (u, v, attributes).
+
+        Returns:
+            - None
+        """
+        with self.lock:
+            self.connection.executemany(
+                "INSERT INTO nodes (node, attributes) VALUES (?, ?) "
+                "ON CONFLICT(node) DO UPDATE SET attributes = excluded.attributes",
+                [(node, json.dumps(graph.nodes[node])) for node in nodes],
+            )
+            self.connection.executemany(
+                "INSERT INTO edges (u, v, attributes) VALUES (?, ?, ?)",
+                [(u, v, json.dumps(attributes)) for u, v, attributes in edges],
+            )
+
+    def save(self, force: bool = False) -> bool:
+        """
+        Commit the changes if "interval" seconds have passed since the last commit.
+
+        It must be called between nodes, never in the middle of one.
+
+        Args:
+            - force (bool): Whether to commit without checking the interval.
+
+        Returns:
+            - bool: True if it committed.
+        """
+        if not force and time.monotonic() - self.lastCommit < self.interval:
+            return False
+
+        with self.lock:
+            self.connection.commit()
+
+        self.lastCommit = time.monotonic()
+        return True
+
+    def restore(self, graph: nx.MultiDiGraph, inplace: bool = False) -> nx.MultiDiGraph:
+        """
+        Apply the changes in the log to a graph.
+
+        The graph must be the one that the first pass received,
+        because the edges are added again. The types are restored
+        as tuples, because JSON doesn't keep them.
+
+        Args:
+            - graph (nx.MultiDiGraph): The graph the log started from.
+            - inplace (bool): Whether to modify the given graph instead of a copy.
+
+        Returns:
+            - nx.MultiDiGraph: The graph with the changes.
+        """
+        if not inplace:
+            graph = copy.deepcopy(graph)
+
+        with self.lock:
+            nodes = self.connection.execute(
+                "SELECT node, attributes FROM nodes ORDER BY rowid"
+            ).fetchall()
+            edges = self.connection.execute(
+                "SELECT u, v, attributes FROM edges ORDER BY id"
+            ).fetchall()
+
+        for node, attributes in nodes:
+            attributes = json.loads(attributes)
+            if "type" in attributes:
+                attributes["type"] = tuple(attributes["type"])
+
+            # It also updates the nodes that are in the graph
+            graph.add_node(node, **attributes)
+
+        graph.add_edges_from(
+            (u, v, json.loads(attributes)) for u, v, attributes in edges
+        )
+
+        return graph
+
+    def clear(self) -> None:
+        """
+        Remove all the changes, for example after the graph has been saved.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        with self.lock:
+            self.connection.execute("DELETE FROM nodes")
+            self.connection.execute("DELETE FROM edges")
+            self.connection.commit()
+
+    def close(self) -> None:
+        """
+        Commit the pending changes and close the database.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.save(force=True)
+
+        with self.lock:
+            self.connection.close()
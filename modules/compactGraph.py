@@ -0,0 +1,519 @@
+from modules import searchFlags
+import networkx as nx
+import numpy as np
+import json
+import os
+
+# The code of the nodes without a type or a color
+MISSING = -1
+
+# The version of the files written by save
+FORMAT_VERSION = 1
+
+# The arrays saved as .npy files
+NODE_ARRAYS = ("types", "colors", "flags")
+EDGE_ARRAYS = ("sources", "targets", "edgeRelations")
+
+
+class CompactGraph:
+    """
+    A read only copy of a crawled graph that uses much less memory.
+
+    Each URL is stored once and the nodes are referred to by
+    their position in "urls", an int32 id. The "type" and the
+    "color" of the nodes are repeated a lot, so they are kept
+    once in a table and each node only has the int16 code of
+    its entry. The search flags are an int64 array and the rest
+    of the attributes, like "searchInfo", are only kept for
+    the nodes that have them.
+
+    The edges are three arrays in COO format: the source, the
+    target and the code of their attributes in "relations",
+    which is {} or {"label": ...} in the graphs of the managers.
+    The CSR arrays of each relation are built when they are needed.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty CompactGraph.
+
+        It is normally created with fromNetworkx.
+
+        Returns:
+            - None
+        """
+        self.urls = []
+        self.ids = {}
+
+        self.typeTable = []
+        self.colorTable = []
+        self.relations = []
+
+        self.types = np.zeros(0, dtype=np.int16)
+        self.colors = np.zeros(0, dtype=np.int16)
+        self.flags = np.zeros(0, dtype=np.int64)
+        self.attributes = {}
+
+        self.sources = np.zeros(0, dtype=np.int32)
+        self.targets = np.zeros(0, dtype=np.int32)
+        self.edgeRelations = np.zeros(0, dtype=np.int16)
+
+        self.csrCache = {}
+
+    @classmethod
+    def fromNetworkx(cls, graph: nx.MultiDiGraph) -> "CompactGraph":
+        """
+        Create a CompactGraph from a networkx graph.
+
+        The nodes and the edges keep the order of the graph.
+
+        Args:
+            - graph (nx.MultiDiGraph): The graph to convert.
+
+        Returns:
+            - CompactGraph: The compact copy.
+        """
+        compact = cls()
+
+        typeCodes = {}
+        colorCodes = {}
+        relationCodes = {}
+
+        types = []
+        colors = []
+        flags = []
+
+        for node, attributes in graph.nodes(data=True):
+            compact.ids[node] = len(compact.urls)
+            compact.urls.append(node)
+
+            rest = dict(attributes)
+
+            if "type" in rest:
+                nodeType = rest.pop("type")
+                # The managers of Steam use lists, so the class is kept too
+                key = (type(nodeType) is list, tuple(nodeType))
+                if key not in typeCodes:
+                    typeCodes[key] = len(compact.typeTable)
+                    compact.typeTable.append(list(key[1]) if key[0] else key[1])
+                types.append(typeCodes[key])
+            else:
+                types.append(MISSING)
+
+            if "color" in rest:
+                color = rest.pop("color")
+                if color not in colorCodes:
+                    colorCodes[color] = len(compact.colorTable)
+                    compact.colorTable.append(color)
+                colors.append(colorCodes[color])
+            else:
+                colors.append(MISSING)
+
+            flags.append(rest.pop(searchFlags.FLAGS_ATTRIBUTE, 0))
+
+            if rest:
+                compact.attributes[compact.ids[node]] = rest
+
+        sources = []
+        targets = []
+        edgeRelations = []
+
+        for u, v, attributes in graph.edges(data=True):
+            key = tuple(sorted(attributes.items()))
+            if key not in relationCodes:
+                relationCodes[key] = len(compact.relations)
+                compact.relations.append(dict(attributes))
+
+            sources.append(compact.ids[u])
+            targets.append(compact.ids[v])
+            edgeRelations.append(relationCodes[key])
+
+        compact.types = np.array(types, dtype=np.int16)
+        compact.colors = np.array(colors, dtype=np.int16)
+        compact.flags = np.array(flags, dtype=np.int64)
+
+        compact.sources = np.array(sources, dtype=np.int32)
+        compact.targets = np.array(targets, dtype=np.int32)
+        compact.edgeRelations = np.array(edgeRelations, dtype=np.int16)
+
+        return compact
+
+    def __len__(self) -> int:
+        """
+        Get the number of nodes.
+        """
+        return len(self.types)
+
+    def __contains__(self, node: str) -> bool:
+        """
+        Check if a URL is a node of the graph.
+        """
+        return node in self.ids
+
+    def checkURLs(self) -> None:
+        """
+        Check that the URLs of the nodes were loaded.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        if len(self.urls) != len(self):
+            raise ValueError(
+                "The URLs of the nodes weren't loaded, load the graph with nodes=True"
+            )
+
+    def save(self, path: str) -> None:
+        """
+        Save the graph in a folder.
+
+        The arrays are .npy files that load can map into memory,
+        the URLs are a text file with one per line and the tables
+        and the rest of the attributes of the nodes are JSON.
+
+        Args:
+            - path (str): The folder, it is created if it doesn't exist.
+
+        Returns:
+            - None
+        """
+        self.checkURLs()
+
+        if any(not isinstance(url, str) or "\n" in url for url in self.urls):
+            raise ValueError("The nodes must be strings without line breaks")
+
+        os.makedirs(path, exist_ok=True)
+
+        for name in NODE_ARRAYS + EDGE_ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+
+        with open(os.path.join(path, "urls.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(self.urls))
+
+        with open(os.path.join(path, "attributes.json"), "w", encoding="utf-8") as f:
+            json.dump(self.attributes, f)
+
+        # It is written the last so a folder with it is complete
+        with open(os.path.join(path, "metadata.json"), "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": FORMAT_VERSION,
+                    "nodes": len(self),
+                    "edges": self.numberOfEdges(),
+                    "typeTable": self.typeTable,
+                    "listTypes": [
+                        code
+                        for code, nodeType in enumerate(self.typeTable)
+                        if isinstance(nodeType, list)
+                    ],
+                    "colorTable": self.colorTable,
+                    "relations": self.relations,
+                },
+                f,
+            )
+
+    @classmethod
+    def load(
+        cls, path: str, mmap: bool = True, nodes: bool = True, edges: bool = True
+    ) -> "CompactGraph":
+        """
+        Load a graph saved with save.
+
+        With mmap the arrays are mapped into memory instead of read,
+        so the edges are only read from the disk when they are used.
+        The URLs and the attributes are the slow part, so they can be
+        skipped with nodes=False when only the structure is needed,
+        and the edges with edges=False when only the nodes are.
+        Without the nodes only the arrays can be used: the methods
+        that give URLs, like toNetworkx, raise a ValueError. Without
+        the edges the graph has none.
+
+        Args:
+            - path (str): The folder.
+            - mmap (bool): Whether to map the arrays instead of reading them.
+            - nodes (bool): Whether to read the URLs and the attributes.
+            - edges (bool): Whether to load the edges.
+
+        Returns:
+            - CompactGraph: The graph. The mapped arrays are read only.
+        """
+        with open(os.path.join(path, "metadata.json"), encoding="utf-8") as f:
+            metadata = json.load(f)
+
+        if metadata["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unknown graph format version: {metadata['version']}")
+
+        compact = cls()
+        listTypes = set(metadata.get("listTypes", []))
+        compact.typeTable = [
+            nodeType if code in listTypes else tuple(nodeType)
+            for code, nodeType in enumerate(metadata["typeTable"])
+        ]
+        compact.colorTable = metadata["colorTable"]
+        compact.relations = metadata["relations"]
+
+        names = NODE_ARRAYS + (EDGE_ARRAYS if edges else ())
+        for name in names:
+            array = np.load(
+                os.path.join(path, f"{name}.npy"), mmap_mode="r" if mmap else None
+            )
+            setattr(compact, name, array)
+
+        if nodes and metadata["nodes"]:
+            with open(os.path.join(path, "urls.txt"), encoding="utf-8") as f:
+                compact.urls = f.read().split("\n")
+            compact.ids = dict(zip(compact.urls, range(len(compact.urls))))
+
+            with open(os.path.join(path, "attributes.json"), encoding="utf-8") as f:
+                compact.attributes = {
+                    int(nodeId): attributes
+                    for nodeId, attributes in json.load(f).items()
+                }
+
+        return compact
+
+    def numberOfEdges(self) -> int:
+        """
+        Get the number of edges.
+
+        Args:
+            - None
+
+        Returns:
+            - int: The number of edges.
+        """
+        return len(self.sources)
+
+    def getAttributes(self, nodeId: int) -> dict:
+        """
+        Get the attributes of a node like they are in networkx.
+
+        Args:
+            - nodeId (int): The id of the node.
+
+        Returns:
+            - dict: A new dict with the attributes.
+        """
+        attributes = {}
+
+        if self.types[nodeId] != MISSING:
+            attributes["type"] = self.typeTable[self.types[nodeId]]
+
+        if self.colors[nodeId] != MISSING:
+            attributes["color"] = self.colorTable[self.colors[nodeId]]
+
+        if self.flags[nodeId]:
+            attributes[searchFlags.FLAGS_ATTRIBUTE] = int(self.flags[nodeId])
+
+        attributes.update(self.attributes.get(nodeId, {}))
+
+        return attributes
+
+    def getRelation(self, label: str = None) -> int:
+        """
+        Get the code of the edges with a label.
+
+        Args:
+            - label (str): The "label" of the edges, None for the edges without it.
+
+        Returns:
+            - int: The code in "relations" or MISSING if there are no such edges.
+        """
+        for code, attributes in enumerate(self.relations):
+            if attributes.get("label") == label:
+                return code
+
+        return MISSING
+
+    def csr(self, relation: int = None, reverse: bool = False) -> tuple:
+        """
+        Get the edges of a relation in CSR format.
+
+        The neighbours of the node i are indices[indptr[i]:indptr[i + 1]].
+
+        Args:
+            - relation (int): The code of the relation, None for all the edges.
+            - reverse (bool): Whether to group the edges by the
+                target to get the predecessors instead.
+
+        Returns:
+            - np.ndarray: The indptr, with len(self) + 1 elements.
+            - np.ndarray: The indices.
+        """
+        key = (relation, reverse)
+
+        if key not in self.csrCache:
+            sources, targets = self.sources, self.targets
+            if reverse:
+                sources, targets = targets, sources
+
+            if relation is not None:
+                mask = self.edgeRelations == relation
+                sources, targets = sources[mask], targets[mask]
+
+            order = np.argsort(sources, kind="stable")
+            indptr = np.zeros(len(self) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(sources, minlength=len(self)), out=indptr[1:])
+
+            self.csrCache[key] = (indptr, targets[order])
+
+        return self.csrCache[key]
+
+    def successors(self, node: str, relation: int = None) -> list:
+        """
+        Get the successors of a node, each one once.
+
+        Args:
+            - node (str): The URL of the node.
+            - relation (int): The code of the relation, None for all the edges.
+
+        Returns:
+            - list: The URLs of the successors.
+        """
+        return self.getNeighbors(node, relation, False)
+
+    def predecessors(self, node: str, relation: int = None) -> list:
+        """
+        Get the predecessors of a node, each one once.
+
+        Args:
+            - node (str): The URL of the node.
+            - relation (int): The code of the relation, None for all the edges.
+
+        Returns:
+            - list: The URLs of the predecessors.
+        """
+        return self.getNeighbors(node, relation, True)
+
+    def getNeighbors(self, node: str, relation: int, reverse: bool) -> list:
+        """
+        Get the successors or the predecessors of a node.
+
+        Args:
+            - node (str): The URL of the node.
+            - relation (int): The code of the relation, None for all the edges.
+            - reverse (bool): Whether to get the predecessors.
+
+        Returns:
+            - list: The URLs of the neighbours, each one once.
+        """
+        self.checkURLs()
+
+        indptr, indices = self.csr(relation, reverse)
+        nodeId = self.ids[node]
+        neighbors = indices[indptr[nodeId] : indptr[nodeId + 1]]
+
+        return [self.urls[n] for n in dict.fromkeys(neighbors.tolist())]
+
+    def nodesOfType(self, *words: str) -> list:
+        """
+        Get the nodes that have all the words in their "type".
+
+        Only the table of the types is checked with the words,
+        the nodes are selected with their codes.
+
+        Args:
+            - words (str): The words.
+
+        Returns:
+            - list: The URLs of the nodes, in order.
+        """
+        self.checkURLs()
+
+        if not words:
+            return list(self.urls)
+
+        codes = [
+            code
+            for code, nodeType in enumerate(self.typeTable)
+            if all(word in nodeType for word in words)
+        ]
+
+        return [self.urls[n] for n in np.flatnonzero(np.isin(self.types, codes))]
+
+    def neighborhood(self, nodes: list, radius: int = 1) -> list:
+        """
+        Get the nodes that are at most some edges away
+        from some nodes, without looking at the direction.
+
+        Args:
+            - nodes (list): The URLs of the starting nodes.
+            - radius (int): The maximum number of edges.
+
+        Returns:
+            - list: The URLs of the nodes, in order.
+        """
+        self.checkURLs()
+
+        found = np.zeros(len(self), dtype=bool)
+        frontier = np.array([self.ids[node] for node in nodes], dtype=np.int64)
+        found[frontier] = True
+
+        for _ in range(radius):
+            reached = []
+
+            for reverse in (False, True):
+                indptr, indices = self.csr(reverse=reverse)
+                for n in frontier:
+                    reached.append(indices[indptr[n] : indptr[n + 1]])
+
+            if not reached:
+                break
+
+            reached = np.unique(np.concatenate(reached))
+            frontier = reached[~found[reached]]
+            found[frontier] = True
+
+            if not len(frontier):
+                break
+
+        return [self.urls[n] for n in np.flatnonzero(found)]
+
+    def toNetworkx(
+        self, nodes: list = None, graphClass: type = nx.MultiDiGraph
+    ) -> nx.MultiDiGraph:
+        """
+        Create a networkx graph with some of the nodes and the edges between them.
+
+        The result can be used with the functions of graph,
+        like createHTML or removeUnconnectedNodes.
+
+        Args:
+            - nodes (list): The URLs of the nodes. If it is None all of them.
+            - graphClass (type): The class of the graph, like graphIndex.IndexedGraph.
+
+        Returns:
+            - nx.MultiDiGraph: The graph.
+        """
+        self.checkURLs()
+
+        if nodes is None:
+            keep = np.ones(len(self), dtype=bool)
+        else:
+            keep = np.zeros(len(self), dtype=bool)
+            keep[[self.ids[node] for node in nodes]] = True
+
+        graph = graphClass()
+
+        graph.add_nodes_from(
+            (self.urls[n], self.getAttributes(n)) for n in np.flatnonzero(keep)
+        )
+
+        edges = np.flatnonzero(keep[self.sources] & keep[self.targets])
+
+        graph.add_edges_from(
+            (
+                self.urls[u],
+                self.urls[v],
+                dict(self.relations[r]),
+            )
+            for u, v, r in zip(
+                self.sources[edges].tolist(),
+                self.targets[edges].tolist(),
+                self.edgeRelations[edges].tolist(),
+            )
+        )
+
+        return graph
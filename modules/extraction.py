@@ -0,0 +1,217 @@
+from bs4 import BeautifulSoup, SoupStrainer
+from modules import metrics
+from typing import Callable
+import importlib.util
+import html as htmlLib
+import time
+import os
+import re
+
+# lxml is much faster than the parser of the standard library
+PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+EXTRACTORS = {}
+
+NEXT_LINK = re.compile(r"<a\b([^>]*)>Next</a>")
+HREF = re.compile(r"""\bhref=["']([^"']*)["']""")
+
+
+class Extractor:
+    def __init__(
+        self,
+        name: str,
+        extract: Callable[[BeautifulSoup], object],
+        strainer: SoupStrainer = None,
+        stopAfter: str = None,
+        paginated: bool = False,
+    ) -> None:
+        """
+        Initialize the Extractor.
+
+        An extractor only builds the part of the tree that the
+        "strainer" matches and stops reading the HTML after the
+        "stopAfter" marker, so it does much less work than parsing
+        the whole page.
+
+        The extractor is registered in EXTRACTORS with its name.
+
+        Args:
+            - name (str): The name of the extractor.
+            - extract (Callable): The function that gets the data from the tree.
+                It must give the same result with the whole tree.
+            - strainer (SoupStrainer): The elements that are needed. If it
+                is None the whole page is parsed.
+            - stopAfter (str): The text after which the HTML can be ignored.
+            - paginated (bool): Whether it also returns the 'Next' link of the page.
+
+        Returns:
+            - None
+        """
+        self.name = name
+        self.extract = extract
+        self.strainer = strainer
+        self.stopAfter = stopAfter
+        self.paginated = paginated
+
+        EXTRACTORS[name] = self
+
+    def __call__(self, html: str) -> object:
+        """
+        Extract the data from a page.
+
+        The time it takes is registered in metrics.REGISTRY.
+
+        Args:
+            - html (str): The HTML of the page.
+
+        Returns:
+            - object: The result of the extract function. If the extractor
+                is paginated, a tuple with it and the href of the 'Next' link.
+        """
+        start = time.perf_counter()
+
+        if self.stopAfter:
+            position = html.find(self.stopAfter)
+            if position != -1:
+                html = html[: position + len(self.stopAfter)]
+
+        soup = BeautifulSoup(html, PARSER, parse_only=self.strainer)
+        result = self.extract(soup)
+
+        if self.paginated:
+            result = result, findNextLink(html)
+
+        metrics.REGISTRY.recordParse(self.name, time.perf_counter() - start)
+        return result
+
+
+def classRegex(*classes: str) -> re.Pattern:
+    """
+    Get a regular expression that matches a class attribute
+    containing any of the given classes.
+
+    The strainers see the class attribute as a single string,
+    so passing the class name alone only matches elements
+    that have no other classes.
+
+    Args:
+        - classes (str): The classes to look for.
+
+    Returns:
+        - re.Pattern: The regular expression.
+    """
+    options = "|".join(re.escape(c) for c in classes)
+    return re.compile(rf"(^|\s)({options})(\s|$)")
+
+
+def findNextLink(html: str) -> str:
+    """
+    Find the href of the 'Next' button of a page.
+
+    It uses a regular expression so it doesn't need a tree.
+
+    Args:
+        - html (str): The HTML of the page.
+
+    Returns:
+        - str: The href or None if there is no 'Next' link.
+    """
+    match = NEXT_LINK.search(html)
+
+    if not match:
+        return None
+
+    href = HREF.search(match.group(1))
+
+    if not href:
+        return None
+
+    return htmlLib.unescape(href.group(1))
+
+
+def extract(name: str, html: str) -> object:
+    """
+    Extract the data from a page with a registered extractor.
+
+    Args:
+        - name (str): The name of the extractor.
+        - html (str): The HTML of the page.
+
+    Returns:
+        - object: The result of the extractor.
+    """
+    return EXTRACTORS[name](html)
+
+
+def loadPages(folder: str) -> dict:
+    """
+    Load saved pages to use in the benchmark.
+
+    The name of each file must start with the type of the
+    page followed by an underscore, for example
+    "connections_torvalds.html".
+
+    Args:
+        - folder (str): The folder with the pages.
+
+    Returns:
+        - dict: The type of the page as key and the list of pages as value.
+    """
+    pages = {}
+
+    for filename in sorted(os.listdir(folder)):
+        if filename.endswith(".html"):
+            name = filename.split("_")[0]
+            with open(os.path.join(folder, filename), encoding="utf-8") as f:
+                pages.setdefault(name, []).append(f.read())
+
+    return pages
+
+
+def benchmark(pages: dict, parsers: dict, repeat: int = 3) -> dict:
+    """
+    Compare the parsers that use the extractors with the original ones.
+
+    The original parsers build the tree of the whole page with
+    html.parser. It checks that both give the same output
+    and measures the time that each one needs.
+
+    Args:
+        - pages (dict): The type of the page as key and the
+            list of pages as value, like loadPages returns.
+        - parsers (dict): The type of the page as key and a tuple
+            with the new parser and the original one as value.
+            Both get the HTML of a page.
+        - repeat (int): The number of times each page is parsed.
+
+    Returns:
+        - dict: For each type of page a dict with the keys
+            "full" (seconds), "fast" (seconds), "speedup" and "equal".
+    """
+    results = {}
+
+    for name, htmls in pages.items():
+        fastParser, fullParser = parsers[name]
+
+        equal = all(fastParser(html) == fullParser(html) for html in htmls)
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for html in htmls:
+                fullParser(html)
+        full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for html in htmls:
+                fastParser(html)
+        fast = time.perf_counter() - start
+
+        results[name] = {
+            "full": full,
+            "fast": fast,
+            "speedup": full / fast if fast else float("inf"),
+            "equal": equal,
+        }
+
+    return results
@@ -1,3 +1,4 @@
+from modules import httpClient
 import numpy as np
 import requests
 
@@ -62,7 +63,7 @@ class Address:
         headers = {"User-Agent": "my-geocoder/1.0"}
 
         # Photon is so slow that we can't hit the Nominatim rate limit
-        response = requests.get(url, params=params, headers=headers)
+        response = httpClient.get(url, params=params, headers=headers)
         response.raise_for_status()
         data = response.json()
 
@@ -101,7 +102,7 @@ class Address:
         }
 
         try:
-            resp = requests.get(base, params=params)
+            resp = httpClient.get(base, params=params)
             resp.raise_for_status()
             data = resp.json()
             features = data.get("features", [])
@@ -1,15 +1,146 @@
+from modules import httpClient, extraction, metrics, credentials
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
-from typing import Tuple
-import random
-import time
+from bs4 import BeautifulSoup, SoupStrainer
+from urllib.parse import urljoin, urlparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, Tuple
+from collections import OrderedDict, deque
+from itertools import islice
+import threading
+import math
+import sys
+import re
 
 BASE = "https://github.com"
 COLOR = "#852fa4"
 
-NORMALCALLS = 0
-APICALLS = 0
+# Number of elements that GitHub shows in each page
+PAGE_SIZES = {"followers": 50, "following": 50, "repositories": 30, "stargazers": 48}
+MAX_STARGAZER_PAGES = 100
+
+STARRED_CLASS = "col-12 d-block width-full py-4 border-bottom color-border-muted"
+STARGAZERS_CLASS = "d-block d-md-flex flex-wrap gutter list-style-none"
+TEMPLATE_CLASSES = ["d-none", "d-md-block", "mb-2", "d-flex", "color-fg-muted"]
+
+API_HOST = "api.github.com"
+TOKEN_KEY = "GITHUB_TOKEN"
+CONTRIBUTORS_PER_PAGE = 100
+
+# The default branch is in the data of the page, not in the HTML
+DEFAULT_BRANCH = re.compile(r'"defaultBranch":"([^"]+)"')
+
+# Repository pages that have already been downloaded, the least recently
+# used ones are forgotten when there are more than MAX_REPOSITORY_PAGES
+REPOSITORY_PAGES = OrderedDict()
+MAX_REPOSITORY_PAGES = 1000
+REPOSITORY_PAGES_LOCK = threading.Lock()
+
+SESSION = httpClient.createSession()
+
+
+def setSession(session: requests.Session) -> None:
+    """
+    Replace the session shared by all the functions of the module.
+
+    Args:
+        - session (requests.Session): The new session.
+
+    Returns:
+        - None
+    """
+    global SESSION
+    SESSION = session
+
+
+def getSession(session: requests.Session = None) -> requests.Session:
+    """
+    Get the session to do the requests with.
+
+    Args:
+        - session (requests.Session): The session given by the caller.
+            If it is None the shared one is used.
+
+    Returns:
+        - requests.Session: The session to use.
+    """
+    if session is None:
+        return SESSION
+    return session
+
+
+def __getattr__(name: str) -> int:
+    """
+    Get the counters of the requests done by the module.
+
+    NORMALCALLS, APICALLS, CACHEHITS and CACHEMISSES are views of
+    metrics.REGISTRY, use metrics.REGISTRY.reset() to set them to 0.
+    They can't be assigned.
+
+    Args:
+        - name (str): The name of the counter.
+
+    Returns:
+        - int: The value of the counter.
+    """
+    host = urlparse(BASE).hostname
+    counters = {
+        "NORMALCALLS": ("calls", (host,)),
+        "APICALLS": ("calls", (API_HOST,)),
+        "CACHEHITS": ("cacheHits", (host, API_HOST)),
+        "CACHEMISSES": ("cacheMisses", (host, API_HOST)),
+    }
+
+    if name not in counters:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    field, hosts = counters[name]
+    return metrics.REGISTRY.count(field, hosts)
+
+
+# Assigning a counter raises an error instead of hiding the view
+sys.modules[__name__].__class__ = metrics.CounterViews
+
+
+def request(
+    url: str, session: requests.Session = None, headers: dict = None
+) -> requests.Response:
+    """
+    Do a GET request with the session and the response cache.
+
+    Args:
+        - url (str): The URL of the request.
+        - session (requests.Session): The session to use, the shared one by default.
+        - headers (dict): Extra headers for this request.
+
+    Returns:
+        - requests.Response: The response.
+    """
+    return httpClient.get(url, headers=headers, session=getSession(session))
+
+
+def isValidResponse(response: requests.Response) -> bool:
+    """
+    Check if a response has a page that can be parsed.
+
+    The retries have already been done when we get the response,
+    so an error means the page can't be downloaded now. It is
+    raised instead of returning an incomplete list, so the caller
+    doesn't mark the node as searched.
+
+    A 404 means the page doesn't exist, so there is nothing to parse.
+
+    Args:
+        - response (requests.Response): The response to check.
+
+    Returns:
+        - bool: True if it can be parsed, False if it doesn't exist.
+    """
+    if response.status_code == 404:
+        return False
+
+    response.raise_for_status()
+
+    return True
 
 
 def getCorrectURL(url: str) -> str:
@@ -29,37 +160,131 @@ def getCorrectURL(url: str) -> str:
     return url
 
 
-def getFollowers(username: str) -> list:
+def getFollowers(
+    username: str,
+    session: requests.Session = None,
+    parallel: bool = False,
+    maxWorkers: int = 8,
+) -> list:
     """
     Get the followers of a GitHub user
 
     Args:
         - username (str): The username to check.
+        - session (requests.Session): The session to use, the shared one by default.
+        - parallel (bool): Whether to download all the pages at the same time.
+        - maxWorkers (int): The number of pages downloaded at once in parallel mode.
 
     Returns:
         - list: The list of URLs for the followers.
     """
-    web = getCorrectURL(username)
+    return list(iterFollowers(username, session, parallel, maxWorkers))
+
+
+def iterFollowers(
+    username: str,
+    session: requests.Session = None,
+    parallel: bool = False,
+    maxWorkers: int = 8,
+    counts: dict = None,
+) -> Iterator[str]:
+    """
+    Get the followers of a GitHub user page by page.
 
-    return getConnection(f"{web}?tab=followers")
+    Args:
+        - username (str): The username to check.
+        - session (requests.Session): The session to use, the shared one by default.
+        - parallel (bool): Whether to download all the pages at the same time.
+        - maxWorkers (int): The number of pages downloaded at once in parallel mode.
+        - counts (dict): The result of getProfileCounts if it has already
+            been downloaded, so the profile isn't downloaded again.
 
+    Returns:
+        - Iterator[str]: The URLs of the followers.
+    """
+    web = getCorrectURL(username)
 
-def getFollowing(username: str) -> list:
+    if parallel:
+        if counts is None:
+            counts = getProfileCounts(web, session)
+
+        count = counts.get("followers")
+        if count is not None:
+            yield from iterAllPages(
+                f"{web}?page={{page}}&tab=followers",
+                math.ceil(count / PAGE_SIZES["followers"]),
+                parseConnectionPage,
+                session,
+                maxWorkers,
+            )
+            return
+
+    yield from iterConnection(f"{web}?tab=followers", session)
+
+
+def getFollowing(
+    username: str,
+    session: requests.Session = None,
+    parallel: bool = False,
+    maxWorkers: int = 8,
+) -> list:
     """
     Get the people that a GitHub user follows
 
     Args:
         - username (str): The username to check.
+        - session (requests.Session): The session to use, the shared one by default.
+        - parallel (bool): Whether to download all the pages at the same time.
+        - maxWorkers (int): The number of pages downloaded at once in parallel mode.
 
     Returns:
         - list: The list of URLs for the people followed.
     """
+    return list(iterFollowing(username, session, parallel, maxWorkers))
+
+
+def iterFollowing(
+    username: str,
+    session: requests.Session = None,
+    parallel: bool = False,
+    maxWorkers: int = 8,
+    counts: dict = None,
+) -> Iterator[str]:
+    """
+    Get the people that a GitHub user follows page by page.
+
+    Args:
+        - username (str): The username to check.
+        - session (requests.Session): The session to use, the shared one by default.
+        - parallel (bool): Whether to download all the pages at the same time.
+        - maxWorkers (int): The number of pages downloaded at once in parallel mode.
+        - counts (dict): The result of getProfileCounts if it has already
+            been downloaded, so the profile isn't downloaded again.
+
+    Returns:
+        - Iterator[str]: The URLs of the people followed.
+    """
     web = getCorrectURL(username)
 
-    return getConnection(f"{web}?tab=following")
+    if parallel:
+        if counts is None:
+            counts = getProfileCounts(web, session)
 
+        count = counts.get("following")
+        if count is not None:
+            yield from iterAllPages(
+                f"{web}?page={{page}}&tab=following",
+                math.ceil(count / PAGE_SIZES["following"]),
+                parseConnectionPage,
+                session,
+                maxWorkers,
+            )
+            return
 
-def getConnection(url: str) -> list:
+    yield from iterConnection(f"{web}?tab=following", session)
+
+
+def getConnection(url: str, session: requests.Session = None) -> list:
     """
     Get the people that are in a connection with a GitHub user
 
@@ -67,52 +292,315 @@ def getConnection(url: str) -> list:
 
     Args:
         - url (str): The URL to check.
+        - session (requests.Session): The session to use, the shared one by default.
 
     Returns:
         - list: The list of URLs for the people in the connection.
     """
-    # Initialize an empty list to store the URLs of each
-    people = []
-    global NORMALCALLS
+    return list(iterConnection(url, session))
+
+
+def iterConnection(url: str, session: requests.Session = None) -> Iterator[str]:
+    """
+    Get the people that are in a connection with a GitHub user page by page.
+
+    Args:
+        - url (str): The URL of the first page.
+        - session (requests.Session): The session to use, the shared one by default.
 
+    Returns:
+        - Iterator[str]: The URLs of the people in the connection.
+    """
     while url:
 
-        response = requests.get(url)
-        NORMALCALLS += 1
-        if response.status_code == 200:
-            # First we get the body of the page
-            soup = BeautifulSoup(response.text, "html.parser")
+        response = request(url, session)
+        if isValidResponse(response):
+            pagePeople, url = parseConnectionPage(response.text)
+            yield from pagePeople
+        else:
+            # The page doesn't exist, we can't check for the next page
+            url = None
 
-            # Loop through each 'div' element with the class 'd-table' in the HTML content
-            for follower in soup.find_all("div", class_="d-table"):
 
-                # Within each 'div' found, search for an 'a' (anchor) tag with the class 'd-inline-block'
-                link = follower.find("a", class_="d-inline-block")
+def parseConnectionPage(html: str) -> Tuple[list, str]:
+    """
+    Parse a page of the followers or following tab.
 
-                # Check if the anchor tag ('a' tag) exists
-                if link:
+    Args:
+        - html (str): The HTML of the page.
 
-                    # If found, add the value of the 'href' attribute (the URL) to the people list
-                    people.append(getCorrectURL(link["href"]))
+    Returns:
+        - list: The list of URLs for the people in the page.
+        - str: The URL of the next page or None if it is the last one.
+    """
+    people, nextPage = CONNECTION_EXTRACTOR(html)
 
-            # Find the 'Next' button link to go to the next page of followers
-            next_page = soup.find("a", string="Next")
-            # If there is a 'Next' link, update the URL to the next page
-            if next_page:
-                url = getCorrectURL(next_page["href"])
-            else:
-                # No more pages, break the loop
-                url = None
-        else:
-            # If the response status code is not 200, we can't check for the next page
-            url = None
+    return people, getNextPage(nextPage)
+
+
+def extractConnections(soup: BeautifulSoup) -> list:
+    """
+    Get the people from the tree of a followers or following page.
+
+    Args:
+        - soup (BeautifulSoup): The parsed page.
+
+    Returns:
+        - list: The list of URLs for the people in the page.
+    """
+    people = []
+
+    # Loop through each 'div' element with the class 'd-table' in the HTML content
+    for follower in soup.find_all("div", class_="d-table"):
 
-    time.sleep(random.random())
+        # Within each 'div' found, search for an 'a' (anchor) tag with the class 'd-inline-block'
+        link = follower.find("a", class_="d-inline-block")
+
+        # Check if the anchor tag ('a' tag) exists
+        if link:
+
+            # If found, add the value of the 'href' attribute (the URL) to the people list
+            people.append(getCorrectURL(link["href"]))
 
     return people
 
 
-def getRepositories(username: str) -> list:
+def getNextPage(href: str) -> str:
+    """
+    Get the URL of the next page from the href of the 'Next' button.
+
+    Args:
+        - href (str): The href of the 'Next' button or None.
+
+    Returns:
+        - str: The URL of the next page or None if there isn't one.
+    """
+    if href:
+        return getCorrectURL(href)
+
+    # No more pages
+    return None
+
+
+def parseCount(text: str) -> int:
+    """
+    Convert a counter shown by GitHub to a number.
+
+    GitHub abbreviates big numbers ("1.2k"), in that case
+    we return the biggest number that is shown like that so
+    we never fetch less pages than needed.
+
+    Args:
+        - text (str): The text of the counter.
+
+    Returns:
+        - int: The number or None if it can't be parsed.
+    """
+    text = text.strip().lower().replace(",", "")
+    multipliers = {"k": 1000, "m": 1000000}
+
+    try:
+        if text and text[-1] in multipliers:
+            multiplier = multipliers[text[-1]]
+            number = text[:-1]
+            decimals = len(number.split(".")[1]) if "." in number else 0
+            # "1.2k" can be anything until 1249
+            return round((float(number) + 0.5 / 10**decimals) * multiplier) - 1
+
+        return int(text)
+
+    except ValueError:
+        return None
+
+
+def getProfileCounts(username: str, session: requests.Session = None) -> dict:
+    """
+    Get the number of followers, following, repositories
+    and stars that are shown in the profile of a user.
+
+    Args:
+        - username (str): The user to check.
+        - session (requests.Session): The session to use, the shared one by default.
+
+    Returns:
+        - dict: The counts. The ones that aren't shown are missing.
+    """
+    response = request(getCorrectURL(username), session)
+
+    if not isValidResponse(response):
+        return {}
+
+    return parseProfileCounts(response.text)
+
+
+def parseProfileCounts(html: str) -> dict:
+    """
+    Get the counts shown in the profile page of a user.
+
+    Args:
+        - html (str): The HTML of the profile page.
+
+    Returns:
+        - dict: The counts with the keys "followers", "following",
+            "repositories" and "stars". The ones that aren't shown are missing.
+    """
+    return PROFILE_COUNTS_EXTRACTOR(html)
+
+
+def extractProfileCounts(soup: BeautifulSoup) -> dict:
+    """
+    Get the counts from the tree of a profile page.
+
+    Args:
+        - soup (BeautifulSoup): The parsed page.
+
+    Returns:
+        - dict: The counts like parseProfileCounts.
+    """
+    counts = {}
+
+    for tab in ["followers", "following"]:
+        link = soup.find("a", href=lambda href: href and f"tab={tab}" in href)
+        if link and link.find("span"):
+            count = parseCount(link.find("span").text)
+            if count is not None:
+                counts[tab] = count
+
+    for tab in ["repositories", "stars"]:
+        link = soup.find("a", attrs={"data-tab-item": tab})
+        if link and link.find("span", class_="Counter"):
+            counter = link.find("span", class_="Counter")
+            count = parseCount(counter.get("title") or counter.text)
+            if count is not None:
+                counts[tab] = count
+
+    return counts
+
+
+def parseStargazerCount(html: str) -> int:
+    """
+    Get the number of stargazers shown in the page of a repository.
+
+    Args:
+        - html (str): The HTML of the repository page.
+
+    Returns:
+        - int: The number of stargazers or None if it isn't shown.
+    """
+    return STARGAZER_COUNT_EXTRACTOR(html)
+
+
+def extractStargazerCount(soup: BeautifulSoup) -> int:
+    """
+    Get the number of stargazers from the tree of a repository page.
+
+    Args:
+        - soup (BeautifulSoup): The parsed page.
+
+    Returns:
+        - int: The number of stargazers or None if it isn't shown.
+    """
+    counter = soup.find(id="repo-stars-counter-star")
+
+    if not counter:
+        return None
+
+    return parseCount(counter.get("title") or counter.text)
+
+
+def getAllPages(
+    pageURL: str,
+    pages: int,
+    parser: Callable[[str], Tuple[list, str]],
+    session: requests.Session = None,
+    maxWorkers: int = 8,
+) -> list:
+    """
+    Download all the pages of a list at the same time.
+
+    If the last page still has a 'Next' button because the
+    list grew, the remaining pages are followed one by one.
+
+    Args:
+        - pageURL (str): The URL of the pages with "{page}" where the number goes.
+        - pages (int): The number of pages.
+        - parser (Callable): The function that parses a page. It returns
+            the elements of the page and the URL of the next one.
+        - session (requests.Session): The session to use, the shared one by default.
+        - maxWorkers (int): The number of pages downloaded at once.
+
+    Returns:
+        - list: The elements of all the pages in order.
+    """
+    return list(iterAllPages(pageURL, pages, parser, session, maxWorkers))
+
+
+def iterAllPages(
+    pageURL: str,
+    pages: int,
+    parser: Callable[[str], Tuple[list, str]],
+    session: requests.Session = None,
+    maxWorkers: int = 8,
+) -> Iterator:
+    """
+    Download all the pages of a list at the same time and
+    give their elements in order as soon as each page is ready.
+
+    Only a few pages are downloaded ahead of the one being read,
+    so a caller that stops early doesn't wait for the rest.
+
+    Args:
+        - pageURL (str): The URL of the pages with "{page}" where the number goes.
+        - pages (int): The number of pages.
+        - parser (Callable): The function that parses a page. It returns
+            the elements of the page and the URL of the next one.
+        - session (requests.Session): The session to use, the shared one by default.
+        - maxWorkers (int): The number of pages downloaded at once.
+
+    Returns:
+        - Iterator: The elements of all the pages in order.
+    """
+
+    def fetchPage(url: str) -> Tuple[list, str]:
+        response = request(url, session)
+        if not isValidResponse(response):
+            return [], None
+        return parser(response.text)
+
+    urls = (pageURL.format(page=number) for number in range(1, pages + 1))
+    url = None
+    executor = ThreadPoolExecutor(max_workers=maxWorkers)
+    running = deque()
+
+    try:
+        # Only maxWorkers pages are downloaded ahead of the one being read
+        running.extend(executor.submit(fetchPage, u) for u in islice(urls, maxWorkers))
+
+        while running:
+            pageElements, url = running.popleft().result()
+
+            for nextURL in urls:
+                running.append(executor.submit(fetchPage, nextURL))
+                break
+
+            yield from pageElements
+    finally:
+        # If the caller stops reading, the pages that haven't started are cancelled
+        for future in running:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+    while url:
+        pageElements, url = fetchPage(url)
+        yield from pageElements
+
+
+def getRepositories(
+    username: str,
+    session: requests.Session = None,
+    parallel: bool = False,
+    maxWorkers: int = 8,
+) -> list:
     """
     Get the repositories of a GitHub user
 
@@ -121,49 +609,298 @@ def getRepositories(username: str) -> list:
 
     Args:
         - username (str): The username to check.
+        - session (requests.Session): The session to use, the shared one by default.
+        - parallel (bool): Whether to download all the pages at the same time.
+        - maxWorkers (int): The number of pages downloaded at once in parallel mode.
 
     Returns:
         - list: The list of URLs for the repositories.
     """
+    return list(iterRepositories(username, session, parallel, maxWorkers))
+
+
+def iterRepositories(
+    username: str,
+    session: requests.Session = None,
+    parallel: bool = False,
+    maxWorkers: int = 8,
+    counts: dict = None,
+) -> Iterator[str]:
+    """
+    Get the repositories of a GitHub user page by page.
+
+    Args:
+        - username (str): The username to check.
+        - session (requests.Session): The session to use, the shared one by default.
+        - parallel (bool): Whether to download all the pages at the same time.
+        - maxWorkers (int): The number of pages downloaded at once in parallel mode.
+        - counts (dict): The result of getProfileCounts if it has already
+            been downloaded, so the profile isn't downloaded again.
+
+    Returns:
+        - Iterator[str]: The URLs of the repositories.
+    """
     username = getCorrectURL(username)
-    global NORMALCALLS
 
-    url = f"{username}?tab=repositories"
+    if parallel:
+        if counts is None:
+            counts = getProfileCounts(username, session)
+
+        count = counts.get("repositories")
+        if count is not None:
+            yield from iterAllPages(
+                f"{username}?page={{page}}&tab=repositories",
+                math.ceil(count / PAGE_SIZES["repositories"]),
+                lambda html: parseRepositoriesPage(html, username),
+                session,
+                maxWorkers,
+            )
+            return
 
-    repositories = []
+    url = f"{username}?tab=repositories"
 
     while url:
-        response = requests.get(url)
-        NORMALCALLS += 1
+        response = request(url, session)
 
-        soup = BeautifulSoup(response.text, "html.parser")
+        if not isValidResponse(response):
+            break
 
-        # Get the repositories
-        repoBlocks = soup.find_all("h3", class_="wb-break-all")
+        pageRepositories, url = parseRepositoriesPage(response.text, username)
+        yield from pageRepositories
 
-        # Extract the url of the repositories
-        for repo in repoBlocks:
-            if repo.find("a"):
-                repositories.append(
-                    getCorrectURL(urljoin(f"{username}/", repo.find("a").text))
-                )
 
-        # Find the 'Next' button link to go to the next page of repositories
-        next_page = soup.find("a", string="Next")
+def parseRepositoriesPage(html: str, username: str) -> Tuple[list, str]:
+    """
+    Parse a page of the repositories tab of a user.
 
-        if next_page:
-            # If there is a 'Next' link, update the URL to the next page
-            url = getCorrectURL(next_page["href"])
-        else:
-            # No more pages, break the loop
-            url = None
+    Args:
+        - html (str): The HTML of the page.
+        - username (str): The URL of the owner of the repositories.
 
-    time.sleep(random.random())
+    Returns:
+        - list: The list of URLs for the repositories in the page.
+        - str: The URL of the next page or None if it is the last one.
+    """
+    username = getCorrectURL(username)
+
+    names, nextPage = REPOSITORIES_EXTRACTOR(html)
+
+    # Extract the url of the repositories
+    repositories = [getCorrectURL(urljoin(f"{username}/", name)) for name in names]
+
+    return repositories, getNextPage(nextPage)
 
-    return repositories
 
+def extractRepositoryNames(soup: BeautifulSoup) -> list:
+    """
+    Get the names of the repositories from the tree of a repositories page.
+
+    Args:
+        - soup (BeautifulSoup): The parsed page.
 
-def getContributors(repo: str) -> list:
+    Returns:
+        - list: The names of the repositories.
+    """
+    # Get the repositories
+    repoBlocks = soup.find_all("h3", class_="wb-break-all")
+
+    return [repo.find("a").text for repo in repoBlocks if repo.find("a")]
+
+
+class RepositoryPage:
+    def __init__(self, url: str, html: str = None) -> None:
+        """
+        Initialize the RepositoryPage.
+
+        It parses everything that is needed from the page of a
+        repository at once, so the page doesn't have to be downloaded
+        again for each lookup. The HTML isn't kept.
+
+        Args:
+            - url (str): The URL of the repository.
+            - html (str): The HTML of the page or None if the repository
+                doesn't exist.
+
+        Returns:
+            - None
+        """
+        self.url = getCorrectURL(url)
+        self.owner = getOwner(self.url)
+        self.exists = html is not None
+
+        if html is None:
+            self.parent = None
+            self.template = None
+            self.hasContributors = False
+            self.stars = None
+            self.defaultBranch = None
+            return
+
+        self.parent = FORK_PARENT_EXTRACTOR(html)
+        self.template = None if self.parent else parseTemplateParent(html)
+        self.hasContributors = hasContributors(html)
+        self.stars = parseStargazerCount(html)
+        self.defaultBranch = parseDefaultBranch(html)
+
+    def getParent(self) -> Tuple[str, str]:
+        """
+        Get the repository this one comes from.
+
+        Args:
+            - None
+
+        Returns:
+            - str: The parent repository URL or None.
+            - str: The type of parent ("fork" or "template") or None.
+        """
+        if self.parent:
+            return self.parent, "fork"
+
+        if self.template:
+            return self.template, "template"
+
+        return None, None
+
+
+def getRepositoryPage(url: str, session: requests.Session = None) -> RepositoryPage:
+    """
+    Get the page of a repository downloading it only the first time.
+
+    Args:
+        - url (str): The URL of the repository.
+        - session (requests.Session): The session to use, the shared one by default.
+
+    Returns:
+        - RepositoryPage: The parsed page.
+    """
+    url = getCorrectURL(url)
+    page = findRepositoryPage(url)
+
+    if page is None:
+        response = request(url, session)
+        html = response.text if isValidResponse(response) else None
+        page = addRepositoryPage(RepositoryPage(url, html))
+
+    return page
+
+
+def findRepositoryPage(url: str) -> RepositoryPage:
+    """
+    Get the page of a repository if it has already been downloaded.
+
+    Args:
+        - url (str): The URL of the repository.
+
+    Returns:
+        - RepositoryPage: The parsed page or None.
+    """
+    url = getCorrectURL(url)
+
+    with REPOSITORY_PAGES_LOCK:
+        page = REPOSITORY_PAGES.get(url)
+        if page is not None:
+            REPOSITORY_PAGES.move_to_end(url)
+
+        return page
+
+
+def addRepositoryPage(page: RepositoryPage) -> RepositoryPage:
+    """
+    Remember the page of a repository.
+
+    If another thread has added it first that one is kept.
+    Only the last MAX_REPOSITORY_PAGES pages are kept,
+    so a long crawl doesn't keep all of them in memory.
+
+    Args:
+        - page (RepositoryPage): The parsed page.
+
+    Returns:
+        - RepositoryPage: The page that is remembered.
+    """
+    with REPOSITORY_PAGES_LOCK:
+        page = REPOSITORY_PAGES.setdefault(page.url, page)
+        REPOSITORY_PAGES.move_to_end(page.url)
+
+        while len(REPOSITORY_PAGES) > MAX_REPOSITORY_PAGES:
+            REPOSITORY_PAGES.popitem(last=False)
+
+        return page
+
+
+def clearRepositoryPages() -> None:
+    """
+    Forget the downloaded repository pages so they are downloaded again.
+
+    Args:
+        - None
+
+    Returns:
+        - None
+    """
+    with REPOSITORY_PAGES_LOCK:
+        REPOSITORY_PAGES.clear()
+
+
+def parseDefaultBranch(html: str) -> str:
+    """
+    Get the default branch from the page of a repository.
+
+    Args:
+        - html (str): The HTML of the repository page.
+
+    Returns:
+        - str: The name of the branch or None if it isn't shown.
+    """
+    match = DEFAULT_BRANCH.search(html)
+
+    if not match:
+        return None
+
+    return match.group(1)
+
+
+def getToken(passwordManager: credentials.PasswordManager = None) -> str:
+    """
+    Get the token used to authenticate in the GitHub API.
+
+    Args:
+        - passwordManager (credentials.PasswordManager): The password manager
+            with the key GITHUB_TOKEN. If it is None the environment variable is used.
+
+    Returns:
+        - str: The token or None if there isn't one.
+    """
+    if passwordManager is None:
+        passwordManager = credentials.PasswordManager()
+
+    return passwordManager.getValue(TOKEN_KEY)
+
+
+def getAPIHeaders(token: str = None) -> dict:
+    """
+    Get the headers for a request to the GitHub API.
+
+    Args:
+        - token (str): The token to authenticate with or None.
+
+    Returns:
+        - dict: The headers.
+    """
+    headers = {"Accept": "application/vnd.github+json"}
+
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+
+    return headers
+
+
+def getContributors(
+    repo: str,
+    session: requests.Session = None,
+    token: str = None,
+    anonymous: bool = False,
+) -> list:
     """
     Get the contributors of a GitHub repository
 
@@ -171,68 +908,132 @@ def getContributors(repo: str) -> list:
 
     This means it shouldn't be used too much.
     It checks if there are contributors before using the API.
-    It stops searching when the page is not filled
-    up to 30 contributors.
 
     It will return them in the format:
         - https://github.com/username
+        - mailto:email for the anonymous contributors
 
     Args:
         - repo (str): The repository to check.
+        - session (requests.Session): The session to use, the shared one by default.
+        - token (str): The token for the API, without it only
+            60 requests per hour can be done.
+        - anonymous (bool): Whether to include the contributors
+            that don't have a GitHub account.
 
     Returns:
         - list: The list of URLs for the contributors.
     """
+    return list(iterContributors(repo, session, token, anonymous))
+
+
+def iterContributors(
+    repo: str,
+    session: requests.Session = None,
+    token: str = None,
+    anonymous: bool = False,
+) -> Iterator[str]:
+    """
+    Get the contributors of a GitHub repository as they are downloaded.
+
+    It asks the API for 100 contributors per page and
+    follows the 'next' link of the Link header, so it
+    stops without asking for an empty page.
+
+    Args:
+        - repo (str): The repository to check.
+        - session (requests.Session): The session to use, the shared one by default.
+        - token (str): The token for the API.
+        - anonymous (bool): Whether to include the anonymous contributors.
+
+    Returns:
+        - Iterator[str]: The URLs of the contributors.
+    """
     url = getCorrectURL(repo)
-    global NORMALCALLS
 
     # First we check that there are contributors to not use the API
-    response = requests.get(url)
-    NORMALCALLS += 1
-    soup = BeautifulSoup(response.text, "html.parser")
+    if not getRepositoryPage(url, session).hasContributors:
+        return
+
+    repoUserAndName = "/".join(url.split("/")[-2:])
+    url = getContributorsURL(repoUserAndName, anonymous)
+    headers = getAPIHeaders(token)
 
-    if not "Contributors" in soup.text:
-        return []
+    while url:
+        response = request(url, session, headers)
 
-    global APICALLS
+        # An empty repository answers 204 without a body
+        if not isValidResponse(response) or response.status_code != 200:
+            return
 
-    repoUserAndName = "/".join(url.split("/")[-2:])
+        yield from parseContributors(response.json())
 
-    contributors = []
+        url = response.links.get("next", {}).get("url")
+
+
+def getContributorsURL(repoUserAndName: str, anonymous: bool = False) -> str:
+    """
+    Get the URL of the first page of contributors in the API.
 
-    number = 1
+    Args:
+        - repoUserAndName (str): The repository as "owner/name".
+        - anonymous (bool): Whether to include the anonymous contributors.
 
-    contributorsUrl = f"https://api.github.com/repos/{repoUserAndName}/contributors"
+    Returns:
+        - str: The URL.
+    """
+    url = f"https://{API_HOST}/repos/{repoUserAndName}/contributors"
+    url += f"?per_page={CONTRIBUTORS_PER_PAGE}"
 
-    url = f"{contributorsUrl}?page={number}"
+    if anonymous:
+        url += "&anon=1"
 
-    response = requests.get(url)
-    APICALLS += 1
+    return url
 
-    while response.status_code == 200 and response.json():
 
-        for i in response.json():
-            # We get the URL of the contributor
-            contributors.append(i["html_url"])
+def hasContributors(html: str) -> bool:
+    """
+    Check if the page of a repository shows contributors.
 
-        if len(response.json()) < 30:
-            # If there are less than 30 contributors, we have reached the end
-            # We don't continue to reduce the number of API calls
-            break
+    Args:
+        - html (str): The HTML of the repository page.
 
-        else:
-            number += 1
+    Returns:
+        - bool: True if the repository has contributors.
+    """
+    # If the word isn't in the HTML it can't be in the text
+    if "Contributors" not in html:
+        return False
+
+    return CONTRIBUTORS_EXTRACTOR(html)
+
+
+def parseContributors(data: list) -> list:
+    """
+    Get the URLs of the contributors from a page of the API.
+
+    The anonymous contributors don't have a profile
+    so they are given as a mailto URL with their email.
 
-            url = f"{contributorsUrl}?page={number}"
-            response = requests.get(url)
-            APICALLS += 1
+    Args:
+        - data (list): The JSON response of the contributors endpoint.
 
-    time.sleep(random.random())
+    Returns:
+        - list: The list of URLs for the contributors.
+    """
+    contributors = []
+
+    for contributor in data:
+        if "html_url" in contributor:
+            # We get the URL of the contributor
+            contributors.append(contributor["html_url"])
+        elif contributor.get("email"):
+            contributors.append(f"mailto:{contributor['email']}")
 
     return contributors
 
 
-def getRealUrlFromAPI(url: str) -> str:
+def getRealUrlFromAPI(url: str, session: requests.Session = None) -> str:
     """
     Get the real URL from a GitHub API URL
 
@@ -243,17 +1044,16 @@ def getRealUrlFromAPI(url: str) -> str:
 
     Args:
         - url (str): The URL to check.
+        - session (requests.Session): The session to use, the shared one by default.
 
     Returns:
         - str: The real URL.
     """
-    response = requests.get(url)
-    global APICALLS
-    APICALLS += 1
+    response = request(url, session)
     return response.json()["html_url"]
 
 
-def getRepositoryParent(url: str) -> Tuple[str, str]:
+def getRepositoryParent(url: str, session: requests.Session = None) -> Tuple[str, str]:
     """
     Get the parent repository of a forked repository
     or the template if it was created from one.
@@ -265,51 +1065,97 @@ def getRepositoryParent(url: str) -> Tuple[str, str]:
 
     Args:
         - url (str): The URL to check.
+        - session (requests.Session): The session to use, the shared one by default.
 
     Returns:
         - str: The parent repository URL.
     """
-    repository = getCorrectURL(url)
+    return getRepositoryPage(url, session).getParent()
+
+
+def parseRepositoryParent(html: str) -> Tuple[str, str]:
+    """
+    Get the parent repository from the page of a repository.
+
+    Args:
+        - html (str): The HTML of the repository page.
+
+    Returns:
+        - str: The parent repository URL or None.
+        - str: The type of parent ("fork" or "template") or None.
+    """
+    parent = FORK_PARENT_EXTRACTOR(html)
+
+    if parent:
+        return parent, "fork"
+
+    parent = parseTemplateParent(html)
+
+    if parent:
+        return parent, "template"
+
+    return None, None
+
+
+def parseTemplateParent(html: str) -> str:
+    """
+    Get the template of a repository from its page.
+
+    Args:
+        - html (str): The HTML of the repository page.
+
+    Returns:
+        - str: The template repository URL or None.
+    """
+    # Check if the repository was created from a template
+    if "generated from" not in html.lower():
+        return None
 
-    response = requests.get(repository)
-    global NORMALCALLS
-    NORMALCALLS += 1
-    soup = BeautifulSoup(response.text, "html.parser")
+    return TEMPLATE_PARENT_EXTRACTOR(html)
 
-    parent = None
-    typeOfParent = None
 
+def extractForkParent(soup: BeautifulSoup) -> str:
+    """
+    Get the repository a fork comes from in the tree of a repository page.
+
+    Args:
+        - soup (BeautifulSoup): The parsed page.
+
+    Returns:
+        - str: The parent repository URL or None.
+    """
     parentLinkMeta = soup.find(
         "meta", {"name": "octolytics-dimension-repository_parent_nwo"}
     )
 
     if parentLinkMeta:
-        parentRepository = parentLinkMeta["content"]
-        parent = getCorrectURL(parentRepository)
-        typeOfParent = "fork"
+        return getCorrectURL(parentLinkMeta["content"])
+
+    return None
 
-    else:
 
-        # Check if the repository was created from a template
+def extractTemplateParent(soup: BeautifulSoup) -> str:
+    """
+    Get the template of a repository in the tree of a repository page.
 
-        # Check both possible div structures
-        for div in soup.find_all(
-            "div", class_=["d-none", "d-md-block", "mb-2", "d-flex", "color-fg-muted"]
-        ):
-            if "generated from" in div.text.lower():
-                a_tag = div.find("a", class_="Link--inTextBlock")
+    Args:
+        - soup (BeautifulSoup): The parsed page.
 
-                if a_tag and "href" in a_tag.attrs:
-                    parent = getCorrectURL(a_tag["href"])
-                    typeOfParent = "template"
-                    break  # Stop once found
+    Returns:
+        - str: The template repository URL or None.
+    """
+    # Check both possible div structures
+    for div in soup.find_all("div", class_=TEMPLATE_CLASSES):
+        if "generated from" in div.text.lower():
+            a_tag = div.find("a", class_="Link--inTextBlock")
 
-    time.sleep(random.random())
+            if a_tag and "href" in a_tag.attrs:
+                return getCorrectURL(a_tag["href"])
 
-    return parent, typeOfParent
+    return None
 
 
-def getStarredRepositories(username: str) -> list:
+def getStarredRepositories(username: str, session: requests.Session = None) -> list:
     """
     Get the starred repositories of a GitHub user
 
@@ -318,46 +1164,76 @@ def getStarredRepositories(username: str) -> list:
 
     Args:
         - username (str): The username to check.
+        - session (requests.Session): The session to use, the shared one by default.
 
     Returns:
         - list: The list of URLs for the starred repositories.
     """
+    return list(iterStarred(username, session))
+
+
+def iterStarred(username: str, session: requests.Session = None) -> Iterator[str]:
+    """
+    Get the starred repositories of a GitHub user page by page.
+
+    Args:
+        - username (str): The username to check.
+        - session (requests.Session): The session to use, the shared one by default.
+
+    Returns:
+        - Iterator[str]: The URLs of the starred repositories.
+    """
     username = getCorrectURL(username)
-    global NORMALCALLS
 
     url = f"{username}?tab=stars"
 
-    repositories = []
-
     while url:
-        response = requests.get(url)
-        NORMALCALLS += 1
-
-        # First we get the body of the page
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Loop through each 'div' element with the class 'col-12 d-block width-full py-4 border-bottom color-border-muted' in the HTML content
-        repoContainers = soup.find_all(
-            "div",
-            class_="col-12 d-block width-full py-4 border-bottom color-border-muted",
-        )
-        for container in repoContainers:
-            link = container.find("h3").find("a")["href"]
-            if link:
-                # If found, add the value of the 'href' attribute (the URL) to the people list
-                repositories.append(getCorrectURL(link))
-
-        # Find the 'Next' button link to go to the next page of followers
-        next_page = soup.find("a", string="Next")
-
-        if next_page:
-            # If there is a 'Next' link, update the URL to the next page
-            url = getCorrectURL(next_page["href"])
-        else:
-            # No more pages, break the loop
-            url = None
+        response = request(url, session)
 
-    time.sleep(random.random())
+        if not isValidResponse(response):
+            break
+
+        pageRepositories, url = parseStarredPage(response.text)
+        yield from pageRepositories
+
+
+def parseStarredPage(html: str) -> Tuple[list, str]:
+    """
+    Parse a page of the stars tab of a user.
+
+    This tab uses cursors instead of page numbers,
+    so it can't be downloaded in parallel.
+
+    Args:
+        - html (str): The HTML of the page.
+
+    Returns:
+        - list: The list of URLs for the starred repositories in the page.
+        - str: The URL of the next page or None if it is the last one.
+    """
+    repositories, nextPage = STARRED_EXTRACTOR(html)
+
+    return repositories, getNextPage(nextPage)
+
+
+def extractStarred(soup: BeautifulSoup) -> list:
+    """
+    Get the starred repositories from the tree of a stars page.
+
+    Args:
+        - soup (BeautifulSoup): The parsed page.
+
+    Returns:
+        - list: The list of URLs for the starred repositories.
+    """
+    repositories = []
+
+    # Loop through each 'div' element with the class 'col-12 d-block width-full py-4 border-bottom color-border-muted' in the HTML content
+    for container in soup.find_all("div", class_=STARRED_CLASS):
+        link = container.find("h3").find("a")["href"]
+        if link:
+            # If found, add the value of the 'href' attribute (the URL) to the people list
+            repositories.append(getCorrectURL(link))
 
     return repositories
 
@@ -382,7 +1258,12 @@ def getOwner(repository: str) -> str:
     return getCorrectURL("/".join(repository.split("/")[:-1]))
 
 
-def getStargazers(repository: str) -> list:
+def getStargazers(
+    repository: str,
+    session: requests.Session = None,
+    parallel: bool = False,
+    maxWorkers: int = 8,
+) -> list:
     """
     Get the stargazers of a GitHub repository
 
@@ -394,51 +1275,114 @@ def getStargazers(repository: str) -> list:
 
     Args:
         - repository (str): The repository to check.
+        - session (requests.Session): The session to use, the shared one by default.
+        - parallel (bool): Whether to download all the pages at the same time.
+        - maxWorkers (int): The number of pages downloaded at once in parallel mode.
 
     Returns:
         - list: The list of URLs for the stargazers.
     """
+    return list(iterStargazers(repository, session, parallel, maxWorkers))
+
+
+def iterStargazers(
+    repository: str,
+    session: requests.Session = None,
+    parallel: bool = False,
+    maxWorkers: int = 8,
+) -> Iterator[str]:
+    """
+    Get the stargazers of a GitHub repository page by page.
+
+    A stargazer is only given once even if the list
+    moves while it is being downloaded.
+
+    Args:
+        - repository (str): The repository to check.
+        - session (requests.Session): The session to use, the shared one by default.
+        - parallel (bool): Whether to download all the pages at the same time.
+        - maxWorkers (int): The number of pages downloaded at once in parallel mode.
+
+    Returns:
+        - Iterator[str]: The URLs of the stargazers.
+    """
     repository = getCorrectURL(repository)
-    global NORMALCALLS
 
     url = urljoin(f"{repository}/", "stargazers")
 
-    stargazers = set()
+    seen = set()
+
+    if parallel:
+        page = getRepositoryPage(repository, session)
+        count = page.stars if page.exists else 0
+        if count is not None:
+            pages = min(
+                math.ceil(count / PAGE_SIZES["stargazers"]), MAX_STARGAZER_PAGES
+            )
+            for stargazer in iterAllPages(
+                f"{url}?page={{page}}", pages, parseStargazersPage, session, maxWorkers
+            ):
+                if stargazer not in seen:
+                    seen.add(stargazer)
+                    yield stargazer
+            return
 
     while url:
-        response = requests.get(url)
-        NORMALCALLS += 1
-
-        # First we get the body of the page
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Find the <ol> element with the specified class
-        stargazersBlock = soup.find(
-            "ol", class_="d-block d-md-flex flex-wrap gutter list-style-none"
-        )
-
-        if stargazersBlock:
-            for a in stargazersBlock.find_all("a", href=True):
-                if (
-                    a.get("data-hovercard-type") == "user"
-                ):  # Check if the link has the "data-hovercard-type" attribute set to "user"
-                    stargazers.add(getCorrectURL(a["href"]))
-
-        # Find the 'Next' button link to go to the next page of followers
-        nextPage = soup.find("a", string="Next")
-        # If there is a 'Next' link, update the URL to the next page
-        if nextPage:
-            url = getCorrectURL(nextPage["href"])
-        else:
-            # No more pages, break the loop
-            url = None
+        response = request(url, session)
+
+        if not isValidResponse(response):
+            break
+
+        pageStargazers, url = parseStargazersPage(response.text)
+
+        for stargazer in pageStargazers:
+            if stargazer not in seen:
+                seen.add(stargazer)
+                yield stargazer
+
+
+def parseStargazersPage(html: str) -> Tuple[list, str]:
+    """
+    Parse a page of the stargazers of a repository.
+
+    Args:
+        - html (str): The HTML of the page.
+
+    Returns:
+        - list: The list of URLs for the stargazers in the page.
+        - str: The URL of the next page or None if it is the last one.
+    """
+    stargazers, nextPage = STARGAZERS_EXTRACTOR(html)
+
+    return stargazers, getNextPage(nextPage)
+
+
+def extractStargazers(soup: BeautifulSoup) -> list:
+    """
+    Get the stargazers from the tree of a stargazers page.
+
+    Args:
+        - soup (BeautifulSoup): The parsed page.
 
-    time.sleep(random.random())
+    Returns:
+        - list: The list of URLs for the stargazers.
+    """
+    stargazers = []
+
+    # Find the <ol> element with the specified class
+    stargazersBlock = soup.find("ol", class_=STARGAZERS_CLASS)
 
-    return list(stargazers)
+    if stargazersBlock:
+        for a in stargazersBlock.find_all("a", href=True):
+            if (
+                a.get("data-hovercard-type") == "user"
+            ):  # Check if the link has the "data-hovercard-type" attribute set to "user"
+                stargazers.append(getCorrectURL(a["href"]))
 
+    return stargazers
 
-def getDependencies(repository: str) -> list:
+
+def getDependencies(repository: str, session: requests.Session = None) -> list:
     """
     Get the dependencies of a GitHub repository
 
@@ -451,21 +1395,69 @@ def getDependencies(repository: str) -> list:
 
     Args:
         - repository (str): The repository to check.
+        - session (requests.Session): The session to use, the shared one by default.
 
     Returns:
         - list: The list of URLs for the dependencies.
     """
     repository = getCorrectURL(repository)
-    global NORMALCALLS
 
     url = urljoin(f"{repository}/", "network/dependencies")
 
     dependencies = []
 
-    response = requests.get(url)
-    NORMALCALLS += 1
+    response = request(url, session)
 
     if response.status_code == 200:
         pass
 
     return dependencies
+
+
+CONNECTION_EXTRACTOR = extraction.Extractor(
+    "githubConnection",
+    extractConnections,
+    SoupStrainer("div", class_=extraction.classRegex("d-table")),
+    paginated=True,
+)
+REPOSITORIES_EXTRACTOR = extraction.Extractor(
+    "githubRepositories",
+    extractRepositoryNames,
+    SoupStrainer("h3", class_=extraction.classRegex("wb-break-all")),
+    paginated=True,
+)
+STARRED_EXTRACTOR = extraction.Extractor(
+    "githubStarred",
+    extractStarred,
+    SoupStrainer("div", class_=STARRED_CLASS),
+    paginated=True,
+)
+STARGAZERS_EXTRACTOR = extraction.Extractor(
+    "githubStargazers",
+    extractStargazers,
+    SoupStrainer("ol", class_=STARGAZERS_CLASS),
+    paginated=True,
+)
+# The meta tags are in the head so we don't need the rest
+FORK_PARENT_EXTRACTOR = extraction.Extractor(
+    "githubForkParent",
+    extractForkParent,
+    SoupStrainer("meta"),
+    stopAfter="</head>",
+)
+TEMPLATE_PARENT_EXTRACTOR = extraction.Extractor(
+    "githubTemplateParent",
+    extractTemplateParent,
+    SoupStrainer("div", class_=extraction.classRegex(*TEMPLATE_CLASSES)),
+)
+CONTRIBUTORS_EXTRACTOR = extraction.Extractor(
+    "githubContributors", lambda soup: "Contributors" in soup.text
+)
+PROFILE_COUNTS_EXTRACTOR = extraction.Extractor(
+    "githubProfileCounts", extractProfileCounts, SoupStrainer("a")
+)
+STARGAZER_COUNT_EXTRACTOR = extraction.Extractor(
+    "githubStargazerCount",
+    extractStargazerCount,
+    SoupStrainer(id="repo-stars-counter-star"),
+)
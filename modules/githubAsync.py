@@ -0,0 +1,484 @@
+from modules import github, httpCache, httpClient, metrics, rateLimiter, retrying
+from urllib.parse import urljoin
+from typing import Tuple
+import requests
+import aiohttp
+import asyncio
+import json
+import time
+
+
+def createSession(limit: int = 20) -> aiohttp.ClientSession:
+    """
+    Create an aiohttp session with the same headers
+    as the sessions of the synchronous module.
+
+    It must be created inside a running event loop.
+
+    Args:
+        - limit (int): The maximum number of simultaneous connections.
+
+    Returns:
+        - aiohttp.ClientSession: The configured session.
+    """
+    return aiohttp.ClientSession(
+        headers=dict(github.getSession().headers),
+        connector=aiohttp.TCPConnector(limit=limit),
+    )
+
+
+async def fetch(
+    session: aiohttp.ClientSession, url: str, headers: dict = None
+) -> Tuple[int, str]:
+    """
+    Download a page.
+
+    Args:
+        - session (aiohttp.ClientSession): The session to use.
+        - url (str): The URL to download.
+        - headers (dict): Extra headers for this request.
+
+    Returns:
+        - int: The status code of the response.
+        - str: The body of the response.
+    """
+    status, body, _ = await fetchWithHeaders(session, url, headers)
+
+    return status, body
+
+
+async def fetchWithHeaders(
+    session: aiohttp.ClientSession, url: str, headers: dict = None
+) -> Tuple[int, str, dict]:
+    """
+    Download a page and keep the headers of the response.
+
+    It goes through httpClient.CACHE like httpClient.get, so the
+    pages of both clients are stored in and served from the same cache.
+    The call is registered in metrics.REGISTRY with its cache result.
+
+    Args:
+        - session (aiohttp.ClientSession): The session to use.
+        - url (str): The URL to download.
+        - headers (dict): Extra headers for this request.
+
+    Returns:
+        - int: The status code of the response.
+        - str: The body of the response.
+        - dict: The headers of the response.
+    """
+    cache = httpClient.CACHE
+
+    if cache is None:
+        response = await download(session, url, headers)
+        cacheResult = None
+    else:
+        key = cache.getKey(url)
+        entry = cache.lookup(key)
+        headers = dict(headers or {})
+
+        if entry is not None and cache.isFresh(entry):
+            cache.countResult(True)
+            response = cache.buildResponse(entry)
+            cacheResult = "hit"
+        else:
+            if entry is not None:
+                headers.update(cache.getConditionalHeaders(entry))
+
+            response = await download(session, url, headers)
+
+            if response.status_code == 304 and entry is not None:
+                cache.refresh(key)
+                cache.countResult(True)
+                response = cache.buildResponse(entry)
+                cacheResult = "revalidated"
+            else:
+                cache.countResult(False)
+                if response.status_code == 200:
+                    cache.store(key, response)
+                cacheResult = "miss"
+
+    metrics.REGISTRY.recordCall(url, cacheResult)
+
+    return response.status_code, response.text, response.headers
+
+
+async def download(
+    session: aiohttp.ClientSession, url: str, headers: dict = None
+) -> requests.Response:
+    """
+    Download a page without the cache.
+
+    It waits for the rate limiter shared with the synchronous module
+    and uses the same retry policy and circuit breakers.
+    The requests are registered in metrics.REGISTRY.
+
+    Args:
+        - session (aiohttp.ClientSession): The session to use.
+        - url (str): The URL to download.
+        - headers (dict): Extra headers for this request.
+
+    Returns:
+        - requests.Response: The response, built like the ones of the
+            cache so it can be stored. If all the retries fail it is
+            the last one received.
+    """
+    breaker = retrying.getBreaker(url)
+
+    for attempt in range(retrying.POLICY.maxRetries + 1):
+        lastAttempt = attempt == retrying.POLICY.maxRetries
+
+        await asyncio.sleep(breaker.getWait())
+        await rateLimiter.LIMITER.acquireAsync(url)
+
+        start = time.perf_counter()
+
+        try:
+            async with session.get(url, headers=headers) as response:
+                rateLimiter.LIMITER.update(url, response.status, response.headers)
+                content = await response.read()
+                result = httpCache.ResponseCache.buildResponse(
+                    {
+                        "url": url,
+                        "status": response.status,
+                        "headers": dict(response.headers),
+                        "encoding": response.get_encoding(),
+                        "body": content,
+                    }
+                )
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            metrics.REGISTRY.recordRequest(url, None, 0, time.perf_counter() - start)
+            breaker.recordFailure()
+            if lastAttempt:
+                raise
+            await asyncio.sleep(retrying.POLICY.getDelay(attempt))
+            continue
+
+        metrics.REGISTRY.recordRequest(
+            url, result.status_code, len(content), time.perf_counter() - start
+        )
+
+        if not retrying.POLICY.shouldRetry(result.status_code):
+            breaker.recordSuccess()
+            return result
+
+        # Too many requests is handled by the rate limiter, the host is not degraded
+        if result.status_code != 429:
+            breaker.recordFailure()
+
+        if lastAttempt:
+            return result
+
+        await asyncio.sleep(retrying.POLICY.getDelay(attempt))
+
+    return result
+
+
+async def fetchJSON(
+    session: aiohttp.ClientSession, url: str, headers: dict = None
+) -> Tuple[int, object]:
+    """
+    Download a JSON document.
+
+    Args:
+        - session (aiohttp.ClientSession): The session to use.
+        - url (str): The URL to download.
+        - headers (dict): Extra headers for this request.
+
+    Returns:
+        - int: The status code of the response.
+        - object: The decoded JSON or None if there is no document.
+    """
+    status, body = await fetch(session, url, headers)
+
+    if status != 200 or not body:
+        return status, None
+
+    return status, json.loads(body)
+
+
+def isValidStatus(status: int, url: str) -> bool:
+    """
+    Check if a response has a page that can be parsed.
+
+    It behaves like github.isValidResponse.
+
+    Args:
+        - status (int): The status code of the response.
+        - url (str): The URL of the request.
+
+    Returns:
+        - bool: True if it can be parsed, False if it doesn't exist.
+    """
+    if status == 404:
+        return False
+
+    if status >= 400:
+        raise requests.HTTPError(f"{status} Error for url: {url}")
+
+    return True
+
+
+async def getFollowers(username: str, session: aiohttp.ClientSession) -> list:
+    """
+    Get the followers of a GitHub user
+
+    Args:
+        - username (str): The username to check.
+        - session (aiohttp.ClientSession): The session to use.
+
+    Returns:
+        - list: The list of URLs for the followers.
+    """
+    web = github.getCorrectURL(username)
+
+    return await getConnection(f"{web}?tab=followers", session)
+
+
+async def getFollowing(username: str, session: aiohttp.ClientSession) -> list:
+    """
+    Get the people that a GitHub user follows
+
+    Args:
+        - username (str): The username to check.
+        - session (aiohttp.ClientSession): The session to use.
+
+    Returns:
+        - list: The list of URLs for the people followed.
+    """
+    web = github.getCorrectURL(username)
+
+    return await getConnection(f"{web}?tab=following", session)
+
+
+async def getConnection(url: str, session: aiohttp.ClientSession) -> list:
+    """
+    Get the people that are in a connection with a GitHub user
+
+    It can be the followers or the people followed.
+
+    Args:
+        - url (str): The URL to check.
+        - session (aiohttp.ClientSession): The session to use.
+
+    Returns:
+        - list: The list of URLs for the people in the connection.
+    """
+    people = []
+
+    while url:
+        status, html = await fetch(session, url)
+
+        if isValidStatus(status, url):
+            pagePeople, url = github.parseConnectionPage(html)
+            people.extend(pagePeople)
+        else:
+            # The page doesn't exist, we can't check for the next page
+            url = None
+
+    return people
+
+
+async def getRepositories(username: str, session: aiohttp.ClientSession) -> list:
+    """
+    Get the repositories of a GitHub user
+
+    Args:
+        - username (str): The username to check.
+        - session (aiohttp.ClientSession): The session to use.
+
+    Returns:
+        - list: The list of URLs for the repositories.
+    """
+    username = github.getCorrectURL(username)
+    url = f"{username}?tab=repositories"
+
+    repositories = []
+
+    while url:
+        status, html = await fetch(session, url)
+
+        if not isValidStatus(status, url):
+            break
+
+        pageRepositories, url = github.parseRepositoriesPage(html, username)
+        repositories.extend(pageRepositories)
+
+    return repositories
+
+
+async def getStarredRepositories(username: str, session: aiohttp.ClientSession) -> list:
+    """
+    Get the starred repositories of a GitHub user
+
+    Args:
+        - username (str): The username to check.
+        - session (aiohttp.ClientSession): The session to use.
+
+    Returns:
+        - list: The list of URLs for the starred repositories.
+    """
+    username = github.getCorrectURL(username)
+    url = f"{username}?tab=stars"
+
+    repositories = []
+
+    while url:
+        status, html = await fetch(session, url)
+
+        if not isValidStatus(status, url):
+            break
+
+        pageRepositories, url = github.parseStarredPage(html)
+        repositories.extend(pageRepositories)
+
+    return repositories
+
+
+async def getStargazers(repository: str, session: aiohttp.ClientSession) -> list:
+    """
+    Get the stargazers of a GitHub repository
+
+    They are in the order of the pages, like in github.iterStargazers,
+    because the first one is saved as the newest for the refreshes.
+    A stargazer is only given once even if the list moves.
+
+    Args:
+        - repository (str): The repository to check.
+        - session (aiohttp.ClientSession): The session to use.
+
+    Returns:
+        - list: The list of URLs for the stargazers.
+    """
+    repository = github.getCorrectURL(repository)
+    url = urljoin(f"{repository}/", "stargazers")
+
+    stargazers = []
+    seen = set()
+
+    while url:
+        status, html = await fetch(session, url)
+
+        if not isValidStatus(status, url):
+            break
+
+        pageStargazers, url = github.parseStargazersPage(html)
+
+        for stargazer in pageStargazers:
+            if stargazer not in seen:
+                seen.add(stargazer)
+                stargazers.append(stargazer)
+
+    return stargazers
+
+
+async def getContributors(
+    repo: str,
+    session: aiohttp.ClientSession,
+    token: str = None,
+    anonymous: bool = False,
+) -> list:
+    """
+    Get the contributors of a GitHub repository
+
+    It behaves like github.getContributors and follows
+    the 'next' link of the Link header too.
+
+    Args:
+        - repo (str): The repository to check.
+        - session (aiohttp.ClientSession): The session to use.
+        - token (str): The token for the API.
+        - anonymous (bool): Whether to include the anonymous contributors.
+
+    Returns:
+        - list: The list of URLs for the contributors.
+    """
+    url = github.getCorrectURL(repo)
+
+    # First we check that there are contributors to not use the API
+    page = await getRepositoryPage(url, session)
+
+    if not page.hasContributors:
+        return []
+
+    repoUserAndName = "/".join(url.split("/")[-2:])
+    url = github.getContributorsURL(repoUserAndName, anonymous)
+    headers = github.getAPIHeaders(token)
+
+    contributors = []
+
+    while url:
+        status, body, responseHeaders = await fetchWithHeaders(session, url, headers)
+
+        # An empty repository answers 204 without a body
+        if not isValidStatus(status, url) or status != 200 or not body:
+            break
+
+        contributors.extend(github.parseContributors(json.loads(body)))
+
+        url = getNextLink(responseHeaders)
+
+    return contributors
+
+
+def getNextLink(headers: dict) -> str:
+    """
+    Get the URL of the next page from the Link header of the API.
+
+    Args:
+        - headers (dict): The headers of the response.
+
+    Returns:
+        - str: The URL of the next page or None if it is the last one.
+    """
+    for link in requests.utils.parse_header_links(headers.get("Link", "")):
+        if link.get("rel") == "next":
+            return link["url"]
+
+    return None
+
+
+async def getRepositoryParent(
+    url: str, session: aiohttp.ClientSession
+) -> Tuple[str, str]:
+    """
+    Get the parent repository of a forked repository
+    or the template if it was created from one.
+
+    Args:
+        - url (str): The URL to check.
+        - session (aiohttp.ClientSession): The session to use.
+
+    Returns:
+        - str: The parent repository URL.
+        - str: The type of parent ("fork" or "template").
+    """
+    page = await getRepositoryPage(url, session)
+
+    return page.getParent()
+
+
+async def getRepositoryPage(
+    url: str, session: aiohttp.ClientSession
+) -> github.RepositoryPage:
+    """
+    Get the page of a repository downloading it only the first time.
+
+    The pages are shared with github.getRepositoryPage.
+
+    Args:
+        - url (str): The URL of the repository.
+        - session (aiohttp.ClientSession): The session to use.
+
+    Returns:
+        - github.RepositoryPage: The parsed page.
+    """
+    url = github.getCorrectURL(url)
+    page = github.findRepositoryPage(url)
+
+    if page is None:
+        status, html = await fetch(session, url)
+        html = html if isValidStatus(status, url) else None
+        page = github.addRepositoryPage(github.RepositoryPage(url, html))
+
+    return page
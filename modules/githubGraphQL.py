@@ -0,0 +1,311 @@
+from modules import github, httpClient, rateLimiter
+from datetime import datetime, timezone
+import requests
+
+ENDPOINT = "https://api.github.com/graphql"
+PAGE_SIZE = 100
+
+# Name of the field, extra arguments and field with the id of each element
+USER_CONNECTIONS = {
+    "followers": ("followers", "", "login"),
+    "following": ("following", "", "login"),
+    "starred": ("starredRepositories", "", "nameWithOwner"),
+    "repositories": ("repositories", "ownerAffiliations: OWNER", "nameWithOwner"),
+}
+REPOSITORY_CONNECTIONS = {
+    "stargazers": ("stargazers", "", "login"),
+}
+
+
+class GraphQLError(requests.RequestException):
+    """
+    The GraphQL API answered with errors instead of data.
+    """
+
+
+class GitHubGraphQL:
+    def __init__(
+        self,
+        token: str = None,
+        endpoint: str = ENDPOINT,
+        session: requests.Session = None,
+        pageSize: int = PAGE_SIZE,
+    ) -> None:
+        """
+        Initialize the GitHubGraphQL.
+
+        It gets the connections of many users or repositories
+        with a single query, giving each one an alias, instead of
+        downloading the pages of each list one by one. The lists
+        that don't fit in one page are continued with their cursor
+        in the next query, which only asks for the unfinished ones.
+
+        The GitHub API needs a token. The endpoint can be changed
+        to use a local server in the tests.
+
+        Args:
+            - token (str): The token for the API. If it is None
+                it is read with github.getToken.
+            - endpoint (str): The URL of the GraphQL API.
+            - session (requests.Session): The session to use, the shared one by default.
+            - pageSize (int): The elements asked for each list in a query, at most 100.
+
+        Returns:
+            - None
+        """
+        self.token = token if token is not None else github.getToken()
+        self.endpoint = endpoint
+        self.session = session
+        self.pageSize = pageSize
+
+        self.queries = 0
+        self.cost = 0
+        self.remaining = None
+        self.resetAt = None
+
+    def execute(self, query: str, variables: dict = None) -> dict:
+        """
+        Run a GraphQL query.
+
+        The cost of the query is added to "cost" from
+        the rateLimit field if the query asks for it, and
+        the points that remain are given to the rate limiter.
+
+        Args:
+            - query (str): The query.
+            - variables (dict): The values of the variables of the query.
+
+        Returns:
+            - dict: The "data" of the response.
+        """
+        headers = {}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        response = httpClient.post(
+            self.endpoint,
+            {"query": query, "variables": variables or {}},
+            headers,
+            github.getSession(self.session),
+        )
+        response.raise_for_status()
+        self.queries += 1
+
+        body = response.json()
+        data = body.get("data") or {}
+
+        # The users or repositories that don't exist are null, like a 404
+        errors = [
+            error
+            for error in body.get("errors", [])
+            if error.get("type") != "NOT_FOUND"
+        ]
+        if errors or "data" not in body:
+            messages = "; ".join(e.get("message", str(e)) for e in errors)
+            raise GraphQLError(f"GraphQL error for url: {self.endpoint}: {messages}")
+
+        rateLimit = data.get("rateLimit")
+        if rateLimit:
+            self.cost += rateLimit.get("cost", 0)
+            self.remaining = rateLimit.get("remaining")
+            self.resetAt = rateLimit.get("resetAt")
+            self._updateLimiter(rateLimit.get("cost"))
+
+        return data
+
+    def _updateLimiter(self, cost: int) -> None:
+        """
+        Tell the rate limiter how many queries can still be done.
+
+        The GraphQL API counts points instead of requests, so the
+        remaining points are divided by the cost of the last query
+        and given to the limiter like the X-RateLimit headers.
+        When they run out the endpoint is paused until resetAt.
+
+        Args:
+            - cost (int): The points of the last query.
+
+        Returns:
+            - None
+        """
+        if self.remaining is None or self.resetAt is None:
+            return
+
+        reset = datetime.strptime(self.resetAt, "%Y-%m-%dT%H:%M:%SZ")
+        queries = self.remaining // max(cost or 1, 1)
+
+        rateLimiter.LIMITER.update(
+            self.endpoint,
+            200,
+            {
+                "X-RateLimit-Remaining": str(queries),
+                "X-RateLimit-Reset": str(
+                    reset.replace(tzinfo=timezone.utc).timestamp()
+                ),
+            },
+        )
+
+    def fetchUsers(self, users: dict) -> dict:
+        """
+        Get connections of many users.
+
+        The connections are the keys of USER_CONNECTIONS.
+        They are returned in the same format as the scrapers of github.
+
+        Args:
+            - users (dict): The URL of each user as key and the list
+                of connections to get as value.
+
+        Returns:
+            - dict: The URL of each user as key and as value a dict
+                with the URLs of each connection.
+        """
+        return self.fetch("user", users, USER_CONNECTIONS)
+
+    def fetchRepositories(self, repositories: dict) -> dict:
+        """
+        Get connections of many repositories.
+
+        The connections are the keys of REPOSITORY_CONNECTIONS.
+
+        Args:
+            - repositories (dict): The URL of each repository as key
+                and the list of connections to get as value.
+
+        Returns:
+            - dict: The URL of each repository as key and as value
+                a dict with the URLs of each connection.
+        """
+        return self.fetch("repository", repositories, REPOSITORY_CONNECTIONS)
+
+    def fetch(self, kind: str, nodes: dict, connections: dict) -> dict:
+        """
+        Get the connections of many nodes following the cursors.
+
+        Each query asks for all the lists that aren't finished,
+        so it is repeated until every list has no next page.
+
+        Args:
+            - kind (str): "user" or "repository".
+            - nodes (dict): The URL of each node as key and the list
+                of connections to get as value.
+            - connections (dict): The description of the connections.
+
+        Returns:
+            - dict: The URL of each node as key and as value a dict
+                with the URLs of each connection.
+        """
+        results = {
+            node: {connection: [] for connection in wanted}
+            for node, wanted in nodes.items()
+        }
+
+        # The lists that still have pages, with the cursor of the next one
+        pending = {
+            (node, connection): None
+            for node, wanted in nodes.items()
+            for connection in wanted
+        }
+
+        while pending:
+            query, variables, aliases = buildQuery(
+                kind, pending, connections, self.pageSize
+            )
+            data = self.execute(query, variables)
+
+            finished = []
+
+            for (node, connection), (nodeAlias, connectionAlias) in aliases.items():
+                page = (data.get(nodeAlias) or {}).get(connectionAlias)
+
+                if not page:
+                    finished.append((node, connection))
+                    continue
+
+                idField = connections[connection][2]
+                results[node][connection].extend(
+                    github.getCorrectURL(element[idField])
+                    for element in page["nodes"]
+                    if element
+                )
+
+                if page["pageInfo"]["hasNextPage"]:
+                    pending[(node, connection)] = page["pageInfo"]["endCursor"]
+                else:
+                    finished.append((node, connection))
+
+            for key in finished:
+                del pending[key]
+
+        return results
+
+
+def buildQuery(kind: str, pending: dict, connections: dict, pageSize: int) -> tuple:
+    """
+    Build the query for the next page of many lists.
+
+    Each node gets an alias and each of its connections another
+    one inside it. The logins and the cursors are passed as
+    variables so they don't need to be escaped.
+
+    Args:
+        - kind (str): "user" or "repository".
+        - pending (dict): The (node, connection) of each list as key
+            and the cursor of the next page as value.
+        - connections (dict): The description of the connections.
+        - pageSize (int): The elements asked for each list.
+
+    Returns:
+        - str: The query.
+        - dict: The variables.
+        - dict: The (node, connection) as key and the
+            aliases of the node and the connection as value.
+    """
+    byNode = {}
+    for node, connection in pending:
+        byNode.setdefault(node, []).append(connection)
+
+    declarations = []
+    variables = {}
+    fields = []
+    aliases = {}
+
+    for i, (node, nodeConnections) in enumerate(byNode.items()):
+        parts = node.rstrip("/").split("/")
+
+        if kind == "user":
+            declarations.append(f"$login{i}: String!")
+            variables[f"login{i}"] = parts[-1]
+            header = f"n{i}: user(login: $login{i})"
+        else:
+            declarations.extend([f"$owner{i}: String!", f"$name{i}: String!"])
+            variables[f"owner{i}"] = parts[-2]
+            variables[f"name{i}"] = parts[-1]
+            header = f"n{i}: repository(owner: $owner{i}, name: $name{i})"
+
+        body = []
+        for j, connection in enumerate(nodeConnections):
+            field, extra, idField = connections[connection]
+
+            declarations.append(f"$after{i}_{j}: String")
+            variables[f"after{i}_{j}"] = pending[(node, connection)]
+
+            arguments = f"first: {pageSize}, after: $after{i}_{j}"
+            if extra:
+                arguments += f", {extra}"
+
+            body.append(
+                f"c{j}: {field}({arguments}) "
+                f"{{ pageInfo {{ hasNextPage endCursor }} nodes {{ {idField} }} }}"
+            )
+            aliases[(node, connection)] = (f"n{i}", f"c{j}")
+
+        fields.append(f"{header} {{ {' '.join(body)} }}")
+
+    query = (
+        f"query({', '.join(declarations)}) {{ "
+        "rateLimit { cost remaining resetAt } "
+        f"{' '.join(fields)} }}"
+    )
+
+    return query, variables, aliases
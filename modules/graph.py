@@ -1,5 +1,6 @@
 from pyvis.network import Network
 from PIL import ImageColor
+from modules import compactGraph, graphIndex, sqliteGraph
 import networkx as nx
 import copy
 
@@ -77,8 +78,14 @@ def removeDuplicateEdges(graph: nx.MultiDiGraph) -> nx.MultiDiGraph:
         - graph (nx.MultiDiGraph): The graph to be cleaned.
 
     Returns:
-        nx.MultiDiGraph: The cleaned graph.
+        nx.MultiDiGraph: The cleaned graph. A SQLiteGraph
+            is cleaned in place and returned.
     """
+    if isinstance(graph, sqliteGraph.SQLiteGraph):
+        # It is cleaned in place so the database isn't copied
+        graph.removeDuplicateEdges()
+        return graph
+
     cleanedGraph = nx.MultiDiGraph()
 
     # First we add the nodes
@@ -107,99 +114,100 @@ def removeUnconnectedNodes(
         - desiredType (str): The desiredType of the nodes to be kept.
 
     Returns:
-        nx.MultiDiGraph: The cleaned graph.
+        nx.MultiDiGraph: The cleaned graph. A SQLiteGraph
+            is cleaned in place and returned.
     """
+    if isinstance(graph, sqliteGraph.SQLiteGraph):
+        # It is cleaned in place so the database isn't copied
+        graph.removeUnconnectedNodes(desiredType)
+        return graph
+
     cleanedGraph = copy.deepcopy(graph)
 
+    # They are never removed, so they can be found once
+    goodNodes = set(graphIndex.nodesOfType(cleanedGraph, desiredType))
+
     """
     We start by iteratively eliminating all the nodes
     that only have one connection and are not of the desiredType.
+    Each node keeps the number of distinct neighbours it has left,
+    so when a node is removed only its neighbours are checked again.
+    A self-loop counts the node as its own neighbour.
     """
 
-    continueFlag = True
-    nNodes = len(cleanedGraph.nodes())
-
-    while continueFlag:
-        cleanedGraph.remove_nodes_from(
-            [
-                node
-                for node in cleanedGraph
-                if len(
-                    set(n for n in cleanedGraph.successors(node)).union(
-                        set(n for n in cleanedGraph.predecessors(node))
-                    )
-                )
-                < 2
-                and desiredType not in cleanedGraph.nodes[node]["type"]
-            ]
+    degrees = {
+        node: len(
+            set(cleanedGraph.successors(node)).union(cleanedGraph.predecessors(node))
         )
+        for node in cleanedGraph
+    }
+
+    queue = [
+        node for node, degree in degrees.items() if degree < 2 and node not in goodNodes
+    ]
+    queued = set(queue)
 
-        if nNodes == len(cleanedGraph.nodes()):
-            continueFlag = False
+    while queue:
+        node = queue.pop()
 
-        nNodes = len(cleanedGraph.nodes())
+        for neighbor in set(cleanedGraph.successors(node)).union(
+            cleanedGraph.predecessors(node)
+        ):
+            if neighbor == node:
+                continue
+
+            degrees[neighbor] -= 1
+
+            if (
+                degrees[neighbor] < 2
+                and neighbor not in goodNodes
+                and neighbor not in queued
+            ):
+                queued.add(neighbor)
+                queue.append(neighbor)
+
+        cleanedGraph.remove_node(node)
 
     """
     Now we need to eliminate all the nodes that
     can't reach directly 2 nodes of the desiredType.
+    The nodes that aren't of the desiredType are split in the groups
+    that are connected without going through a node of the desiredType.
+    All the nodes of a group reach the same nodes of the desiredType,
+    so each group is traversed once and kept if it touches at least 2.
     """
 
-    goodNodes = [
-        node for node in cleanedGraph if desiredType in cleanedGraph.nodes[node]["type"]
-    ]
+    checkedNodes = set()
+    eliminateNodes = []
 
-    notCheckedSymbol = "Not Checked"
+    for start in cleanedGraph:
+        if start in goodNodes or start in checkedNodes:
+            continue
 
-    eliminateNodes = {
-        node: notCheckedSymbol for node in cleanedGraph if node not in goodNodes
-    }
+        goodFoundNodes = set()
+        componentNodes = [start]
+        checkedNodes.add(start)
+        frontier = [start]
 
-    for n in list(eliminateNodes.keys()):
-        if eliminateNodes[n] == notCheckedSymbol:
-            goodFoundNodes = set()
-            foundNodes = set([n])
-            frontier = [n]
-
-            while frontier:
-                node = frontier.pop()
-
-                for neighbor in set(cleanedGraph.successors(node)) | set(
-                    cleanedGraph.predecessors(node)
-                ):
-
-                    if neighbor in goodNodes:
-                        # It means there is a path to a desiredType node
-                        goodFoundNodes.add(neighbor)
-
-                    elif neighbor not in foundNodes:
-                        foundNodes.add(neighbor)
-                        frontier.append(neighbor)
-
-                        if (
-                            not eliminateNodes[neighbor]
-                            and eliminateNodes[neighbor] != notCheckedSymbol
-                        ):
-                            # The neighbour has been marked as safe
-                            # We fill the goodFoundNodes to mark all the foundNodes as not to be eliminated
-                            # 2 and 3 are just random numbers
-                            goodFoundNodes.add("Garbage 1")
-                            goodFoundNodes.add("Garbage 2")
-
-                if len(goodFoundNodes) >= 2:
-                    for node in foundNodes:
-                        eliminateNodes[node] = False
-                    frontier = []
-
-            if len(goodFoundNodes) < 2:
-                for node in foundNodes:
-                    eliminateNodes[node] = True
-
-    # We check that all the values are booleans
-    assert all(isinstance(eliminateNodes[node], bool) for node in eliminateNodes)
-
-    cleanedGraph.remove_nodes_from(
-        [node for node in eliminateNodes if eliminateNodes[node]]
-    )
+        while frontier:
+            node = frontier.pop()
+
+            for neighbor in set(cleanedGraph.successors(node)).union(
+                cleanedGraph.predecessors(node)
+            ):
+                if neighbor in goodNodes:
+                    # It means there is a path to a desiredType node
+                    goodFoundNodes.add(neighbor)
+
+                elif neighbor not in checkedNodes:
+                    checkedNodes.add(neighbor)
+                    componentNodes.append(neighbor)
+                    frontier.append(neighbor)
+
+        if len(goodFoundNodes) < 2:
+            eliminateNodes.extend(componentNodes)
+
+    cleanedGraph.remove_nodes_from(eliminateNodes)
 
     return cleanedGraph
 
@@ -215,17 +223,87 @@ def removeDirectConnections(
         - desiredType (str): The desiredType of the nodes to be kept.
 
     Returns:
-        nx.MultiDiGraph: The cleaned graph.
+        nx.MultiDiGraph: The cleaned graph. A SQLiteGraph
+            is cleaned in place and returned.
     """
+    if isinstance(graph, sqliteGraph.SQLiteGraph):
+        # It is cleaned in place so the database isn't copied
+        graph.removeDirectConnections(desiredType)
+        return graph
+
     cleanedGraph = copy.deepcopy(graph)
 
+    goodNodes = set(graphIndex.nodesOfType(cleanedGraph, desiredType))
+
     cleanedGraph.remove_edges_from(
         [
-            edge
-            for edge in cleanedGraph.edges()
-            if desiredType in cleanedGraph.nodes[edge[0]]["type"]
-            and desiredType in cleanedGraph.nodes[edge[1]]["type"]
+            (u, v)
+            for u in goodNodes
+            for v in cleanedGraph.successors(u)
+            if v in goodNodes
+            for _ in range(cleanedGraph.number_of_edges(u, v))
         ]
     )
 
     return cleanedGraph
+
+
+def snapshot(graph: nx.MultiDiGraph) -> nx.MultiDiGraph:
+    """
+    Get a copy of a graph that doesn't copy the values of the attributes.
+
+    It is much faster than copy.deepcopy and it is enough to keep
+    a version of the graph while the managers expand the original
+    with inplace=True, because they add nodes and edges, the search
+    flags are integers and "searchInfo" is replaced instead of modified.
+
+    Args:
+        - graph (nx.MultiDiGraph): The graph to copy.
+
+    Returns:
+        nx.MultiDiGraph: The copy. Its attribute dicts are new but
+            the values in them are shared with the original.
+    """
+    return graph.copy()
+
+
+def save(graph: nx.MultiDiGraph, path: str) -> None:
+    """
+    Save a graph in the format of compactGraph.
+
+    It is much faster and smaller than pickling the networkx
+    graph and the edges can be mapped into memory by load.
+
+    Args:
+        - graph (nx.MultiDiGraph): The graph or a compactGraph.CompactGraph.
+        - path (str): The folder, it is created if it doesn't exist.
+
+    Returns:
+        None
+    """
+    if not isinstance(graph, compactGraph.CompactGraph):
+        graph = compactGraph.CompactGraph.fromNetworkx(graph)
+
+    graph.save(path)
+
+
+def load(
+    path: str, mmap: bool = True, nodes: bool = True, edges: bool = True
+) -> compactGraph.CompactGraph:
+    """
+    Load a graph saved with save.
+
+    It is returned as a compactGraph.CompactGraph because creating the
+    networkx graph is the slow part. Its method toNetworkx gives the
+    whole graph or the part of it that is needed.
+
+    Args:
+        - path (str): The folder.
+        - mmap (bool): Whether to map the arrays of the edges into memory.
+        - nodes (bool): Whether to read the URLs and the attributes of the nodes.
+        - edges (bool): Whether to load the edges.
+
+    Returns:
+        compactGraph.CompactGraph: The graph.
+    """
+    return compactGraph.CompactGraph.load(path, mmap, nodes, edges)
@@ -1,140 +1,654 @@
-from modules import github
+from modules import (
+    github,
+    githubAsync,
+    githubGraphQL,
+    graphIndex,
+    searchFlags,
+    credentials,
+    metrics,
+    checkpoint,
+    rateLimiter,
+)
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from typing import Callable, Iterable, Iterator
+from urllib.parse import urlparse
 import networkx as nx
+import requests
+import aiohttp
+import asyncio
+import heapq
 import copy
+import time
 import tqdm
 
+# The search key of each relation of the users and the GraphQL connections it needs
+GRAPHQL_USER_RELATIONS = {
+    "connections": ("githubFollow", ("followers", "following")),
+    "repositories": ("ownedGitHubRepositories", ("repositories",)),
+    "starred": ("githubStarred", ("starred",)),
+}
+
+# The type of the nodes, the search flag and the "_collect" method of each relation
+RELATIONS = {
+    "connections": ("User", "githubFollow", "_collectUserConnections"),
+    "repositories": ("User", "ownedGitHubRepositories", "_collectRepositories"),
+    "starred": ("User", "githubStarred", "_collectStarredRepositories"),
+    "owners": ("Repository", "githubOwner", "_collectOwner"),
+    "contributors": ("Repository", "githubContributors", "_collectContributors"),
+    "stargazers": ("Repository", "githubStargazers", "_collectStargazers"),
+    "parents": ("Repository", "githubParent", "_collectParent"),
+}
+
+# The relations that use the counts of the profile of the user in parallel mode
+PROFILE_RELATIONS = ("connections", "repositories")
+
+
+def nearKnownPriority(graph: nx.MultiDiGraph, node: str, depth: int) -> tuple:
+    """
+    The default priority of the crawler.
+
+    The nodes closer to the seeds go first and, between
+    the ones at the same depth, the ones connected to
+    more "Known" nodes.
+
+    Args:
+        - graph (nx.MultiDiGraph): The graph being crawled.
+        - node (str): The node to score.
+        - depth (int): The distance from the seeds.
+
+    Returns:
+        - tuple: The priority, the lowest is visited first.
+    """
+    neighbors = set(graph.successors(node)).union(graph.predecessors(node))
+    known = sum(1 for n in neighbors if "Known" in graph.nodes[n]["type"])
+    return depth, -known
+
+
+class GraphBatch:
+    def __init__(
+        self, graph: nx.MultiDiGraph, checkpoint: checkpoint.GraphCheckpoint = None
+    ) -> None:
+        """
+        Initialize the GraphBatch.
+
+        It keeps the nodes, edges and search flags found
+        for some nodes and adds them to the graph at once with
+        add_nodes_from and add_edges_from when it is flushed.
+        Until then the graph doesn't change, so the checks
+        look at both the graph and the batch.
+
+        Args:
+            - graph (nx.MultiDiGraph): The graph that is modified when flushing.
+            - checkpoint (checkpoint.GraphCheckpoint): Where the changes
+                are logged when flushing. None to not log them.
+
+        Returns:
+            - None
+        """
+        self.graph = graph
+        self.checkpoint = checkpoint
+        self.nodes = {}
+        self.edges = []
+        self.edgeCounts = {}
+        self.marks = {}
+
+    def hasNode(self, node: str) -> bool:
+        """
+        Check if a node is in the graph or in the batch.
+
+        Args:
+            - node (str): The node.
+
+        Returns:
+            - bool: True if it is in one of them.
+        """
+        return node in self.nodes or node in self.graph
+
+    def addNode(self, node: str, **attributes) -> None:
+        """
+        Add a node if it isn't in the graph or in the batch.
+
+        Args:
+            - node (str): The node.
+            - attributes: The attributes of the node.
+
+        Returns:
+            - None
+        """
+        if not self.hasNode(node):
+            self.nodes[node] = attributes
+
+    def hasEdge(self, u: str, v: str) -> bool:
+        """
+        Check if there is an edge in the graph or in the batch.
+
+        Args:
+            - u (str): The source.
+            - v (str): The target.
+
+        Returns:
+            - bool: True if there is at least one.
+        """
+        return (u, v) in self.edgeCounts or self.graph.has_edge(u, v)
+
+    def addEdge(self, u: str, v: str, **attributes) -> None:
+        """
+        Add an edge.
+
+        Args:
+            - u (str): The source.
+            - v (str): The target.
+            - attributes: The attributes of the edge.
+
+        Returns:
+            - None
+        """
+        self.edges.append((u, v, attributes))
+        self.edgeCounts[(u, v)] = self.edgeCounts.get((u, v), 0) + 1
+
+    def isSearched(self, node: str, searchKey: str) -> bool:
+        """
+        Check if a node is marked with a search flag in the graph or in the batch.
+
+        Args:
+            - node (str): The node.
+            - searchKey (str): The key of the flag.
+
+        Returns:
+            - bool: True if it is marked.
+        """
+        if self.marks.get(node, {}).get(searchKey, False):
+            return True
+
+        attributes = self.nodes.get(node) or self.graph.nodes[node]
+        return searchFlags.isSearched(attributes, searchKey)
+
+    def mark(self, node: str, **values) -> None:
+        """
+        Set the search flags or other values of a node.
+
+        The "_collect" methods mark the nodes after going through all
+        the elements, which can come from a generator that is still
+        downloading pages. If a page fails the node isn't marked
+        and it is searched again the next time.
+
+        Args:
+            - node (str): The node.
+            - values: The keys and their values.
+
+        Returns:
+            - None
+        """
+        self.marks.setdefault(node, {}).update(values)
+
+    def savepoint(self) -> tuple:
+        """
+        Get the state of the batch to go back to it with rollback.
+
+        Args:
+            - None
+
+        Returns:
+            - tuple: The number of nodes and edges and a copy of the marks.
+        """
+        return (
+            len(self.nodes),
+            len(self.edges),
+            {node: dict(values) for node, values in self.marks.items()},
+        )
+
+    def rollback(self, savepoint: tuple) -> None:
+        """
+        Remove what was added to the batch after a savepoint.
+
+        It is used when a relation fails in the middle of its
+        lists, so the nodes and edges of the pages that were
+        read aren't added and the relation is searched
+        again from the start the next time.
+
+        Args:
+            - savepoint (tuple): The result of savepoint.
+
+        Returns:
+            - None
+        """
+        nNodes, nEdges, marks = savepoint
+
+        for node in list(self.nodes)[nNodes:]:
+            del self.nodes[node]
+
+        for u, v, _ in self.edges[nEdges:]:
+            self.edgeCounts[(u, v)] -= 1
+            if not self.edgeCounts[(u, v)]:
+                del self.edgeCounts[(u, v)]
+
+        del self.edges[nEdges:]
+        self.marks = marks
+
+    def flush(self) -> None:
+        """
+        Add everything to the graph and empty the batch.
+
+        The flags are set with graphIndex.setSearchData, so a graph
+        from graph.snapshot doesn't see the change. The batch
+        must only have whole nodes,
+        because the checkpoint can commit after it.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.graph.add_nodes_from(self.nodes.items())
+        self.graph.add_edges_from(self.edges)
+
+        for node, values in self.marks.items():
+            graphIndex.setSearchData(self.graph, node, values)
+
+        if self.checkpoint is not None:
+            self.checkpoint.record(
+                self.graph, list({**self.nodes, **self.marks}), self.edges
+            )
+            self.checkpoint.save()
+
+        self.nodes = {}
+        self.edges = []
+        self.edgeCounts = {}
+        self.marks = {}
+
 
 class GitHubGraphManager:
-    def __init__(self, edgeLabels: bool = False) -> None:
+    def __init__(
+        self,
+        edgeLabels: bool = False,
+        session: requests.Session = None,
+        parallelPages: bool = False,
+        passwordManager: credentials.PasswordManager = None,
+        anonymousContributors: bool = False,
+        graphqlEndpoint: str = githubGraphQL.ENDPOINT,
+        maxWorkers: int = 1,
+        checkpoint: checkpoint.GraphCheckpoint = None,
+        requestsPerSecond: float = None,
+    ) -> None:
         """
         Initialize the GitHubGraphManager.
 
         Args:
             - edgeLabels (bool): Whether to include edge labels in the graph.
+            - session (requests.Session): The session used for the requests.
+                If it is None the shared session of the github module is used.
+            - parallelPages (bool): Whether to download all the pages of
+                a list at the same time using the counts of the profile.
+            - passwordManager (credentials.PasswordManager): The password manager
+                with the GITHUB_TOKEN for the API. If it is None the environment
+                variable is used, and without a token the API is used anonymously.
+            - anonymousContributors (bool): Whether to add the contributors
+                without a GitHub account as nodes with their email.
+            - graphqlEndpoint (str): The URL of the GraphQL API used by
+                the methods that end in "WithGraphQL".
+            - maxWorkers (int): The number of threads that download the
+                lists of different nodes at the same time. With 1 each
+                node is downloaded after the previous one is added.
+            - checkpoint (checkpoint.GraphCheckpoint): Where the changes are
+                logged so a pass that stops can be resumed. None to not log them.
+            - requestsPerSecond (float): The pages of github.com per second.
+                They don't send rate limit headers, so without it the 2 per
+                second of rateLimiter.LIMITER limit parallelPages and maxWorkers.
+                The limiter is shared, so it changes the rate for every manager.
         """
         self.edgeLabels = edgeLabels
+        self.session = session
+        self.parallelPages = parallelPages
+        self.token = github.getToken(passwordManager)
+        self.anonymousContributors = anonymousContributors
+        self.graphql = githubGraphQL.GitHubGraphQL(self.token, graphqlEndpoint, session)
+        self.maxWorkers = maxWorkers
+        self.checkpoint = checkpoint
+
+        if requestsPerSecond is not None:
+            rateLimiter.LIMITER.setLimit(
+                urlparse(github.BASE).hostname, requestsPerSecond
+            )
+
+    def _pendingNodes(
+        self, graph: nx.MultiDiGraph, nodeType: str, searchKey: str
+    ) -> list:
+        """
+        Get the nodes of a type that haven't been searched yet.
+
+        An IndexedGraph has them in its index, so the
+        graph is only checked the first time.
+
+        Args:
+            - graph (nx.MultiDiGraph): The graph to check.
+            - nodeType (str): The type the nodes must have.
+            - searchKey (str): The key of the flag that marks them as searched.
+
+        Returns:
+            - list: The nodes that still need to be searched.
+        """
+        return graphIndex.pendingNodes(graph, searchKey, nodeType)
+
+    def _reportError(self, node: str, error: Exception) -> None:
+        """
+        Report that a node couldn't be searched.
+
+        The node is not marked with its search flag,
+        so it will be searched again in the next pass.
+
+        Args:
+            - node (str): The node that failed.
+            - error (Exception): The error.
+
+        Returns:
+            - None
+        """
+        tqdm.tqdm.write(f"Could not search {node}: {error}")
+
+    def _fetch(self, relation: str, node: str, counts: dict = None) -> tuple:
+        """
+        Start the download of a relation of a node.
+
+        The repository pages are shared between the relations
+        because github.getRepositoryPage keeps them. The counts
+        of the profile of a user can be shared by passing them.
+
+        Args:
+            - relation (str): A key of RELATIONS.
+            - node (str): The user or repository.
+            - counts (dict): The counts of the profile of the user for the
+                parallel mode. If it is None they are downloaded when needed.
+
+        Returns:
+            - tuple: The arguments after the node of the "_collect" method
+                of the relation. The lists are generators that download
+                the pages while they are read.
+        """
+        if counts is None and self.parallelPages and relation in PROFILE_RELATIONS:
+            counts = github.getProfileCounts(node, self.session)
+
+        if relation == "connections":
+            return (
+                github.iterFollowers(
+                    node, self.session, parallel=self.parallelPages, counts=counts
+                ),
+                github.iterFollowing(
+                    node, self.session, parallel=self.parallelPages, counts=counts
+                ),
+            )
+        elif relation == "repositories":
+            return (
+                github.iterRepositories(
+                    node, self.session, parallel=self.parallelPages, counts=counts
+                ),
+            )
+        elif relation == "starred":
+            return (github.iterStarred(node, self.session),)
+        elif relation == "contributors":
+            return (
+                github.iterContributors(
+                    node, self.session, self.token, self.anonymousContributors
+                ),
+            )
+        elif relation == "stargazers":
+            return (
+                github.iterStargazers(node, self.session, parallel=self.parallelPages),
+            )
+        elif relation == "owners":
+            return (github.getOwner(node),)
+        elif relation == "parents":
+            return github.getRepositoryParent(node, self.session)
+
+        raise ValueError(f"Unknown relation: {relation}")
+
+    def _expandNodes(
+        self,
+        graph: nx.MultiDiGraph,
+        nodes: list,
+        fetch: Callable,
+        apply: Callable,
+        desc: str,
+    ) -> None:
+        """
+        Download the data of some nodes and add it to the graph.
+
+        With more than one worker the downloads run in a thread pool
+        and the generators are read there. The results are added
+        by this thread alone, because networkx isn't thread-safe,
+        and in the order of the nodes so the graph is the same
+        as with a single worker. Only a few nodes are downloaded
+        ahead of the one being added so the lists don't pile up.
+
+        The "_apply" methods keep the whole list of a node in a
+        GraphBatch and add it when the generator ends, so a node
+        whose pages fail isn't left half added. This trades the
+        streaming of the generators for atomicity: the pages of a
+        node are still downloaded lazily, but the list of each node
+        is held in memory until it is complete.
+
+        Args:
+            - graph (nx.MultiDiGraph): The graph to be modified.
+            - nodes (list): The nodes to search.
+            - fetch (Callable): Gets a node and returns a tuple with
+                the arguments of apply after the node.
+            - apply (Callable): The "_apply" method that adds the data.
+            - desc (str): The description of the progress bar.
+
+        Returns:
+            - None
+        """
+        if self.maxWorkers <= 1:
+            for node in tqdm.tqdm(nodes, desc=desc):
+                # The list is held in the batch until its last page arrives
+                try:
+                    apply(graph, node, *fetch(node))
+                except requests.RequestException as e:
+                    self._reportError(node, e)
+            return
+
+        def fetchAll(node: str) -> tuple:
+            try:
+                parts = fetch(node)
+                return (
+                    tuple(
+                        list(part) if isinstance(part, Iterator) else part
+                        for part in parts
+                    ),
+                    None,
+                )
+            except requests.RequestException as e:
+                return None, e
+
+        remaining = iter(nodes)
+
+        with ThreadPoolExecutor(max_workers=self.maxWorkers) as executor:
+            with tqdm.tqdm(total=len(nodes), desc=desc) as progress:
+                running = deque()
+
+                for node in remaining:
+                    running.append((node, executor.submit(fetchAll, node)))
+                    if len(running) >= 2 * self.maxWorkers:
+                        break
+
+                while running:
+                    node, future = running.popleft()
+
+                    for nextNode in remaining:
+                        running.append((nextNode, executor.submit(fetchAll, nextNode)))
+                        break
+
+                    parts, error = future.result()
+                    if error is None:
+                        apply(graph, node, *parts)
+                    else:
+                        self._reportError(node, error)
+
+                    progress.update(1)
 
-    def addRepositories(self, graph: nx.MultiDiGraph) -> nx.MultiDiGraph:
+    def addRepositories(
+        self, graph: nx.MultiDiGraph, inplace: bool = False
+    ) -> nx.MultiDiGraph:
         """
         Add the repositories for all the nodes that have
         the type "User" in the graph. It adds the repositories
         as their url.
 
         When we have found all the repository of a user, we mark it
-        in the attribute "searchData" with the key "ownedGitHubRepositories"
+        with the search flag "ownedGitHubRepositories"
         so we don't have to search it again.
 
         We also mark the repository with the key "githubOwner".
 
         Args:
             - graph (nx.MultiDiGraph): The graph to be modified.
+            - inplace (bool): Whether to modify the given graph instead of a copy.
 
         Returns:
             - nx.MultiDiGraph: The graph with the repositories.
         """
-        graph = copy.deepcopy(graph)
+        if not inplace:
+            graph = copy.deepcopy(graph)
 
-        nodes, attributeList = zip(*graph.nodes(data=True))
+        self._expandNodes(
+            graph,
+            self._pendingNodes(graph, "User", "ownedGitHubRepositories"),
+            lambda node: self._fetch("repositories", node),
+            self._applyRepositories,
+            "Adding owned repositories",
+        )
 
-        for node, attributes in tqdm.tqdm(
-            zip(nodes, attributeList),
-            total=len(nodes),
-            desc="Adding owned repositories",
-        ):
-            if "User" in attributes["type"]:
-                if not attributes.get("searchData", False) or not attributes[
-                    "searchData"
-                ].get("ownedGitHubRepositories", False):
-                    repositories = github.getRepositories(node)
-
-                    for repo in repositories:
-                        if repo not in graph.nodes():
-                            graph.add_node(
-                                repo, type=("GitHub", "Repository"), color="blue"
-                            )
+        return graph
 
-                        if self.edgeLabels:
-                            graph.add_edge(node, repo, label="owns")
-                        else:
-                            graph.add_edge(node, repo)
-
-                        # We also need to add that we know the owner of the repository
-                        if not graph.nodes[repo].get("searchData", False):
-                            graph.nodes[repo]["searchData"] = {"githubOwner": True}
-                        else:
-                            graph.nodes[repo]["searchData"]["githubOwner"] = True
-
-                    if attributes.get("searchData", False):
-                        graph.nodes[node]["searchData"][
-                            "ownedGitHubRepositories"
-                        ] = True
-                    else:
-                        graph.nodes[node]["searchData"] = {
-                            "ownedGitHubRepositories": True
-                        }
+    def _applyRepositories(
+        self, graph: nx.MultiDiGraph, node: str, repositories: Iterable
+    ) -> None:
+        """
+        Add the owned repositories of a user to the graph.
 
-                else:
-                    # We have already added the repositories
-                    pass
+        Args:
+            - graph (nx.MultiDiGraph): The graph to be modified.
+            - node (str): The user.
+            - repositories (Iterable): The URLs of the repositories of the user.
 
-        return graph
+        Returns:
+            - None
+        """
+        batch = GraphBatch(graph, self.checkpoint)
+        self._collectRepositories(batch, node, repositories)
+        batch.flush()
+
+    def _collectRepositories(
+        self, batch: GraphBatch, node: str, repositories: Iterable
+    ) -> None:
+        """
+        Add the owned repositories of a user to a batch.
+
+        Args:
+            - batch (GraphBatch): The batch to be modified.
+            - node (str): The user.
+            - repositories (Iterable): The URLs of the repositories of the user.
+
+        Returns:
+            - None
+        """
+        for repo in repositories:
+            batch.addNode(repo, type=("GitHub", "Repository"), color="blue")
+
+            if self.edgeLabels:
+                batch.addEdge(node, repo, label="owns")
+            else:
+                batch.addEdge(node, repo)
+
+            # We also need to add that we know the owner of the repository
+            batch.mark(repo, githubOwner=True)
 
-    def addContributors(self, graph: nx.MultiDiGraph) -> nx.MultiDiGraph:
+        batch.mark(node, ownedGitHubRepositories=True)
+
+    def addContributors(
+        self, graph: nx.MultiDiGraph, inplace: bool = False
+    ) -> nx.MultiDiGraph:
         """
         Add the contributors for all the nodes that have
         the type "Repository" in the graph. It adds the contributors
         as their url.
 
         When we have found all the contributors of a repository, we mark it
-        in the attribute "searchData" with the key "githubContributors"
+        with the search flag "githubContributors"
         so we don't have to search it again.
 
         Args:
             - graph (nx.MultiDiGraph): The graph to be modified.
+            - inplace (bool): Whether to modify the given graph instead of a copy.
 
         Returns:
             - nx.MultiDiGraph: The graph with the contributors.
         """
-        graph = copy.deepcopy(graph)
+        if not inplace:
+            graph = copy.deepcopy(graph)
 
-        nodes, attributeList = zip(*graph.nodes(data=True))
+        self._expandNodes(
+            graph,
+            self._pendingNodes(graph, "Repository", "githubContributors"),
+            lambda node: self._fetch("contributors", node),
+            self._applyContributors,
+            "Adding contributors",
+        )
 
-        for node, attributes in tqdm.tqdm(
-            zip(nodes, attributeList), total=len(nodes), desc="Adding contributors"
-        ):
-            if "Repository" in attributes["type"]:
-                if not attributes.get("searchData", False) or not attributes[
-                    "searchData"
-                ].get("githubContributors", False):
-                    contributors = github.getContributors(node)
-
-                    for c in contributors:
-                        if c not in graph.nodes():
-                            graph.add_node(
-                                c, type=("GitHub", "User"), color=github.COLOR
-                            )
+        return graph
 
-                        if self.edgeLabels:
-                            graph.add_edge(c, node, label="contributes")
-                        else:
-                            graph.add_edge(c, node)
+    def _applyContributors(
+        self, graph: nx.MultiDiGraph, node: str, contributors: Iterable
+    ) -> None:
+        """
+        Add the contributors of a repository to the graph.
 
-                    if attributes.get("searchData", False):
-                        graph.nodes[node]["searchData"]["githubContributors"] = True
-                    else:
-                        graph.nodes[node]["searchData"] = {"githubContributors": True}
+        Args:
+            - graph (nx.MultiDiGraph): The graph to be modified.
+            - node (str): The repository.
+            - contributors (Iterable): The URLs of the contributors.
 
-                else:
-                    # We have already added the contributors
-                    pass
+        Returns:
+            - None
+        """
+        batch = GraphBatch(graph, self.checkpoint)
+        self._collectContributors(batch, node, contributors)
+        batch.flush()
 
-        return graph
+    def _collectContributors(
+        self, batch: GraphBatch, node: str, contributors: Iterable
+    ) -> None:
+        """
+        Add the contributors of a repository to a batch.
+
+        Args:
+            - batch (GraphBatch): The batch to be modified.
+            - node (str): The repository.
+            - contributors (Iterable): The URLs of the contributors.
 
-    def addParentsToRepository(self, graph: nx.MultiDiGraph) -> nx.MultiDiGraph:
+        Returns:
+            - None
+        """
+        for c in contributors:
+            # The anonymous contributors don't have a profile to search
+            nodeType = "Anonymous" if c.startswith("mailto:") else "User"
+            batch.addNode(c, type=("GitHub", nodeType), color=github.COLOR)
+
+            if self.edgeLabels:
+                batch.addEdge(c, node, label="contributes")
+            else:
+                batch.addEdge(c, node)
+
+        batch.mark(node, githubContributors=True)
+
+    def addParentsToRepository(
+        self, graph: nx.MultiDiGraph, inplace: bool = False
+    ) -> nx.MultiDiGraph:
         """
         If the repository is a fork, we add the parent to the graph.
 
-        We mark "searchData" with the key "githubParent" so we don't
+        We mark it with the search flag "githubParent" so we don't
         have to search it again.
 
         When we find a repository that is a fork we continue
@@ -142,51 +656,40 @@ class GitHubGraphManager:
 
         Args:
             - graph (nx.MultiDiGraph): The graph to be modified.
+            - inplace (bool): Whether to modify the given graph instead of a copy.
 
         Returns:
             - nx.MultiDiGraph: The graph with the parents.
         """
-        graph = copy.deepcopy(graph)
+        if not inplace:
+            graph = copy.deepcopy(graph)
 
-        nodes, attributeList = zip(*graph.nodes(data=True))
+        # With more than one worker the parents are downloaded first
+        parents = self._fetchParents(graph) if self.maxWorkers > 1 else {}
 
-        for node, attributes in tqdm.tqdm(
-            zip(nodes, attributeList),
-            total=len(nodes),
+        for node in tqdm.tqdm(
+            self._pendingNodes(graph, "Repository", "githubParent"),
             desc="Adding repositories' parents",
         ):
 
-            tempNode, tempAttributes = node, attributes
+            tempNode, tempAttributes = node, graph.nodes[node]
             continueFlag = True
 
             while continueFlag:
 
-                if "Repository" in tempAttributes["type"] and (
-                    not tempAttributes.get("searchData", False)
-                    or not tempAttributes["searchData"].get("githubParent", False)
-                ):
-                    parent, type = github.getRepositoryParent(tempNode)
-
-                    if parent:
-                        if parent not in graph.nodes():
-                            graph.add_node(
-                                parent, type=("GitHub", "Repository"), color="blue"
-                            )
+                if "Repository" in tempAttributes[
+                    "type"
+                ] and not searchFlags.isSearched(tempAttributes, "githubParent"):
+                    try:
+                        fetched = parents.pop(tempNode, None)
+                        if isinstance(fetched, requests.RequestException):
+                            raise fetched
+                        parent, type = fetched or self._fetch("parents", tempNode)
+                    except requests.RequestException as e:
+                        self._reportError(tempNode, e)
+                        break
 
-                        if self.edgeLabels:
-                            if type == "fork":
-                                graph.add_edge(tempNode, parent, label="forkedFrom")
-                            elif type == "template":
-                                graph.add_edge(tempNode, parent, label="templateFrom")
-                            else:
-                                graph.add_edge(tempNode, parent, label="parent")
-                        else:
-                            graph.add_edge(tempNode, parent)
-
-                    if tempAttributes.get("searchData", False):
-                        graph.nodes[tempNode]["searchData"]["githubParent"] = True
-                    else:
-                        graph.nodes[tempNode]["searchData"] = {"githubParent": True}
+                    self._applyParent(graph, tempNode, parent, type)
 
                     if parent:
                         tempNode = parent
@@ -198,264 +701,1222 @@ class GitHubGraphManager:
 
         return graph
 
-    def addUserConnections(self, graph: nx.MultiDiGraph) -> nx.MultiDiGraph:
+    def _fetchParents(self, graph: nx.MultiDiGraph) -> dict:
+        """
+        Download in parallel the parents that addParentsToRepository needs.
+
+        Each round downloads the parents of the repositories found
+        in the previous one, until the chains reach a repository
+        that was already searched. Nothing is added to the graph,
+        so the parents are added afterwards in the same order
+        as with a single worker.
+
+        Args:
+            - graph (nx.MultiDiGraph): The graph to be searched.
+
+        Returns:
+            - dict: The parent and its type of each repository, or
+                the RequestException if it couldn't be downloaded.
+        """
+
+        def fetch(node: str) -> tuple:
+            try:
+                return self._fetch("parents", node)
+            except requests.RequestException as e:
+                return e
+
+        fetched = {}
+        nodes = self._pendingNodes(graph, "Repository", "githubParent")
+
+        with ThreadPoolExecutor(max_workers=self.maxWorkers) as executor:
+            while nodes:
+                fetched.update(
+                    zip(
+                        nodes,
+                        tqdm.tqdm(
+                            executor.map(fetch, nodes),
+                            total=len(nodes),
+                            desc="Downloading repositories' parents",
+                        ),
+                    )
+                )
+
+                # The next round has the parents that haven't been searched
+                parents = [
+                    fetched[node][0]
+                    for node in nodes
+                    if isinstance(fetched[node], tuple) and fetched[node][0]
+                ]
+                nodes = [
+                    parent
+                    for parent in dict.fromkeys(parents)
+                    if parent not in fetched
+                    and (
+                        parent not in graph
+                        or (
+                            "Repository" in graph.nodes[parent]["type"]
+                            and not searchFlags.isSearched(
+                                graph.nodes[parent], "githubParent"
+                            )
+                        )
+                    )
+                ]
+
+        return fetched
+
+    def _applyParent(
+        self, graph: nx.MultiDiGraph, node: str, parent: str, type: str
+    ) -> None:
+        """
+        Add the parent of a repository to the graph.
+
+        Args:
+            - graph (nx.MultiDiGraph): The graph to be modified.
+            - node (str): The repository.
+            - parent (str): The URL of the parent or None if it doesn't have one.
+            - type (str): "fork", "template" or None.
+
+        Returns:
+            - None
+        """
+        batch = GraphBatch(graph, self.checkpoint)
+        self._collectParent(batch, node, parent, type)
+        batch.flush()
+
+    def _collectParent(
+        self, batch: GraphBatch, node: str, parent: str, type: str
+    ) -> None:
+        """
+        Add the parent of a repository to a batch.
+
+        Args:
+            - batch (GraphBatch): The batch to be modified.
+            - node (str): The repository.
+            - parent (str): The URL of the parent or None if it doesn't have one.
+            - type (str): "fork", "template" or None.
+
+        Returns:
+            - None
+        """
+        if parent:
+            batch.addNode(parent, type=("GitHub", "Repository"), color="blue")
+
+            if self.edgeLabels:
+                if type == "fork":
+                    batch.addEdge(node, parent, label="forkedFrom")
+                elif type == "template":
+                    batch.addEdge(node, parent, label="templateFrom")
+                else:
+                    batch.addEdge(node, parent, label="parent")
+            else:
+                batch.addEdge(node, parent)
+
+        batch.mark(node, githubParent=True)
+
+    def addUserConnections(
+        self, graph: nx.MultiDiGraph, inplace: bool = False
+    ) -> nx.MultiDiGraph:
         """
         Add the followers and following for all the nodes that have
         the type "User" in the graph. It adds the followers
         as their url.
 
         When we have found all the followers of a user, we mark it
-        in the attribute "searchData" with the key "githubFollow"
+        with the search flag "githubFollow"
 
         Args:
             - graph (nx.MultiDiGraph): The graph to be modified.
+            - inplace (bool): Whether to modify the given graph instead of a copy.
 
         Returns:
             - nx.MultiDiGraph: The graph with the followers.
         """
-        graph = copy.deepcopy(graph)
+        if not inplace:
+            graph = copy.deepcopy(graph)
 
-        nodes, attributeList = zip(*graph.nodes(data=True))
+        self._expandNodes(
+            graph,
+            self._pendingNodes(graph, "User", "githubFollow"),
+            lambda node: self._fetch("connections", node),
+            self._applyUserConnections,
+            "Adding following and followers",
+        )
 
-        for node, attributes in tqdm.tqdm(
-            zip(nodes, attributeList),
-            total=len(nodes),
-            desc="Adding following and followers",
-        ):
-            if "User" in attributes["type"]:
-                if not attributes.get("searchData", False) or not attributes[
-                    "searchData"
-                ].get("githubFollow", False):
-                    followers = github.getFollowers(node)
-
-                    for f in followers:
-                        if f not in graph.nodes():
-                            graph.add_node(
-                                f, type=("GitHub", "User"), color=github.COLOR
-                            )
+        return graph
 
-                        # Check if the edge already exists to avoid duplicates
-                        # This is only valid because between users the only relation is "follows"
-                        if not graph.has_edge(f, node):
-                            if self.edgeLabels:
-                                graph.add_edge(f, node, label="follows")
-                            else:
-                                graph.add_edge(f, node)
+    def _applyUserConnections(
+        self,
+        graph: nx.MultiDiGraph,
+        node: str,
+        followers: Iterable,
+        following: Iterable,
+        newestFirst: bool = True,
+    ) -> None:
+        """
+        Add the followers and the people followed by a user to the graph.
 
-                    following = github.getFollowing(node)
+        Args:
+            - graph (nx.MultiDiGraph): The graph to be modified.
+            - node (str): The user.
+            - followers (Iterable): The URLs of the followers.
+            - following (Iterable): The URLs of the people followed.
+            - newestFirst (bool): Whether the lists are ordered newest first.
 
-                    for f in following:
-                        if f not in graph.nodes():
-                            graph.add_node(
-                                f, type=("GitHub", "User"), color=github.COLOR
-                            )
+        Returns:
+            - None
+        """
+        batch = GraphBatch(graph, self.checkpoint)
+        self._collectUserConnections(batch, node, followers, following, newestFirst)
+        batch.flush()
+
+    def _collectUserConnections(
+        self,
+        batch: GraphBatch,
+        node: str,
+        followers: Iterable,
+        following: Iterable,
+        newestFirst: bool = True,
+    ) -> None:
+        """
+        Add the followers and the people followed by a user to a batch.
 
-                        # Check if the edge already exists to avoid duplicates
-                        # This is only valid because between users the only relation is "follows"
-                        if not graph.has_edge(node, f):
-                            if self.edgeLabels:
-                                graph.add_edge(node, f, label="follows")
-                            else:
-                                graph.add_edge(node, f)
+        The time and the first entry of each list are saved with the flag.
+        The pages of GitHub show the followers newest first, so that entry
+        is where the next refresh can stop. The lists without entries are
+        missing so their previous entry is kept. The GraphQL API doesn't
+        promise that order, so its lists don't save the first entry and
+        the refresh stops after the known entries instead.
 
-                    if attributes.get("searchData", False):
-                        graph.nodes[node]["searchData"]["githubFollow"] = True
-                    else:
-                        graph.nodes[node]["searchData"] = {"githubFollow": True}
+        Args:
+            - batch (GraphBatch): The batch to be modified.
+            - node (str): The user.
+            - followers (Iterable): The URLs of the followers.
+            - following (Iterable): The URLs of the people followed.
+            - newestFirst (bool): Whether the lists are ordered newest first,
+                so their first entry can be saved.
+
+        Returns:
+            - None
+        """
+        newest = {}
+
+        for f in followers:
+            newest.setdefault("githubFollowersNewest", f)
+
+            batch.addNode(f, type=("GitHub", "User"), color=github.COLOR)
 
+            # Check if the edge already exists to avoid duplicates
+            # This is only valid because between users the only relation is "follows"
+            if not batch.hasEdge(f, node):
+                if self.edgeLabels:
+                    batch.addEdge(f, node, label="follows")
                 else:
-                    # We have already added the followers
-                    pass
+                    batch.addEdge(f, node)
 
-        return graph
+        for f in following:
+            newest.setdefault("githubFollowingNewest", f)
+
+            batch.addNode(f, type=("GitHub", "User"), color=github.COLOR)
+
+            # Check if the edge already exists to avoid duplicates
+            # This is only valid because between users the only relation is "follows"
+            if not batch.hasEdge(node, f):
+                if self.edgeLabels:
+                    batch.addEdge(node, f, label="follows")
+                else:
+                    batch.addEdge(node, f)
+
+        if not newestFirst:
+            newest = {}
 
-    def addStarredRepositories(self, graph: nx.MultiDiGraph) -> nx.MultiDiGraph:
+        batch.mark(node, githubFollow=True, githubFollowRefreshed=time.time(), **newest)
+
+    def addStarredRepositories(
+        self, graph: nx.MultiDiGraph, inplace: bool = False
+    ) -> nx.MultiDiGraph:
         """
         Add the starred repositories for all the nodes that have
         the type "User" in the graph. It adds the starred repositories
         as their url.
 
         When we have found all the starred repositories of a user, we mark it
-        in the attribute "searchData" with the key "githubStarred"
+        with the search flag "githubStarred"
 
         Args:
             - graph (nx.MultiDiGraph): The graph to be modified.
+            - inplace (bool): Whether to modify the given graph instead of a copy.
 
         Returns:
             - nx.MultiDiGraph: The graph with the starred repositories.
         """
-        graph = copy.deepcopy(graph)
+        if not inplace:
+            graph = copy.deepcopy(graph)
 
-        nodes, attributeList = zip(*graph.nodes(data=True))
+        self._expandNodes(
+            graph,
+            self._pendingNodes(graph, "User", "githubStarred"),
+            lambda node: self._fetch("starred", node),
+            self._applyStarredRepositories,
+            "Adding starred repositories",
+        )
 
-        for node, attributes in tqdm.tqdm(
-            zip(nodes, attributeList),
-            total=len(nodes),
-            desc="Adding starred repositories",
-        ):
-            if "User" in attributes["type"]:
-                if not attributes.get("searchData", False) or not attributes[
-                    "searchData"
-                ].get("githubStarred", False):
-                    starred = github.getStarredRepositories(node)
-
-                    for s in starred:
-                        if s not in graph.nodes():
-                            graph.add_node(
-                                s, type=("GitHub", "Repository"), color="blue"
-                            )
+        return graph
 
-                        if self.edgeLabels:
-                            graph.add_edge(node, s, label="starred")
-                        else:
-                            graph.add_edge(node, s)
+    def _applyStarredRepositories(
+        self, graph: nx.MultiDiGraph, node: str, starred: Iterable
+    ) -> None:
+        """
+        Add the starred repositories of a user to the graph.
 
-                    if attributes.get("searchData", False):
-                        graph.nodes[node]["searchData"]["githubStarred"] = True
-                    else:
-                        graph.nodes[node]["searchData"] = {"githubStarred": True}
+        Args:
+            - graph (nx.MultiDiGraph): The graph to be modified.
+            - node (str): The user.
+            - starred (Iterable): The URLs of the starred repositories.
 
-                else:
-                    # We have already added the starred repositories
-                    pass
+        Returns:
+            - None
+        """
+        batch = GraphBatch(graph, self.checkpoint)
+        self._collectStarredRepositories(batch, node, starred)
+        batch.flush()
 
-        return graph
+    def _collectStarredRepositories(
+        self, batch: GraphBatch, node: str, starred: Iterable
+    ) -> None:
+        """
+        Add the starred repositories of a user to a batch.
+
+        Args:
+            - batch (GraphBatch): The batch to be modified.
+            - node (str): The user.
+            - starred (Iterable): The URLs of the starred repositories.
 
-    def addOwners(self, graph: nx.MultiDiGraph) -> nx.MultiDiGraph:
+        Returns:
+            - None
+        """
+        for s in starred:
+            batch.addNode(s, type=("GitHub", "Repository"), color="blue")
+
+            if self.edgeLabels:
+                batch.addEdge(node, s, label="starred")
+            else:
+                batch.addEdge(node, s)
+
+        batch.mark(node, githubStarred=True)
+
+    def addOwners(
+        self, graph: nx.MultiDiGraph, inplace: bool = False
+    ) -> nx.MultiDiGraph:
         """
         Add the owner of the repository to the graph.
 
         When we have found the owner of a repository, we mark it
-        in the attribute "searchData" with the key "githubOwner"
+        with the search flag "githubOwner"
 
         Args:
             - graph (nx.MultiDiGraph): The graph to be modified.
+            - inplace (bool): Whether to modify the given graph instead of a copy.
 
         Returns:
             - nx.MultiDiGraph: The graph with the owners.
         """
-        graph = copy.deepcopy(graph)
+        if not inplace:
+            graph = copy.deepcopy(graph)
 
-        nodes, attributeList = zip(*graph.nodes(data=True))
-
-        for node, attributes in tqdm.tqdm(
-            zip(nodes, attributeList), total=len(nodes), desc="Adding repository owner"
+        for node in tqdm.tqdm(
+            self._pendingNodes(graph, "Repository", "githubOwner"),
+            desc="Adding repository owner",
         ):
-            if "Repository" in attributes["type"] and (
-                not attributes.get("searchData", False)
-                or not attributes["searchData"].get("githubOwner", False)
-            ):
-                owner = github.getOwner(node)
+            self._applyOwner(graph, node, github.getOwner(node))
 
-                if owner not in graph.nodes():
-                    graph.add_node(owner, type=("GitHub", "User"), color=github.COLOR)
+        return graph
 
-                if self.edgeLabels:
-                    graph.add_edge(owner, node, label="owns")
-                else:
-                    graph.add_edge(owner, node)
+    def _applyOwner(self, graph: nx.MultiDiGraph, node: str, owner: str) -> None:
+        """
+        Add the owner of a repository to the graph.
 
-                if attributes.get("searchData", False):
-                    graph.nodes[node]["searchData"]["githubOwner"] = True
-                else:
-                    graph.nodes[node]["searchData"] = {"githubOwner": True}
+        Args:
+            - graph (nx.MultiDiGraph): The graph to be modified.
+            - node (str): The repository.
+            - owner (str): The URL of the owner.
 
-            else:
-                # We have already added the owner or it was a user
-                pass
+        Returns:
+            - None
+        """
+        batch = GraphBatch(graph, self.checkpoint)
+        self._collectOwner(batch, node, owner)
+        batch.flush()
 
-        return graph
+    def _collectOwner(self, batch: GraphBatch, node: str, owner: str) -> None:
+        """
+        Add the owner of a repository to a batch.
+
+        Args:
+            - batch (GraphBatch): The batch to be modified.
+            - node (str): The repository.
+            - owner (str): The URL of the owner.
+
+        Returns:
+            - None
+        """
+        batch.addNode(owner, type=("GitHub", "User"), color=github.COLOR)
+
+        if self.edgeLabels:
+            batch.addEdge(owner, node, label="owns")
+        else:
+            batch.addEdge(owner, node)
+
+        batch.mark(node, githubOwner=True)
 
-    def addStargazers(self, graph: nx.MultiDiGraph) -> nx.MultiDiGraph:
+    def addStargazers(
+        self, graph: nx.MultiDiGraph, inplace: bool = False
+    ) -> nx.MultiDiGraph:
         """
         Add the stargazers of the repositories to the graph.
 
         When we have found the stargazers of a repository, we mark it
-        in the attribute "searchData" with the key "githubStargazers"
+        with the search flag "githubStargazers"
 
         Args:
             - graph (nx.MultiDiGraph): The graph to be modified.
+            - inplace (bool): Whether to modify the given graph instead of a copy.
 
         Returns:
             - nx.MultiDiGraph: The graph with the stargazers.
         """
-        graph = copy.deepcopy(graph)
+        if not inplace:
+            graph = copy.deepcopy(graph)
 
-        nodes, attributeList = zip(*graph.nodes(data=True))
+        self._expandNodes(
+            graph,
+            self._pendingNodes(graph, "Repository", "githubStargazers"),
+            lambda node: self._fetch("stargazers", node),
+            self._applyStargazers,
+            "Adding stargazers",
+        )
 
-        for node, attributes in tqdm.tqdm(
-            zip(nodes, attributeList), total=len(nodes), desc="Adding stargazers"
-        ):
-            if "Repository" in attributes["type"] and (
-                not attributes.get("searchData", False)
-                or not attributes["searchData"].get("githubStargazers", False)
+        return graph
+
+    def _applyStargazers(
+        self,
+        graph: nx.MultiDiGraph,
+        node: str,
+        stargazers: Iterable,
+        newestFirst: bool = True,
+    ) -> None:
+        """
+        Add the stargazers of a repository to the graph.
+
+        Args:
+            - graph (nx.MultiDiGraph): The graph to be modified.
+            - node (str): The repository.
+            - stargazers (Iterable): The URLs of the stargazers.
+            - newestFirst (bool): Whether the list is ordered newest first.
+
+        Returns:
+            - None
+        """
+        batch = GraphBatch(graph, self.checkpoint)
+        self._collectStargazers(batch, node, stargazers, newestFirst)
+        batch.flush()
+
+    def _collectStargazers(
+        self,
+        batch: GraphBatch,
+        node: str,
+        stargazers: Iterable,
+        newestFirst: bool = True,
+    ) -> None:
+        """
+        Add the stargazers of a repository to a batch.
+
+        The time and the first stargazer are saved with the flag
+        like in _collectUserConnections.
+
+        Args:
+            - batch (GraphBatch): The batch to be modified.
+            - node (str): The repository.
+            - stargazers (Iterable): The URLs of the stargazers.
+            - newestFirst (bool): Whether the list is ordered newest first,
+                so its first entry can be saved.
+
+        Returns:
+            - None
+        """
+        newest = {}
+
+        for s in stargazers:
+            newest.setdefault("githubStargazersNewest", s)
+
+            batch.addNode(s, type=("GitHub", "User"), color=github.COLOR)
+
+            if self.edgeLabels:
+                batch.addEdge(s, node, label="starred")
+            else:
+                batch.addEdge(s, node)
+
+        if not newestFirst:
+            newest = {}
+
+        batch.mark(
+            node, githubStargazers=True, githubStargazersRefreshed=time.time(), **newest
+        )
+
+    def expand(
+        self,
+        graph: nx.MultiDiGraph,
+        relations: tuple = tuple(RELATIONS),
+        batchSize: int = 100,
+        inplace: bool = False,
+    ) -> nx.MultiDiGraph:
+        """
+        Search several relations of all the nodes in a single pass.
+
+        It does the same as calling the add methods of the relations
+        one after another, but it goes through the nodes once and
+        searches every relation of each node together. The pages
+        are shared between the relations: the repository pages are
+        kept by github.getRepositoryPage and the counts of the profile
+        of a user are downloaded once for all its relations.
+
+        The new nodes and edges are added with add_nodes_from and
+        add_edges_from every "batchSize" nodes. The nodes found in
+        this pass aren't searched until the next one, so the parents
+        of the parents are not followed like in addParentsToRepository.
+
+        Args:
+            - graph (nx.MultiDiGraph): The graph to be modified.
+            - relations (tuple): The keys of RELATIONS to search.
+            - batchSize (int): The number of nodes searched between insertions.
+            - inplace (bool): Whether to modify the given graph instead of a copy.
+
+        Returns:
+            - nx.MultiDiGraph: The graph with the relations.
+        """
+        unknown = [relation for relation in relations if relation not in RELATIONS]
+        if unknown:
+            raise ValueError(f"Unknown relations: {unknown}")
+
+        if not inplace:
+            graph = copy.deepcopy(graph)
+
+        # The nodes that need at least one of the relations, in the order of the relations
+        nodes = dict.fromkeys(
+            node
+            for relation in relations
+            for node in self._pendingNodes(graph, *RELATIONS[relation][:2])
+        )
+
+        batch = GraphBatch(graph, self.checkpoint)
+
+        for i, node in enumerate(tqdm.tqdm(nodes, desc="Expanding the graph")):
+            self._expandNode(batch, node, relations)
+
+            if (i + 1) % batchSize == 0:
+                batch.flush()
+
+        batch.flush()
+
+        return graph
+
+    def _expandNode(self, batch: GraphBatch, node: str, relations: tuple) -> GraphBatch:
+        """
+        Search the relations of a node that aren't marked yet.
+
+        If a relation fails in the middle of its pages what it added
+        to the batch is removed, so only the relations that finished
+        are flushed and the failed one starts again the next time.
+
+        Args:
+            - batch (GraphBatch): The batch where the results are added.
+            - node (str): The node to search.
+            - relations (tuple): The keys of RELATIONS to search.
+
+        Returns:
+            - GraphBatch: The same batch.
+        """
+        nodeTypes = batch.graph.nodes[node]["type"]
+        counts = None
+
+        for relation in relations:
+            nodeType, searchKey, collect = RELATIONS[relation]
+
+            if nodeType not in nodeTypes or batch.isSearched(node, searchKey):
+                continue
+
+            savepoint = batch.savepoint()
+
+            try:
+                if (
+                    counts is None
+                    and self.parallelPages
+                    and relation in PROFILE_RELATIONS
+                ):
+                    counts = github.getProfileCounts(node, self.session)
+
+                getattr(self, collect)(
+                    batch, node, *self._fetch(relation, node, counts)
+                )
+            except requests.RequestException as e:
+                batch.rollback(savepoint)
+                self._reportError(node, e)
+
+        return batch
+
+    def crawl(
+        self,
+        graph: nx.MultiDiGraph,
+        seeds: list = None,
+        relations: tuple = tuple(RELATIONS),
+        maxDepth: int = 2,
+        maxRequests: int = None,
+        maxSeconds: float = None,
+        priority: Callable = nearKnownPriority,
+        inplace: bool = False,
+    ) -> nx.MultiDiGraph:
+        """
+        Grow the graph from some nodes following a frontier.
+
+        Instead of searching every node of the graph in each pass,
+        the nodes are visited from a priority queue that starts with
+        the seeds. Visiting a node searches the relations of its type
+        that aren't marked yet, and its neighbors that haven't
+        been seen in the crawl are added to the queue. So each node
+        is scored and queued once and the graph is never scanned.
+
+        The crawl stops when the queue is empty or when the budget
+        of requests or time is spent. The budget is checked before
+        each node, so the last one can go a little over it. The nodes
+        that were already searched don't use the budget, but their
+        neighbors are still queued.
+
+        Each node is added to the graph when it has been visited.
+        A relation that fails in the middle of its pages adds nothing
+        and stays unmarked, so it is searched again in the next crawl.
+
+        Args:
+            - graph (nx.MultiDiGraph): The graph to be modified.
+            - seeds (list): The nodes to start from, they must be in the graph.
+                If it is None the nodes with the type "Known" are used.
+            - relations (tuple): The keys of RELATIONS to search.
+            - maxDepth (int): The distance from the seeds of the last nodes
+                that are visited. Their neighbors are added but not searched.
+            - maxRequests (int): The requests to the network that the crawl
+                can do, counted in metrics.REGISTRY. None for no limit.
+            - maxSeconds (float): The seconds that the crawl can last. None for no limit.
+            - priority (Callable): Receives the graph, a node and its depth
+                and returns the priority of the node, the lowest goes first.
+            - inplace (bool): Whether to modify the given graph instead of a copy.
+
+        Returns:
+            - nx.MultiDiGraph: The graph with the crawled nodes.
+        """
+        if not inplace:
+            graph = copy.deepcopy(graph)
+
+        if seeds is None:
+            seeds = graphIndex.nodesOfType(graph, "Known")
+
+        startRequests = metrics.REGISTRY.count("requests")
+        startTime = time.monotonic()
+
+        # Each entry has a counter so the nodes with the same priority keep their order
+        frontier = []
+        seen = set()
+
+        for node in seeds:
+            if node not in seen:
+                seen.add(node)
+                heapq.heappush(frontier, (priority(graph, node, 0), len(seen), 0, node))
+
+        with tqdm.tqdm(desc="Crawling GitHub", unit="node") as progress:
+            while frontier:
+                if (
+                    maxRequests is not None
+                    and metrics.REGISTRY.count("requests") - startRequests
+                    >= maxRequests
+                ):
+                    break
+
+                if (
+                    maxSeconds is not None
+                    and time.monotonic() - startTime >= maxSeconds
+                ):
+                    break
+
+                _, _, depth, node = heapq.heappop(frontier)
+
+                self._expandNode(
+                    GraphBatch(graph, self.checkpoint), node, relations
+                ).flush()
+
+                progress.update(1)
+
+                if depth >= maxDepth:
+                    continue
+
+                neighbors = list(graph.successors(node)) + list(
+                    graph.predecessors(node)
+                )
+
+                for neighbor in neighbors:
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        heapq.heappush(
+                            frontier,
+                            (
+                                priority(graph, neighbor, depth + 1),
+                                len(seen),
+                                depth + 1,
+                                neighbor,
+                            ),
+                        )
+
+                progress.set_postfix(frontier=len(frontier))
+
+        return graph
+
+    def _staleNodes(
+        self, graph: nx.MultiDiGraph, nodeType: str, searchKey: str, maxAge: float
+    ) -> list:
+        """
+        Get the searched nodes of a type whose lists were walked
+        more than "maxAge" seconds ago.
+
+        The nodes that haven't been searched are left for the "add" methods.
+
+        Args:
+            - graph (nx.MultiDiGraph): The graph to check.
+            - nodeType (str): The type the nodes must have.
+            - searchKey (str): The key of the flag of the lists.
+            - maxAge (float): The seconds after which a list must be refreshed.
+
+        Returns:
+            - list: The nodes that need to be refreshed.
+        """
+        limit = time.time() - maxAge
+
+        stale = []
+
+        for node in graphIndex.nodesOfType(graph, nodeType):
+            attributes = graph.nodes[node]
+
+            if (
+                searchFlags.isSearched(attributes, searchKey)
+                and searchFlags.getInfo(attributes, f"{searchKey}Refreshed", 0) <= limit
             ):
-                stargazers = github.getStargazers(node)
+                stale.append(node)
 
-                for s in stargazers:
-                    if s not in graph.nodes():
-                        graph.add_node(s, type=("GitHub", "User"), color=github.COLOR)
+        return stale
 
-                    if self.edgeLabels:
-                        graph.add_edge(s, node, label="starred")
-                    else:
-                        graph.add_edge(s, node)
+    def _takeNewEntries(
+        self, entries: Iterable, isKnown, newest: str, stopAfterKnown: int
+    ) -> list:
+        """
+        Go through a list that is ordered newest first until the known part.
 
-                if attributes.get("searchData", False):
-                    graph.nodes[node]["searchData"]["githubStargazers"] = True
-                else:
-                    graph.nodes[node]["searchData"] = {"githubStargazers": True}
+        It stops at the newest entry of the last walk or after
+        "stopAfterKnown" known entries in a row, so the rest of
+        the pages aren't downloaded.
 
+        Args:
+            - entries (Iterable): The entries, usually a generator of pages.
+            - isKnown (Callable): Receives an entry and tells if it is already in the graph.
+            - newest (str): The first entry of the last walk or None.
+            - stopAfterKnown (int): The number of known entries in a row that ends the walk.
+
+        Returns:
+            - list: The entries that aren't in the graph yet.
+        """
+        newEntries = []
+        knownInARow = 0
+
+        for entry in entries:
+            if entry == newest:
+                break
+
+            if isKnown(entry):
+                knownInARow += 1
+                if knownInARow >= stopAfterKnown:
+                    break
             else:
-                # We have already added the stargazers or it was a user
-                pass
+                knownInARow = 0
+                newEntries.append(entry)
+
+        return newEntries
+
+    def refreshUserConnections(
+        self,
+        graph: nx.MultiDiGraph,
+        maxAge: float = 86400,
+        stopAfterKnown: int = 10,
+        inplace: bool = False,
+    ) -> nx.MultiDiGraph:
+        """
+        Add the new followers and following of the users whose lists
+        were walked more than "maxAge" seconds ago.
+
+        Only the first pages are downloaded, until the entries that
+        were already known are reached. The people that stopped
+        following someone aren't removed.
+
+        Args:
+            - graph (nx.MultiDiGraph): The graph to be modified.
+            - maxAge (float): The seconds after which a user is refreshed.
+            - stopAfterKnown (int): The number of known entries in a row
+                that ends the walk of a list.
+            - inplace (bool): Whether to modify the given graph instead of a copy.
+
+        Returns:
+            - nx.MultiDiGraph: The graph with the new followers.
+        """
+        if not inplace:
+            graph = copy.deepcopy(graph)
+
+        for node in tqdm.tqdm(
+            self._staleNodes(graph, "User", "githubFollow", maxAge),
+            desc="Refreshing following and followers",
+        ):
+            attributes = graph.nodes[node]
+
+            try:
+                followers = self._takeNewEntries(
+                    github.iterFollowers(node, self.session),
+                    lambda f: graph.has_edge(f, node),
+                    searchFlags.getInfo(attributes, "githubFollowersNewest"),
+                    stopAfterKnown,
+                )
+                following = self._takeNewEntries(
+                    github.iterFollowing(node, self.session),
+                    lambda f: graph.has_edge(node, f),
+                    searchFlags.getInfo(attributes, "githubFollowingNewest"),
+                    stopAfterKnown,
+                )
+            except requests.RequestException as e:
+                self._reportError(node, e)
+                continue
+
+            self._applyUserConnections(graph, node, followers, following)
+
+        return graph
+
+    def refreshStargazers(
+        self,
+        graph: nx.MultiDiGraph,
+        maxAge: float = 86400,
+        stopAfterKnown: int = 10,
+        inplace: bool = False,
+    ) -> nx.MultiDiGraph:
+        """
+        Add the new stargazers of the repositories whose lists
+        were walked more than "maxAge" seconds ago.
+
+        It works like refreshUserConnections.
+
+        Args:
+            - graph (nx.MultiDiGraph): The graph to be modified.
+            - maxAge (float): The seconds after which a repository is refreshed.
+            - stopAfterKnown (int): The number of known entries in a row
+                that ends the walk of a list.
+            - inplace (bool): Whether to modify the given graph instead of a copy.
+
+        Returns:
+            - nx.MultiDiGraph: The graph with the new stargazers.
+        """
+        if not inplace:
+            graph = copy.deepcopy(graph)
+
+        for node in tqdm.tqdm(
+            self._staleNodes(graph, "Repository", "githubStargazers", maxAge),
+            desc="Refreshing stargazers",
+        ):
+            attributes = graph.nodes[node]
+
+            try:
+                stargazers = self._takeNewEntries(
+                    github.iterStargazers(node, self.session),
+                    lambda s: graph.has_edge(s, node),
+                    searchFlags.getInfo(attributes, "githubStargazersNewest"),
+                    stopAfterKnown,
+                )
+            except requests.RequestException as e:
+                self._reportError(node, e)
+                continue
+
+            self._applyStargazers(graph, node, stargazers)
 
         return graph
 
-    def addDependencies(self, graph: nx.MultiDiGraph) -> nx.MultiDiGraph:
+    def addDependencies(
+        self, graph: nx.MultiDiGraph, inplace: bool = False
+    ) -> nx.MultiDiGraph:
         """
         Add the dependencies of the repositories to the graph.
 
         When we have found the dependencies of a repository, we mark it
-        in the attribute "searchData" with the key "githubDependencies"
+        with the search flag "githubDependencies"
 
         Args:
             - graph (nx.MultiDiGraph): The graph to be modified.
+            - inplace (bool): Whether to modify the given graph instead of a copy.
 
         Returns:
             - nx.MultiDiGraph: The graph with the dependencies.
         """
-        graph = copy.deepcopy(graph)
-
-        nodes, attributeList = zip(*graph.nodes(data=True))
+        if not inplace:
+            graph = copy.deepcopy(graph)
 
-        for node, attributes in tqdm.tqdm(
-            zip(nodes, attributeList),
-            total=len(nodes),
+        for node in tqdm.tqdm(
+            self._pendingNodes(graph, "Repository", "githubDependencies"),
             desc="Adding repositories' dependencies",
         ):
-            if "Repository" in attributes["type"] and (
-                not attributes.get("searchData", False)
-                or not attributes["searchData"].get("githubDependencies", False)
-            ):
-                dependencies = github.getDependencies(node)
+            try:
+                dependencies = github.getDependencies(node, self.session)
+            except requests.RequestException as e:
+                self._reportError(node, e)
+                continue
 
-                for d in dependencies:
-                    if d not in graph.nodes():
-                        graph.add_node(d, type=("GitHub", "Repository"), color="blue")
+            batch = GraphBatch(graph, self.checkpoint)
 
-                    if self.edgeLabels:
-                        graph.add_edge(node, d, label="dependsOn")
-                    else:
-                        graph.add_edge(node, d)
+            for d in dependencies:
+                batch.addNode(d, type=("GitHub", "Repository"), color="blue")
 
-                if attributes.get("searchData", False):
-                    graph.nodes[node]["searchData"]["githubDependencies"] = True
+                if self.edgeLabels:
+                    batch.addEdge(node, d, label="dependsOn")
                 else:
-                    graph.nodes[node]["searchData"] = {"githubDependencies": True}
+                    batch.addEdge(node, d)
 
-            else:
-                # We have already added the dependencies or it was a user
-                pass
+            batch.mark(node, githubDependencies=True)
+            batch.flush()
+
+        return graph
+
+    def _fetchConcurrently(
+        self, nodes: list, fetcher, concurrency: int, desc: str
+    ) -> list:
+        """
+        Run an asynchronous fetcher for many nodes at the same time.
+
+        At most "concurrency" nodes are being fetched at any moment.
+
+        Args:
+            - nodes (list): The nodes to fetch.
+            - fetcher (Callable): A coroutine function that receives
+                the node and the aiohttp session.
+            - concurrency (int): The maximum number of nodes fetched at once.
+            - desc (str): The description of the progress bar.
+
+        Returns:
+            - list: The results in the same order as the nodes.
+                The nodes that failed have None.
+        """
+
+        async def runAll() -> list:
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async with githubAsync.createSession(concurrency) as session:
+                with tqdm.tqdm(total=len(nodes), desc=desc) as progress:
+
+                    async def runOne(node: str):
+                        async with semaphore:
+                            try:
+                                result = await fetcher(node, session)
+                            except (
+                                requests.RequestException,
+                                aiohttp.ClientError,
+                                asyncio.TimeoutError,
+                            ) as e:
+                                self._reportError(node, e)
+                                result = None
+                        progress.update(1)
+                        return result
+
+                    return await asyncio.gather(*(runOne(node) for node in nodes))
+
+        return asyncio.run(runAll())
+
+    def addRepositoriesConcurrently(
+        self, graph: nx.MultiDiGraph, concurrency: int = 10, inplace: bool = False
+    ) -> nx.MultiDiGraph:
+        """
+        Same as addRepositories but fetching many users at the same time.
+
+        Args:
+            - graph (nx.MultiDiGraph): The graph to be modified.
+            - concurrency (int): The maximum number of users fetched at once.
+            - inplace (bool): Whether to modify the given graph instead of a copy.
+
+        Returns:
+            - nx.MultiDiGraph: The graph with the repositories.
+        """
+        if not inplace:
+            graph = copy.deepcopy(graph)
+
+        nodes = self._pendingNodes(graph, "User", "ownedGitHubRepositories")
+        results = self._fetchConcurrently(
+            nodes, githubAsync.getRepositories, concurrency, "Adding owned repositories"
+        )
+
+        for node, repositories in zip(nodes, results):
+            if repositories is not None:
+                self._applyRepositories(graph, node, repositories)
+
+        return graph
+
+    def addContributorsConcurrently(
+        self, graph: nx.MultiDiGraph, concurrency: int = 10, inplace: bool = False
+    ) -> nx.MultiDiGraph:
+        """
+        Same as addContributors but fetching many repositories at the same time.
+
+        Args:
+            - graph (nx.MultiDiGraph): The graph to be modified.
+            - concurrency (int): The maximum number of repositories fetched at once.
+            - inplace (bool): Whether to modify the given graph instead of a copy.
+
+        Returns:
+            - nx.MultiDiGraph: The graph with the contributors.
+        """
+        if not inplace:
+            graph = copy.deepcopy(graph)
+
+        nodes = self._pendingNodes(graph, "Repository", "githubContributors")
+        results = self._fetchConcurrently(
+            nodes,
+            lambda node, session: githubAsync.getContributors(
+                node, session, self.token, self.anonymousContributors
+            ),
+            concurrency,
+            "Adding contributors",
+        )
+
+        for node, contributors in zip(nodes, results):
+            if contributors is not None:
+                self._applyContributors(graph, node, contributors)
+
+        return graph
+
+    def addUserConnectionsConcurrently(
+        self, graph: nx.MultiDiGraph, concurrency: int = 10, inplace: bool = False
+    ) -> nx.MultiDiGraph:
+        """
+        Same as addUserConnections but fetching many users at the same time.
+
+        Args:
+            - graph (nx.MultiDiGraph): The graph to be modified.
+            - concurrency (int): The maximum number of users fetched at once.
+            - inplace (bool): Whether to modify the given graph instead of a copy.
+
+        Returns:
+            - nx.MultiDiGraph: The graph with the followers.
+        """
+        if not inplace:
+            graph = copy.deepcopy(graph)
+
+        async def fetchConnections(node: str, session) -> tuple:
+            return await asyncio.gather(
+                githubAsync.getFollowers(node, session),
+                githubAsync.getFollowing(node, session),
+            )
+
+        nodes = self._pendingNodes(graph, "User", "githubFollow")
+        results = self._fetchConcurrently(
+            nodes, fetchConnections, concurrency, "Adding following and followers"
+        )
+
+        for node, result in zip(nodes, results):
+            if result is not None:
+                self._applyUserConnections(graph, node, *result)
+
+        return graph
+
+    def addStarredRepositoriesConcurrently(
+        self, graph: nx.MultiDiGraph, concurrency: int = 10, inplace: bool = False
+    ) -> nx.MultiDiGraph:
+        """
+        Same as addStarredRepositories but fetching many users at the same time.
+
+        Args:
+            - graph (nx.MultiDiGraph): The graph to be modified.
+            - concurrency (int): The maximum number of users fetched at once.
+            - inplace (bool): Whether to modify the given graph instead of a copy.
+
+        Returns:
+            - nx.MultiDiGraph: The graph with the starred repositories.
+        """
+        if not inplace:
+            graph = copy.deepcopy(graph)
+
+        nodes = self._pendingNodes(graph, "User", "githubStarred")
+        results = self._fetchConcurrently(
+            nodes,
+            githubAsync.getStarredRepositories,
+            concurrency,
+            "Adding starred repositories",
+        )
+
+        for node, starred in zip(nodes, results):
+            if starred is not None:
+                self._applyStarredRepositories(graph, node, starred)
+
+        return graph
+
+    def addStargazersConcurrently(
+        self, graph: nx.MultiDiGraph, concurrency: int = 10, inplace: bool = False
+    ) -> nx.MultiDiGraph:
+        """
+        Same as addStargazers but fetching many repositories at the same time.
+
+        Args:
+            - graph (nx.MultiDiGraph): The graph to be modified.
+            - concurrency (int): The maximum number of repositories fetched at once.
+            - inplace (bool): Whether to modify the given graph instead of a copy.
+
+        Returns:
+            - nx.MultiDiGraph: The graph with the stargazers.
+        """
+        if not inplace:
+            graph = copy.deepcopy(graph)
+
+        nodes = self._pendingNodes(graph, "Repository", "githubStargazers")
+        results = self._fetchConcurrently(
+            nodes, githubAsync.getStargazers, concurrency, "Adding stargazers"
+        )
+
+        for node, stargazers in zip(nodes, results):
+            if stargazers is not None:
+                self._applyStargazers(graph, node, stargazers)
+
+        return graph
+
+    def _fetchInBatches(self, nodes: dict, fetcher, batchSize: int, desc: str) -> list:
+        """
+        Run a GraphQL fetcher for groups of nodes.
+
+        If a group fails its nodes are reported and skipped.
+
+        Args:
+            - nodes (dict): The nodes as key and the connections to get as value.
+            - fetcher (Callable): githubGraphQL.GitHubGraphQL.fetchUsers or fetchRepositories.
+            - batchSize (int): The number of nodes in each query.
+            - desc (str): The description of the progress bar.
+
+        Returns:
+            - list: The (node, connections) of the nodes that didn't fail.
+        """
+        results = []
+        order = list(nodes)
+
+        with tqdm.tqdm(total=len(order), desc=desc) as progress:
+            for start in range(0, len(order), batchSize):
+                batch = {node: nodes[node] for node in order[start : start + batchSize]}
+
+                try:
+                    fetched = fetcher(batch)
+                except requests.RequestException as e:
+                    for node in batch:
+                        self._reportError(node, e)
+                else:
+                    results.extend((node, fetched[node]) for node in batch)
+
+                progress.update(len(batch))
+
+        return results
+
+    def addUsersWithGraphQL(
+        self,
+        graph: nx.MultiDiGraph,
+        relations: tuple = ("connections", "repositories", "starred"),
+        batchSize: int = 20,
+        inplace: bool = False,
+    ) -> nx.MultiDiGraph:
+        """
+        Add the relations of all the users with the GraphQL API.
+
+        A single query gets the lists of "batchSize" users, so
+        it needs many fewer requests than the other methods.
+        Each relation is marked with the same search flag
+        as the method that scrapes it:
+            - "connections": addUserConnections
+            - "repositories": addRepositories
+            - "starred": addStarredRepositories
+
+        Args:
+            - graph (nx.MultiDiGraph): The graph to be modified.
+            - relations (tuple): The relations to add.
+            - batchSize (int): The number of users in each query.
+            - inplace (bool): Whether to modify the given graph instead of a copy.
+
+        Returns:
+            - nx.MultiDiGraph: The graph with the relations.
+        """
+        if not inplace:
+            graph = copy.deepcopy(graph)
+
+        wanted = {}
+        for relation in relations:
+            searchKey, _ = GRAPHQL_USER_RELATIONS[relation]
+            for node in self._pendingNodes(graph, "User", searchKey):
+                wanted.setdefault(node, []).append(relation)
+
+        users = {
+            node: [
+                connection
+                for relation in nodeRelations
+                for connection in GRAPHQL_USER_RELATIONS[relation][1]
+            ]
+            for node, nodeRelations in wanted.items()
+        }
+
+        for node, connections in self._fetchInBatches(
+            users, self.graphql.fetchUsers, batchSize, "Adding users with GraphQL"
+        ):
+            if "connections" in wanted[node]:
+                self._applyUserConnections(
+                    graph,
+                    node,
+                    connections["followers"],
+                    connections["following"],
+                    newestFirst=False,
+                )
+            if "repositories" in wanted[node]:
+                self._applyRepositories(graph, node, connections["repositories"])
+            if "starred" in wanted[node]:
+                self._applyStarredRepositories(graph, node, connections["starred"])
+
+        return graph
+
+    def addStargazersWithGraphQL(
+        self, graph: nx.MultiDiGraph, batchSize: int = 20, inplace: bool = False
+    ) -> nx.MultiDiGraph:
+        """
+        Same as addStargazers but using the GraphQL API
+        to get the stargazers of many repositories at once.
+
+        Args:
+            - graph (nx.MultiDiGraph): The graph to be modified.
+            - batchSize (int): The number of repositories in each query.
+            - inplace (bool): Whether to modify the given graph instead of a copy.
+
+        Returns:
+            - nx.MultiDiGraph: The graph with the stargazers.
+        """
+        if not inplace:
+            graph = copy.deepcopy(graph)
+
+        repositories = {
+            node: ["stargazers"]
+            for node in self._pendingNodes(graph, "Repository", "githubStargazers")
+        }
+
+        for node, connections in self._fetchInBatches(
+            repositories,
+            self.graphql.fetchRepositories,
+            batchSize,
+            "Adding stargazers with GraphQL",
+        ):
+            self._applyStargazers(
+                graph, node, connections["stargazers"], newestFirst=False
+            )
 
         return graph
@@ -0,0 +1,302 @@
+from modules import searchFlags, sqliteGraph
+import networkx as nx
+
+
+class IndexedGraph(nx.MultiDiGraph):
+    """
+    A nx.MultiDiGraph that keeps the nodes of each type.
+
+    The words of the attribute "type" are indexed when a node
+    is added with add_node or add_nodes_from and when it is
+    removed, so the nodes with some types are found without
+    going through the whole graph. The nodes of some types
+    that aren't marked with a search flag are also
+    indexed after they have been asked for once.
+
+    The "type" must be set with add_node, which also updates
+    an existing node, and the search flags with setSearchData.
+    Changing the attribute dicts directly isn't seen by the index.
+    """
+
+    def __init__(self, incoming_graph_data=None, **attr) -> None:
+        """
+        Initialize the IndexedGraph.
+
+        Args:
+            - incoming_graph_data: The data to copy, like another graph.
+            - attr: The attributes of the graph.
+
+        Returns:
+            - None
+        """
+        self.typeIndex = {}
+        self.searchedIndex = {}
+        self.pendingIndex = {}
+        self.indexedNodes = {}
+        super().__init__(incoming_graph_data, **attr)
+
+        # networkx copies the attributes of the incoming nodes without add_nodes_from
+        for node in self._node:
+            self.reindex(node)
+
+    def add_node(self, node_for_adding, **attr) -> None:
+        """
+        Add or update a node like networkx and index it.
+        """
+        super().add_node(node_for_adding, **attr)
+        self.reindex(node_for_adding)
+
+    def add_nodes_from(self, nodes_for_adding, **attr) -> None:
+        """
+        Add or update nodes like networkx and index them.
+        """
+        nodes = list(nodes_for_adding)
+        super().add_nodes_from(nodes, **attr)
+
+        for n in nodes:
+            # The same check that networkx does to tell a node from a (node, dict)
+            try:
+                n in self._node
+            except TypeError:
+                n, _ = n
+            self.reindex(n)
+
+    def add_edge(self, u_for_edge, v_for_edge, key=None, **attr):
+        """
+        Add an edge like networkx and index the nodes it creates.
+        """
+        newNodes = [n for n in (u_for_edge, v_for_edge) if n not in self._node]
+        key = super().add_edge(u_for_edge, v_for_edge, key, **attr)
+
+        for n in newNodes:
+            self.reindex(n)
+
+        return key
+
+    def add_edges_from(self, ebunch_to_add, **attr):
+        """
+        Add edges like networkx and index the nodes they create.
+        """
+        edges = list(ebunch_to_add)
+        newNodes = {n for edge in edges for n in edge[:2] if n not in self._node}
+        keys = super().add_edges_from(edges, **attr)
+
+        for n in newNodes:
+            self.reindex(n)
+
+        return keys
+
+    def remove_node(self, n) -> None:
+        """
+        Remove a node like networkx and from the index.
+        """
+        super().remove_node(n)
+        self.unindex(n)
+
+    def remove_nodes_from(self, nodes) -> None:
+        """
+        Remove nodes like networkx and from the index.
+        """
+        nodes = list(nodes)
+        super().remove_nodes_from(nodes)
+
+        for n in nodes:
+            if n not in self._node:
+                self.unindex(n)
+
+    def clear(self) -> None:
+        """
+        Remove everything like networkx and empty the index.
+        """
+        super().clear()
+        self.typeIndex = {}
+        self.searchedIndex = {}
+        self.pendingIndex = {}
+        self.indexedNodes = {}
+
+    def reindex(self, node: str) -> None:
+        """
+        Update the index with the current attributes of a node.
+
+        A node that stays in a part of the index keeps its place, so
+        the nodes are always in the order in which they were added.
+        A node that leaves a part and comes back goes to the end.
+
+        Args:
+            - node (str): The node.
+
+        Returns:
+            - None
+        """
+        oldTypes, oldSearched = self.indexedNodes.get(node, ((), ()))
+
+        attributes = self._node[node]
+        types = tuple(attributes.get("type", ()))
+        searched = tuple(searchFlags.searchedKeys(attributes))
+        self.indexedNodes[node] = (types, searched)
+
+        for word in oldTypes:
+            if word not in types:
+                self.typeIndex[word].pop(node, None)
+
+        for key in oldSearched:
+            if key not in searched:
+                self.searchedIndex[key].pop(node, None)
+
+        # The dicts are used as sets that keep the order in which the nodes are added
+        for word in types:
+            self.typeIndex.setdefault(word, {}).setdefault(node, None)
+
+        for key in searched:
+            self.searchedIndex.setdefault(key, {}).setdefault(node, None)
+
+        for (words, searchKey), pending in self.pendingIndex.items():
+            if all(word in types for word in words) and searchKey not in searched:
+                pending.setdefault(node, None)
+            else:
+                pending.pop(node, None)
+
+    def unindex(self, node: str) -> None:
+        """
+        Remove a node from the index.
+
+        Args:
+            - node (str): The node.
+
+        Returns:
+            - None
+        """
+        if node not in self.indexedNodes:
+            return
+
+        types, searched = self.indexedNodes.pop(node)
+
+        for word in types:
+            self.typeIndex[word].pop(node, None)
+
+        for key in searched:
+            self.searchedIndex[key].pop(node, None)
+
+        for pending in self.pendingIndex.values():
+            pending.pop(node, None)
+
+    def nodesOfType(self, *words: str) -> list:
+        """
+        Get the nodes that have all the words in their "type".
+
+        Args:
+            - words (str): The words.
+
+        Returns:
+            - list: The nodes in the order they were added.
+        """
+        if not words:
+            return list(self._node)
+
+        sets = sorted((self.typeIndex.get(word, {}) for word in words), key=len)
+        return [node for node in sets[0] if all(node in s for s in sets[1:])]
+
+    def pendingNodes(self, searchKey: str, *words: str) -> list:
+        """
+        Get the nodes of some types that aren't marked with a search flag.
+
+        The first time a pair of types and key is asked for the nodes
+        of the types are checked, and from then on they are kept.
+
+        Args:
+            - searchKey (str): The key of the flag.
+            - words (str): The words that the "type" of the nodes must have.
+
+        Returns:
+            - list: The nodes that still need to be searched.
+        """
+        indexKey = (words, searchKey)
+
+        if indexKey not in self.pendingIndex:
+            searched = self.searchedIndex.get(searchKey, {})
+            self.pendingIndex[indexKey] = {
+                node: None for node in self.nodesOfType(*words) if node not in searched
+            }
+
+        return list(self.pendingIndex[indexKey])
+
+
+def isIndexed(graph: nx.MultiDiGraph) -> bool:
+    """
+    Check if a graph keeps the index of the types.
+
+    Args:
+        - graph (nx.MultiDiGraph): The graph.
+
+    Returns:
+        - bool: True if it is an IndexedGraph or a sqliteGraph.SQLiteGraph.
+    """
+    return isinstance(graph, (IndexedGraph, sqliteGraph.SQLiteGraph))
+
+
+def nodesOfType(graph: nx.MultiDiGraph, *words: str) -> list:
+    """
+    Get the nodes that have all the words in their "type".
+
+    It uses the index of an IndexedGraph and goes
+    through all the nodes of other graphs.
+
+    Args:
+        - graph (nx.MultiDiGraph): The graph.
+        - words (str): The words.
+
+    Returns:
+        - list: The nodes in the order they were added.
+    """
+    if isIndexed(graph):
+        return graph.nodesOfType(*words)
+
+    return [
+        node
+        for node, attributes in graph.nodes(data=True)
+        if all(word in attributes.get("type", ()) for word in words)
+    ]
+
+
+def pendingNodes(graph: nx.MultiDiGraph, searchKey: str, *words: str) -> list:
+    """
+    Get the nodes of some types that aren't marked with a search flag.
+
+    It uses the index of an IndexedGraph and goes
+    through all the nodes of other graphs.
+
+    Args:
+        - graph (nx.MultiDiGraph): The graph.
+        - searchKey (str): The key of the flag.
+        - words (str): The words that the "type" of the nodes must have.
+
+    Returns:
+        - list: The nodes that still need to be searched.
+    """
+    if isIndexed(graph):
+        return graph.pendingNodes(searchKey, *words)
+
+    return [
+        node
+        for node, attributes in graph.nodes(data=True)
+        if all(word in attributes.get("type", ()) for word in words)
+        and not searchFlags.isSearched(attributes, searchKey)
+    ]
+
+
+def setSearchData(graph: nx.MultiDiGraph, node: str, values: dict) -> None:
+    """
+    Set the search flags or other values of a node with searchFlags.update.
+
+    Args:
+        - graph (nx.MultiDiGraph): The graph.
+        - node (str): The node.
+        - values (dict): The keys and their values.
+
+    Returns:
+        - None
+    """
+    searchFlags.update(graph.nodes[node], values)
+
+    if isIndexed(graph):
+        graph.reindex(node)
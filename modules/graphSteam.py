@@ -1,24 +1,58 @@
-from modules import steam, credentials
+from modules import steam, credentials, checkpoint, graphIndex
 import networkx as nx
+import requests
 import copy
 import tqdm
 
 
 class SteamGraphManager:
-    def __init__(self, passwordManager: credentials.PasswordManager) -> None:
+    def __init__(
+        self,
+        passwordManager: credentials.PasswordManager,
+        checkpoint: checkpoint.GraphCheckpoint = None,
+    ) -> None:
         """
         Initialize the SteamGraphManager.
 
         Args:
             - passwordManager (credentials.PasswordManager): The password manager to use.
+            - checkpoint (checkpoint.GraphCheckpoint): Where the changes are
+                logged so a pass that stops can be resumed. None to not log them.
         """
         self.passwordManager = passwordManager
+        self.checkpoint = checkpoint
+
+    def _saveNode(
+        self, graph: nx.MultiDiGraph, node: str, neighbors: list, newNodes: list
+    ) -> None:
+        """
+        Log the changes of a searched node in the checkpoint.
+
+        Args:
+            - graph (nx.MultiDiGraph): The graph that has been modified.
+            - node (str): The node that was searched.
+            - neighbors (list): The nodes it was connected to in both directions.
+            - newNodes (list): The nodes that were added for it.
+
+        Returns:
+            - None
+        """
+        if self.checkpoint is None:
+            return
+
+        edges = []
+        for n in neighbors:
+            edges.extend([(node, n, {}), (n, node, {})])
+
+        self.checkpoint.record(graph, newNodes + [node], edges)
+        self.checkpoint.save()
 
     def addFriends(
         self,
         graph: nx.MultiDiGraph,
         codeWords: list[str] = ["Steam", "User", "Known"],
         newCodeWords: list[str] = ["Steam", "User", "unknownSteam"],
+        inplace: bool = False,
     ) -> nx.MultiDiGraph:
         """
         Add friends of Steam users to the graph.
@@ -26,55 +60,49 @@ class SteamGraphManager:
         Because it is bidirectional, it will add the friends of the user
         and the user as a friend of the friends.
 
-        It uses searchData["friends"] to check if the friends have been already added.
+        It uses the search flag "friends" to check if the friends have been already added.
 
         Args:
             - graph (nx.MultiDiGraph): The graph to add the friends to.
             - codeWords (list[str]): The words that the nodes must have to be considered.
             - newCodeWords (list[str]): The words that the new nodes will have.
+            - inplace (bool): Whether to modify the given graph instead of a copy.
 
         Returns:
             - nx.MultiDiGraph: The graph with the friends added.
-                It is a deep copy of the original graph.
+                It is a deep copy of the original graph unless inplace is True.
         """
-        graph = copy.deepcopy(graph)
-
-        nodes, attributeList = zip(*graph.nodes(data=True))
+        if not inplace:
+            graph = copy.deepcopy(graph)
 
         # Only search for nodes that are registered
-        processedNodes = []
-        processedAttributes = []
-        for node, attributes in zip(nodes, attributeList):
-            if all(word in attributes.get("type", "") for word in codeWords):
-                processedNodes.append(node)
-                processedAttributes.append(attributes)
-
-        for node, attributes in tqdm.tqdm(
-            zip(processedNodes, processedAttributes),
-            total=len(processedNodes),
+        for node in tqdm.tqdm(
+            graphIndex.pendingNodes(graph, "friends", *codeWords),
             desc="Adding friends in Steam",
         ):
-
-            if not attributes.get("searchData", False) or not attributes[
-                "searchData"
-            ].get("friends", False):
-
+            try:
                 friends = steam.getFriends(
                     node, self.passwordManager.getValue("SteamAPIKey")
                 )
+            except requests.RequestException as e:
+                # It is searched again in the next pass
+                tqdm.tqdm.write(f"Could not get the friends of {node}: {e}")
+                continue
+
+            newNodes = []
 
-                for friend in friends:
-                    if friend not in graph.nodes():
-                        graph.add_node(friend, type=newCodeWords, color=steam.COLOR)
+            for friend in friends:
+                if friend not in graph.nodes():
+                    graph.add_node(friend, type=newCodeWords, color=steam.COLOR)
+                    newNodes.append(friend)
 
-                    graph.add_edge(node, friend)
-                    graph.add_edge(friend, node)
+                graph.add_edge(node, friend)
+                graph.add_edge(friend, node)
 
-                    # We also need to add that we know their friends
-                    if not graph.nodes[node].get("searchData", False):
-                        graph.nodes[node]["searchData"] = {"friends": True}
-                    else:
-                        graph.nodes[node]["searchData"]["friends"] = True
+                # We also need to add that we know their friends
+                graphIndex.setSearchData(graph, node, {"friends": True})
+
+            self._saveNode(graph, node, friends, newNodes)
 
         return graph
 
@@ -83,59 +111,54 @@ class SteamGraphManager:
         graph: nx.MultiDiGraph,
         codeWords: list[str] = ["Steam", "User", "Known"],
         newCodeWords: list[str] = ["Steam", "Game"],
+        inplace: bool = False,
     ) -> nx.MultiDiGraph:
         """
         Add games of Steam users to the graph.
 
-        It uses searchData["games"] to check if the games have been already added.
+        It uses the search flag "games" to check if the games have been already added.
 
         Args:
             - graph (nx.MultiDiGraph): The graph to add the games to.
             - codeWords (list[str]): The words that the nodes must have to be considered.
             - newCodeWords (list[str]): The words that the new nodes will have.
+            - inplace (bool): Whether to modify the given graph instead of a copy.
 
         Returns:
             - nx.MultiDiGraph: The graph with the games added.
-                It is a deep copy of the original graph.
+                It is a deep copy of the original graph unless inplace is True.
         """
-        graph = copy.deepcopy(graph)
-
-        nodes, attributeList = zip(*graph.nodes(data=True))
+        if not inplace:
+            graph = copy.deepcopy(graph)
 
         # Only search for nodes that have the codeWords
-        processedNodes = []
-        processedAttributes = []
-        for node, attributes in zip(nodes, attributeList):
-            if all(word in attributes.get("type", "") for word in codeWords):
-                processedNodes.append(node)
-                processedAttributes.append(attributes)
-
-        for node, attributes in tqdm.tqdm(
-            zip(processedNodes, processedAttributes),
-            total=len(processedNodes),
+        for node in tqdm.tqdm(
+            graphIndex.pendingNodes(graph, "games", *codeWords),
             desc="Adding games in Steam",
         ):
-
-            if not attributes.get("searchData", False) or not attributes[
-                "searchData"
-            ].get("games", False):
-
+            try:
                 games = steam.getGames(
                     node, self.passwordManager.getValue("SteamAPIKey")
                 )
+            except requests.RequestException as e:
+                # It is searched again in the next pass
+                tqdm.tqdm.write(f"Could not get the games of {node}: {e}")
+                continue
+
+            newNodes = []
 
-                for game in games:
-                    if game not in graph.nodes():
-                        graph.add_node(game, type=newCodeWords, color=steam.COLOR_GAMES)
+            for game in games:
+                if game not in graph.nodes():
+                    graph.add_node(game, type=newCodeWords, color=steam.COLOR_GAMES)
+                    newNodes.append(game)
 
-                    graph.add_edge(node, game)
-                    graph.add_edge(game, node)
+                graph.add_edge(node, game)
+                graph.add_edge(game, node)
 
-                    # We also need to add that we know their games
-                    if not graph.nodes[node].get("searchData", False):
-                        graph.nodes[node]["searchData"] = {"games": True}
-                    else:
-                        graph.nodes[node]["searchData"]["games"] = True
+                # We also need to add that we know their games
+                graphIndex.setSearchData(graph, node, {"games": True})
+
+            self._saveNode(graph, node, games, newNodes)
 
         return graph
 
@@ -155,14 +178,8 @@ class SteamGraphManager:
                 The lists are sorted alphabetically and the dictionary is sorted
                 by the number of users in descending order.
         """
-        nodes, attributeList = zip(*graph.nodes(data=True))
-
         # Dictionary of games
-        videogames = {
-            node: 0
-            for node, attributes in zip(nodes, attributeList)
-            if "Game" in attributes.get("type", [])
-        }
+        videogames = {node: 0 for node in graphIndex.nodesOfType(graph, "Game")}
 
         # Number of users that play each game
         for v in videogames:
@@ -0,0 +1,290 @@
+from urllib.parse import urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
+from requests.structures import CaseInsensitiveDict
+import threading
+import requests
+import hashlib
+import sqlite3
+import json
+import time
+
+# The query parameters that are removed before a URL is stored
+SECRET_PARAMETERS = ("key", "access_token", "token", "client_secret", "api_key")
+
+
+def removeSecrets(url: str) -> str:
+    """
+    Remove the secret query parameters of a URL.
+
+    The URLs are stored in the database, so the API keys
+    can't be in them.
+
+    Args:
+        - url (str): The URL.
+
+    Returns:
+        - str: The URL without the parameters in SECRET_PARAMETERS.
+    """
+    parts = urlsplit(url)
+    query = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in SECRET_PARAMETERS
+    ]
+
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        path: str = "httpCache.sqlite",
+        ttls: dict = None,
+        defaultTTL: float = 24 * 60 * 60,
+    ) -> None:
+        """
+        Initialize the ResponseCache.
+
+        The responses are stored in a SQLite database so they
+        survive between executions. When a response is older than
+        the TTL of its host it is revalidated with a conditional
+        request instead of being downloaded again.
+
+        Args:
+            - path (str): The path of the SQLite database.
+            - ttls (dict): The time to live in seconds for each host.
+                For example {"api.github.com": 3600}.
+            - defaultTTL (float): The time to live for the hosts not in ttls.
+
+        Returns:
+            - None
+        """
+        self.path = path
+        self.ttls = ttls or {}
+        self.defaultTTL = defaultTTL
+
+        self.hits = 0
+        self.misses = 0
+
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                encoding TEXT,
+                body BLOB NOT NULL,
+                etag TEXT,
+                lastModified TEXT,
+                storedAt REAL NOT NULL
+            )
+            """)
+        self.connection.commit()
+
+    @staticmethod
+    def getKey(url: str, params: dict = None) -> str:
+        """
+        Get the key of a request.
+
+        The parameters are encoded in the URL the same way
+        requests does it, so the same request always has the same key.
+        The secret parameters are removed first.
+
+        Args:
+            - url (str): The URL of the request.
+            - params (dict): The query parameters of the request.
+
+        Returns:
+            - str: The key.
+        """
+        fullURL = requests.Request("GET", url, params=params).prepare().url
+        return hashlib.sha256(removeSecrets(fullURL).encode()).hexdigest()
+
+    def countResult(self, hit: bool) -> None:
+        """
+        Count a request answered with the cache or downloaded.
+
+        The requests can be done from several threads,
+        so the counters are changed with the lock.
+
+        Args:
+            - hit (bool): True if the stored response was used.
+
+        Returns:
+            - None
+        """
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def getTTL(self, url: str) -> float:
+        """
+        Get the time to live of the responses of a URL.
+
+        Args:
+            - url (str): The URL to check.
+
+        Returns:
+            - float: The time to live in seconds.
+        """
+        return self.ttls.get(urlparse(url).hostname, self.defaultTTL)
+
+    def lookup(self, key: str) -> dict:
+        """
+        Get a stored response.
+
+        Args:
+            - key (str): The key of the request.
+
+        Returns:
+            - dict: The stored response or None if there isn't one.
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT url, status, headers, encoding, body, etag, lastModified, storedAt "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        url, status, headers, encoding, body, etag, lastModified, storedAt = row
+        return {
+            "url": url,
+            "status": status,
+            "headers": json.loads(headers),
+            "encoding": encoding,
+            "body": body,
+            "etag": etag,
+            "lastModified": lastModified,
+            "storedAt": storedAt,
+        }
+
+    def isFresh(self, entry: dict) -> bool:
+        """
+        Check if a stored response can be used without revalidating it.
+
+        Args:
+            - entry (dict): The stored response.
+
+        Returns:
+            - bool: True if it is younger than the TTL of its host.
+        """
+        return time.time() - entry["storedAt"] < self.getTTL(entry["url"])
+
+    def store(self, key: str, response: requests.Response) -> None:
+        """
+        Store a response.
+
+        Args:
+            - key (str): The key of the request.
+            - response (requests.Response): The response to store.
+
+        Returns:
+            - None
+        """
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    removeSecrets(response.url),
+                    response.status_code,
+                    json.dumps(dict(response.headers)),
+                    response.encoding,
+                    response.content,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    time.time(),
+                ),
+            )
+            self.connection.commit()
+
+    def refresh(self, key: str) -> None:
+        """
+        Mark a stored response as fresh again.
+
+        It is used when the server answers 304 Not Modified.
+
+        Args:
+            - key (str): The key of the request.
+
+        Returns:
+            - None
+        """
+        with self.lock:
+            self.connection.execute(
+                "UPDATE responses SET storedAt = ? WHERE key = ?", (time.time(), key)
+            )
+            self.connection.commit()
+
+    def getConditionalHeaders(self, entry: dict) -> dict:
+        """
+        Get the headers to revalidate a stored response.
+
+        Args:
+            - entry (dict): The stored response.
+
+        Returns:
+            - dict: The If-None-Match and If-Modified-Since headers.
+        """
+        headers = {}
+
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+
+        if entry["lastModified"]:
+            headers["If-Modified-Since"] = entry["lastModified"]
+
+        return headers
+
+    @staticmethod
+    def buildResponse(entry: dict) -> requests.Response:
+        """
+        Rebuild a requests.Response from a stored response.
+
+        Args:
+            - entry (dict): The stored response.
+
+        Returns:
+            - requests.Response: The response.
+        """
+        response = requests.Response()
+        response.url = entry["url"]
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = entry["encoding"]
+        response._content = entry["body"]
+
+        return response
+
+    def clear(self) -> None:
+        """
+        Remove all the stored responses.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        with self.lock:
+            self.connection.execute("DELETE FROM responses")
+            self.connection.commit()
+
+    def close(self) -> None:
+        """
+        Close the database.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        with self.lock:
+            self.connection.close()
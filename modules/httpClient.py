@@ -0,0 +1,294 @@
+from requests.adapters import HTTPAdapter
+from modules import httpCache, metrics, rateLimiter, retrying
+import requests
+import time
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) Modules/0.1"
+
+DEFAULT_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+# The seconds to wait for the connection and for the server to answer
+DEFAULT_TIMEOUT = (10, 60)
+
+
+def createSession(
+    poolConnections: int = 10,
+    poolMaxsize: int = 20,
+    headers: dict = None,
+) -> requests.Session:
+    """
+    Create a requests.Session that keeps the connections alive.
+
+    Reusing the session avoids doing a new TCP and TLS
+    handshake for every page we download.
+
+    Args:
+        - poolConnections (int): The number of hosts to keep pools for.
+        - poolMaxsize (int): The maximum number of connections per host.
+        - headers (dict): Headers that replace the default ones.
+
+    Returns:
+        - requests.Session: The configured session.
+    """
+    session = requests.Session()
+
+    adapter = HTTPAdapter(pool_connections=poolConnections, pool_maxsize=poolMaxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    session.headers.update(DEFAULT_HEADERS)
+    if headers:
+        session.headers.update(headers)
+
+    return session
+
+
+SESSION = createSession()
+
+CACHE = None
+
+
+def enableCache(
+    path: str = "httpCache.sqlite", ttls: dict = None, defaultTTL: float = 86400
+) -> httpCache.ResponseCache:
+    """
+    Start caching the responses of all the requests done with get.
+
+    Args:
+        - path (str): The path of the SQLite database.
+        - ttls (dict): The time to live in seconds for each host.
+        - defaultTTL (float): The time to live for the hosts not in ttls.
+
+    Returns:
+        - httpCache.ResponseCache: The cache that is now in use.
+    """
+    global CACHE
+    CACHE = httpCache.ResponseCache(path, ttls, defaultTTL)
+    return CACHE
+
+
+def disableCache() -> None:
+    """
+    Stop caching the responses.
+
+    Args:
+        - None
+
+    Returns:
+        - None
+    """
+    global CACHE
+    if CACHE is not None:
+        CACHE.close()
+    CACHE = None
+
+
+def send(
+    session: requests.Session,
+    url: str,
+    params: dict = None,
+    headers: dict = None,
+    json: dict = None,
+    timeout: tuple = None,
+) -> requests.Response:
+    """
+    Do a GET request waiting for the rate limiter of the host.
+    If "json" is given it is a POST request with it as the body.
+
+    The connection errors and the status codes of the retry policy
+    are retried with exponential backoff. The failures are reported
+    to the circuit breaker of the host, which pauses all the requests
+    to it when it is degraded.
+
+    Args:
+        - session (requests.Session): The session to use.
+        - url (str): The URL of the request.
+        - params (dict): The query parameters.
+        - headers (dict): Extra headers for this request.
+        - json (dict): The body of a POST request. It must be a
+            request that only reads, so it can be retried.
+        - timeout (tuple): The seconds to wait for the connection and
+            for the answer. DEFAULT_TIMEOUT by default.
+
+    Returns:
+        - requests.Response: The response. If all the retries fail
+            it is the last one received.
+    """
+    breaker = retrying.getBreaker(url)
+
+    if timeout is None:
+        timeout = DEFAULT_TIMEOUT
+
+    for attempt in range(retrying.POLICY.maxRetries + 1):
+        lastAttempt = attempt == retrying.POLICY.maxRetries
+
+        breaker.wait()
+        rateLimiter.LIMITER.acquire(url)
+
+        start = time.perf_counter()
+
+        try:
+            if json is None:
+                response = session.get(
+                    url, params=params, headers=headers, timeout=timeout
+                )
+            else:
+                response = session.post(
+                    url, params=params, headers=headers, json=json, timeout=timeout
+                )
+        except (requests.ConnectionError, requests.Timeout):
+            metrics.REGISTRY.recordRequest(url, None, 0, time.perf_counter() - start)
+            breaker.recordFailure()
+            if lastAttempt:
+                raise
+            time.sleep(retrying.POLICY.getDelay(attempt))
+            continue
+
+        metrics.REGISTRY.recordRequest(
+            url,
+            response.status_code,
+            len(response.content),
+            time.perf_counter() - start,
+        )
+        rateLimiter.LIMITER.update(url, response.status_code, response.headers)
+
+        if not retrying.POLICY.shouldRetry(response.status_code):
+            breaker.recordSuccess()
+            return response
+
+        # Too many requests is handled by the rate limiter, the host is not degraded
+        if response.status_code != 429:
+            breaker.recordFailure()
+
+        if lastAttempt:
+            return response
+
+        time.sleep(retrying.POLICY.getDelay(attempt))
+
+    return response
+
+
+def get(
+    url: str,
+    params: dict = None,
+    headers: dict = None,
+    session: requests.Session = None,
+    cache: httpCache.ResponseCache = None,
+) -> requests.Response:
+    """
+    Do a GET request going through the response cache.
+
+    The requests that reach the network wait for the
+    shared rate limiter of their host. Every call is
+    registered in metrics.REGISTRY.
+
+    The response gets the attribute "cacheResult" with one of:
+        - "hit": It was served from the cache without a request.
+        - "revalidated": The server answered 304 so the stored one is used.
+        - "miss": It was downloaded.
+        - None: There is no cache.
+
+    Args:
+        - url (str): The URL of the request.
+        - params (dict): The query parameters.
+        - headers (dict): Extra headers for this request.
+        - session (requests.Session): The session to use, the shared one by default.
+        - cache (httpCache.ResponseCache): The cache to use, the enabled one by default.
+
+    Returns:
+        - requests.Response: The response.
+    """
+    response = getFromCache(url, params, headers, session, cache)
+    metrics.REGISTRY.recordCall(url, response.cacheResult)
+    return response
+
+
+def post(
+    url: str, json: dict, headers: dict = None, session: requests.Session = None
+) -> requests.Response:
+    """
+    Do a POST request that only reads data, like a GraphQL query.
+
+    It isn't cached but it waits for the rate limiter and
+    it is retried like the GET requests.
+
+    Args:
+        - url (str): The URL of the request.
+        - json (dict): The body of the request.
+        - headers (dict): Extra headers for this request.
+        - session (requests.Session): The session to use, the shared one by default.
+
+    Returns:
+        - requests.Response: The response.
+    """
+    if session is None:
+        session = SESSION
+
+    response = send(session, url, headers=headers, json=json)
+    metrics.REGISTRY.recordCall(url)
+    return response
+
+
+def getFromCache(
+    url: str,
+    params: dict = None,
+    headers: dict = None,
+    session: requests.Session = None,
+    cache: httpCache.ResponseCache = None,
+) -> requests.Response:
+    """
+    Do the GET request of get without registering the call.
+
+    Args:
+        - url (str): The URL of the request.
+        - params (dict): The query parameters.
+        - headers (dict): Extra headers for this request.
+        - session (requests.Session): The session to use, the shared one by default.
+        - cache (httpCache.ResponseCache): The cache to use, the enabled one by default.
+
+    Returns:
+        - requests.Response: The response with the attribute "cacheResult".
+    """
+    if session is None:
+        session = SESSION
+
+    if cache is None:
+        cache = CACHE
+
+    if cache is None:
+        response = send(session, url, params, headers)
+        response.cacheResult = None
+        return response
+
+    key = cache.getKey(url, params)
+    entry = cache.lookup(key)
+    headers = dict(headers or {})
+
+    if entry is not None:
+        if cache.isFresh(entry):
+            cache.countResult(True)
+            response = cache.buildResponse(entry)
+            response.cacheResult = "hit"
+            return response
+
+        headers.update(cache.getConditionalHeaders(entry))
+
+    response = send(session, url, params, headers)
+
+    if response.status_code == 304 and entry is not None:
+        cache.refresh(key)
+        cache.countResult(True)
+        response = cache.buildResponse(entry)
+        response.cacheResult = "revalidated"
+        return response
+
+    cache.countResult(False)
+    if response.status_code == 200:
+        cache.store(key, response)
+
+    response.cacheResult = "miss"
+    return response
@@ -0,0 +1,362 @@
+from urllib.parse import urlparse, parse_qs
+import threading
+import types
+import copy
+import json
+import re
+
+# Upper bounds in seconds of the buckets of the latency histograms
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+# The counters that the scrapers give as views of the registry
+COUNTER_NAMES = ("NORMALCALLS", "APICALLS", "CACHEHITS", "CACHEMISSES")
+
+# Parts of the paths that change for each user or repository
+ENDPOINT_PATTERNS = {
+    "github.com": [
+        (re.compile(r"^/[^/]+/[^/]+"), "/:owner/:repo"),
+        (re.compile(r"^/[^/]+/?$"), "/:user"),
+    ],
+    "api.github.com": [
+        (re.compile(r"^/repos/[^/]+/[^/]+"), "/repos/:owner/:repo"),
+        (re.compile(r"^/users/[^/]+"), "/users/:user"),
+    ],
+    "steamcommunity.com": [
+        (re.compile(r"^/(profiles|id)/[^/]+"), r"/\1/:user"),
+    ],
+}
+
+
+def getEndpoint(url: str) -> str:
+    """
+    Get the endpoint of a URL.
+
+    The parts of the path that identify a user or a
+    repository are replaced so all the requests of the
+    same kind have the same endpoint. The GitHub tabs
+    are kept because each one is a different page.
+
+    Args:
+        - url (str): The URL of the request.
+
+    Returns:
+        - str: The endpoint.
+    """
+    parsedUrl = urlparse(url)
+    endpoint = parsedUrl.path or "/"
+
+    for pattern, replacement in ENDPOINT_PATTERNS.get(parsedUrl.hostname, []):
+        endpoint, replaced = pattern.subn(replacement, endpoint, count=1)
+        if replaced:
+            break
+
+    tab = parse_qs(parsedUrl.query).get("tab")
+    if tab:
+        endpoint += f"?tab={tab[0]}"
+
+    return endpoint
+
+
+def emptyStats() -> dict:
+    """
+    Get the statistics of an endpoint without requests.
+
+    Args:
+        - None
+
+    Returns:
+        - dict: The statistics.
+    """
+    return {
+        "calls": 0,
+        "requests": 0,
+        "bytes": 0,
+        "statuses": {},
+        "latencyBuckets": [0] * len(LATENCY_BUCKETS),
+        "latencySum": 0.0,
+        "cacheHits": 0,
+        "cacheMisses": 0,
+    }
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        """
+        Initialize the MetricsRegistry.
+
+        It keeps the statistics of the requests for each
+        host and endpoint and the time spent parsing. All the
+        methods can be called from several threads.
+
+        Returns:
+            - None
+        """
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Remove all the statistics.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        with self.lock:
+            self.endpoints = {}
+            self.parsers = {}
+
+    def getStats(self, url: str) -> dict:
+        """
+        Get the statistics of the endpoint of a URL.
+
+        It must be called with the lock held.
+
+        Args:
+            - url (str): The URL of the request.
+
+        Returns:
+            - dict: The statistics, they can be modified.
+        """
+        host = urlparse(url).hostname
+        return self.endpoints.setdefault(host, {}).setdefault(
+            getEndpoint(url), emptyStats()
+        )
+
+    def recordCall(self, url: str, cacheResult: str = None) -> None:
+        """
+        Register a call of a scraper, whether it used the network or not.
+
+        Args:
+            - url (str): The URL of the request.
+            - cacheResult (str): "hit", "revalidated", "miss" or None.
+
+        Returns:
+            - None
+        """
+        with self.lock:
+            stats = self.getStats(url)
+            stats["calls"] += 1
+
+            if cacheResult in ("hit", "revalidated"):
+                stats["cacheHits"] += 1
+            elif cacheResult == "miss":
+                stats["cacheMisses"] += 1
+
+    def recordRequest(self, url: str, status: int, size: int, seconds: float) -> None:
+        """
+        Register a request that went to the network.
+
+        Args:
+            - url (str): The URL of the request.
+            - status (int): The status code or None if it failed.
+            - size (int): The bytes of the body.
+            - seconds (float): The time until the response.
+
+        Returns:
+            - None
+        """
+        with self.lock:
+            stats = self.getStats(url)
+            stats["requests"] += 1
+            stats["bytes"] += size
+            stats["latencySum"] += seconds
+
+            status = str(status) if status is not None else "error"
+            stats["statuses"][status] = stats["statuses"].get(status, 0) + 1
+
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    stats["latencyBuckets"][i] += 1
+                    break
+
+    def recordParse(self, parser: str, seconds: float) -> None:
+        """
+        Register the time spent parsing a page.
+
+        Args:
+            - parser (str): The name of the extractor.
+            - seconds (float): The time it took.
+
+        Returns:
+            - None
+        """
+        with self.lock:
+            stats = self.parsers.setdefault(parser, {"parses": 0, "seconds": 0.0})
+            stats["parses"] += 1
+            stats["seconds"] += seconds
+
+    def count(self, field: str, hosts: tuple = None) -> int:
+        """
+        Add a statistic over all the endpoints of some hosts.
+
+        Args:
+            - field (str): The statistic, for example "calls" or "cacheHits".
+            - hosts (tuple): The hosts to add. If it is None all of them.
+
+        Returns:
+            - int: The total.
+        """
+        with self.lock:
+            return sum(
+                stats[field]
+                for host, endpoints in self.endpoints.items()
+                if hosts is None or host in hosts
+                for stats in endpoints.values()
+            )
+
+    def snapshot(self) -> dict:
+        """
+        Get a copy of all the statistics.
+
+        Args:
+            - None
+
+        Returns:
+            - dict: With the keys "endpoints" (host -> endpoint -> statistics),
+                "parsers" (name -> statistics) and "latencyBuckets".
+        """
+        with self.lock:
+            return {
+                "endpoints": copy.deepcopy(self.endpoints),
+                "parsers": copy.deepcopy(self.parsers),
+                "latencyBuckets": [str(bound) for bound in LATENCY_BUCKETS],
+            }
+
+    def toJSON(self) -> str:
+        """
+        Export the statistics as JSON.
+
+        Args:
+            - None
+
+        Returns:
+            - str: The JSON document.
+        """
+        return json.dumps(self.snapshot(), indent=2)
+
+    def toPrometheus(self) -> str:
+        """
+        Export the statistics in the text format of Prometheus.
+
+        Args:
+            - None
+
+        Returns:
+            - str: The metrics.
+        """
+        snapshot = self.snapshot()
+        counters = {
+            "calls": "scraper_calls_total",
+            "requests": "scraper_requests_total",
+            "bytes": "scraper_response_bytes_total",
+            "cacheHits": "scraper_cache_hits_total",
+            "cacheMisses": "scraper_cache_misses_total",
+        }
+        lines = []
+
+        for field, name in counters.items():
+            lines.append(f"# TYPE {name} counter")
+            for host, endpoint, stats in iterEndpoints(snapshot):
+                labels = formatLabels(host=host, endpoint=endpoint)
+                lines.append(f"{name}{{{labels}}} {stats[field]}")
+
+        lines.append("# TYPE scraper_responses_total counter")
+        for host, endpoint, stats in iterEndpoints(snapshot):
+            for status, number in sorted(stats["statuses"].items()):
+                labels = formatLabels(host=host, endpoint=endpoint, status=status)
+                lines.append(f"scraper_responses_total{{{labels}}} {number}")
+
+        lines.append("# TYPE scraper_request_latency_seconds histogram")
+        for host, endpoint, stats in iterEndpoints(snapshot):
+            cumulative = 0
+            for bound, number in zip(LATENCY_BUCKETS, stats["latencyBuckets"]):
+                cumulative += number
+                le = "+Inf" if bound == float("inf") else str(bound)
+                labels = formatLabels(host=host, endpoint=endpoint, le=le)
+                lines.append(
+                    f"scraper_request_latency_seconds_bucket{{{labels}}} {cumulative}"
+                )
+            labels = formatLabels(host=host, endpoint=endpoint)
+            lines.append(
+                f"scraper_request_latency_seconds_sum{{{labels}}} {stats['latencySum']}"
+            )
+            lines.append(
+                f"scraper_request_latency_seconds_count{{{labels}}} {stats['requests']}"
+            )
+
+        lines.append("# TYPE scraper_parse_seconds_total counter")
+        for parser, stats in sorted(snapshot["parsers"].items()):
+            labels = formatLabels(parser=parser)
+            lines.append(f"scraper_parse_seconds_total{{{labels}}} {stats['seconds']}")
+
+        lines.append("# TYPE scraper_parses_total counter")
+        for parser, stats in sorted(snapshot["parsers"].items()):
+            labels = formatLabels(parser=parser)
+            lines.append(f"scraper_parses_total{{{labels}}} {stats['parses']}")
+
+        return "\n".join(lines) + "\n"
+
+
+class CounterViews(types.ModuleType):
+    """
+    The class of the scraper modules whose counters are views of REGISTRY.
+
+    Assigning a counter, like the old "github.NORMALCALLS = 0",
+    would hide the view for good, so it raises an error instead.
+    """
+
+    def __setattr__(self, name: str, value) -> None:
+        """
+        Set an attribute of the module unless it is a counter.
+
+        Args:
+            - name (str): The name of the attribute.
+            - value: The value.
+
+        Returns:
+            - None
+        """
+        if name in COUNTER_NAMES:
+            raise AttributeError(
+                f"{self.__name__}.{name} is a view of metrics.REGISTRY, "
+                "use metrics.REGISTRY.reset() to set it to 0"
+            )
+
+        super().__setattr__(name, value)
+
+
+def iterEndpoints(snapshot: dict):
+    """
+    Go through the endpoints of a snapshot in order.
+
+    Args:
+        - snapshot (dict): The snapshot of the registry.
+
+    Returns:
+        - Iterator[tuple]: The host, the endpoint and its statistics.
+    """
+    for host, endpoints in sorted(snapshot["endpoints"].items()):
+        for endpoint, stats in sorted(endpoints.items()):
+            yield host, endpoint, stats
+
+
+def formatLabels(**labels: str) -> str:
+    """
+    Format the labels of a Prometheus metric.
+
+    Args:
+        - labels (str): The labels and their values.
+
+    Returns:
+        - str: The labels separated by commas.
+    """
+    return ",".join(
+        '{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for key, value in labels.items()
+    )
+
+
+REGISTRY = MetricsRegistry()
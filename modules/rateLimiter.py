@@ -0,0 +1,299 @@
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+import threading
+import asyncio
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float) -> None:
+        """
+        Initialize the TokenBucket.
+
+        Each request takes a token and the tokens are refilled
+        at "rate" per second up to "capacity", so short bursts
+        are allowed but the average rate is kept.
+
+        It can be shared by threads and by coroutines because the
+        lock is only held to do the arithmetic, never while waiting.
+
+        Args:
+            - rate (float): The tokens added per second.
+            - capacity (float): The maximum number of tokens.
+
+        Returns:
+            - None
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updatedAt = time.monotonic()
+        self.pausedUntil = 0.0
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token and get how long the caller must wait to use it.
+
+        The tokens can go below zero, which is how the waiting
+        callers are queued one after another.
+
+        Args:
+            - None
+
+        Returns:
+            - float: The seconds to wait before doing the request.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updatedAt) * self.rate
+            )
+            self.updatedAt = now
+            self.tokens -= 1
+
+            wait = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            return max(self.pausedUntil - now, 0.0) + wait
+
+    def acquire(self) -> None:
+        """
+        Wait until a request can be done.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquireAsync(self) -> None:
+        """
+        Wait until a request can be done without blocking the event loop.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def setRate(self, rate: float, capacity: float = None) -> None:
+        """
+        Change the rate of the bucket.
+
+        Args:
+            - rate (float): The tokens added per second.
+            - capacity (float): The new maximum number of tokens.
+                None to keep the current one.
+
+        Returns:
+            - None
+        """
+        with self.lock:
+            self.rate = max(rate, 1e-6)
+
+            if capacity is not None:
+                self.capacity = capacity
+                self.tokens = min(self.tokens, capacity)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stop giving tokens for some time.
+
+        Args:
+            - seconds (float): The seconds to pause.
+
+        Returns:
+            - None
+        """
+        with self.lock:
+            self.pausedUntil = max(self.pausedUntil, time.monotonic() + seconds)
+            self.tokens = min(self.tokens, 0)
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        defaultRate: float = 2.0,
+        defaultCapacity: float = 5.0,
+        limits: dict = None,
+        defaultPause: float = 60.0,
+    ) -> None:
+        """
+        Initialize the RateLimiter.
+
+        It keeps a TokenBucket for each host and adapts it to
+        the rate limit headers of the responses.
+
+        Args:
+            - defaultRate (float): The requests per second for unknown hosts.
+            - defaultCapacity (float): The burst size for unknown hosts.
+            - limits (dict): The (rate, capacity) of each host.
+                For example {"api.github.com": (1.0, 5)}.
+            - defaultPause (float): The seconds to stop after a 429
+                without headers telling how long to wait.
+
+        Returns:
+            - None
+        """
+        self.defaultRate = defaultRate
+        self.defaultCapacity = defaultCapacity
+        self.limits = limits or {}
+        self.defaultPause = defaultPause
+
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def getBucket(self, url: str) -> TokenBucket:
+        """
+        Get the bucket of the host of a URL.
+
+        Args:
+            - url (str): The URL of the request.
+
+        Returns:
+            - TokenBucket: The bucket of the host.
+        """
+        host = urlparse(url).hostname
+
+        with self.lock:
+            if host not in self.buckets:
+                rate, capacity = self.limits.get(
+                    host, (self.defaultRate, self.defaultCapacity)
+                )
+                self.buckets[host] = TokenBucket(rate, capacity)
+
+            return self.buckets[host]
+
+    def setLimit(self, host: str, rate: float, capacity: float = None) -> None:
+        """
+        Change the rate of a host, also if its bucket is already in use.
+
+        The rate limit headers of the responses still change it later.
+
+        Args:
+            - host (str): The host, for example "github.com".
+            - rate (float): The requests per second.
+            - capacity (float): The burst size. None to keep the current one.
+
+        Returns:
+            - None
+        """
+        with self.lock:
+            if capacity is None:
+                capacity = self.limits.get(host, (None, self.defaultCapacity))[1]
+            self.limits[host] = (rate, capacity)
+            bucket = self.buckets.get(host)
+
+        if bucket is not None:
+            bucket.setRate(rate, capacity)
+
+    def acquire(self, url: str) -> None:
+        """
+        Wait until a request to the URL can be done.
+
+        Args:
+            - url (str): The URL of the request.
+
+        Returns:
+            - None
+        """
+        self.getBucket(url).acquire()
+
+    async def acquireAsync(self, url: str) -> None:
+        """
+        Wait until a request to the URL can be done without blocking the event loop.
+
+        Args:
+            - url (str): The URL of the request.
+
+        Returns:
+            - None
+        """
+        await self.getBucket(url).acquireAsync()
+
+    def update(self, url: str, status: int, headers: dict) -> None:
+        """
+        Adapt the bucket of a host to a response.
+
+        It uses:
+            - Retry-After: Pause for the given time.
+            - X-RateLimit-Remaining and X-RateLimit-Reset: Spread the
+                remaining requests until the reset.
+            - 429: Pause even if the server didn't say for how long.
+
+        Args:
+            - url (str): The URL of the request.
+            - status (int): The status code of the response.
+            - headers (dict): The headers of the response.
+
+        Returns:
+            - None
+        """
+        bucket = self.getBucket(url)
+
+        retryAfter = parseRetryAfter(headers.get("Retry-After"))
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+
+        if retryAfter is not None:
+            bucket.pause(retryAfter)
+
+        if remaining is not None and reset is not None:
+            secondsToReset = max(float(reset) - time.time(), 1.0)
+            remaining = int(remaining)
+
+            if remaining <= 0:
+                bucket.pause(secondsToReset)
+            else:
+                bucket.setRate(remaining / secondsToReset)
+
+        elif status == 429 and retryAfter is None:
+            bucket.pause(self.defaultPause)
+
+
+def parseRetryAfter(value: str) -> float:
+    """
+    Get the seconds to wait from a Retry-After header.
+
+    It can be a number of seconds or a date.
+
+    Args:
+        - value (str): The value of the header.
+
+    Returns:
+        - float: The seconds to wait or None if there is no header.
+    """
+    if value is None:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+LIMITER = RateLimiter(
+    limits={
+        # The pages don't send rate limit headers, so this is the ceiling of the
+        # parallel pages and workers. The managers can change it with setLimit
+        "github.com": (2.0, 10),
+        # 60 requests per hour without a token, the headers will correct it
+        "api.github.com": (60 / 3600, 5),
+        "steamcommunity.com": (1.0, 5),
+        "api.steampowered.com": (1.0, 5),
+        # Nominatim asks for at most one request per second
+        "nominatim.openstreetmap.org": (1.0, 1),
+    }
+)
@@ -0,0 +1,171 @@
+from urllib.parse import urlparse
+import threading
+import random
+import time
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        maxRetries: int = 4,
+        backoffFactor: float = 1.0,
+        maxBackoff: float = 60.0,
+        retryStatuses: tuple = (429, 500, 502, 503, 504),
+    ) -> None:
+        """
+        Initialize the RetryPolicy.
+
+        It is only used for GET requests, which are idempotent,
+        so repeating them can't change anything in the server.
+
+        Args:
+            - maxRetries (int): The number of retries after the first attempt.
+            - backoffFactor (float): The seconds to wait before the first retry.
+                It doubles for each retry.
+            - maxBackoff (float): The maximum seconds to wait between retries.
+            - retryStatuses (tuple): The status codes that are retried.
+
+        Returns:
+            - None
+        """
+        self.maxRetries = maxRetries
+        self.backoffFactor = backoffFactor
+        self.maxBackoff = maxBackoff
+        self.retryStatuses = retryStatuses
+
+    def shouldRetry(self, status: int) -> bool:
+        """
+        Check if a response must be retried.
+
+        Args:
+            - status (int): The status code of the response.
+
+        Returns:
+            - bool: True if it must be retried.
+        """
+        return status in self.retryStatuses
+
+    def getDelay(self, attempt: int) -> float:
+        """
+        Get the seconds to wait before a retry.
+
+        It uses exponential backoff with jitter so that many
+        crawlers failing at the same time don't retry together.
+
+        Args:
+            - attempt (int): The number of the attempt that failed, starting at 0.
+
+        Returns:
+            - float: The seconds to wait.
+        """
+        backoff = min(self.maxBackoff, self.backoffFactor * 2**attempt)
+        return backoff / 2 + random.uniform(0, backoff / 2)
+
+
+class CircuitBreaker:
+    def __init__(self, failureThreshold: int = 5, resetTimeout: float = 60.0) -> None:
+        """
+        Initialize the CircuitBreaker.
+
+        After "failureThreshold" failures in a row the circuit opens
+        and every request to the host waits "resetTimeout" seconds.
+        That pauses the crawl while the host is degraded instead
+        of failing one node after another. After the pause a single
+        failure opens it again.
+
+        Args:
+            - failureThreshold (int): The failures in a row that open the circuit.
+            - resetTimeout (float): The seconds that the circuit stays open.
+
+        Returns:
+            - None
+        """
+        self.failureThreshold = failureThreshold
+        self.resetTimeout = resetTimeout
+
+        self.failures = 0
+        self.openUntil = 0.0
+        self.lock = threading.Lock()
+
+    def getWait(self) -> float:
+        """
+        Get how long a request must wait until the circuit closes.
+
+        Args:
+            - None
+
+        Returns:
+            - float: The seconds to wait, 0 if it is closed.
+        """
+        with self.lock:
+            return max(self.openUntil - time.monotonic(), 0.0)
+
+    def wait(self) -> None:
+        """
+        Block until the circuit is closed.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        wait = self.getWait()
+        if wait > 0:
+            time.sleep(wait)
+
+    def recordSuccess(self) -> None:
+        """
+        Register a successful request.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        with self.lock:
+            self.failures = 0
+
+    def recordFailure(self) -> None:
+        """
+        Register a failed request and open the circuit if needed.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        with self.lock:
+            self.failures += 1
+
+            if self.failures >= self.failureThreshold:
+                self.openUntil = time.monotonic() + self.resetTimeout
+                # Once it has been opened a single failure opens it again
+                self.failures = self.failureThreshold - 1
+
+
+POLICY = RetryPolicy()
+
+BREAKERS = {}
+BREAKERS_LOCK = threading.Lock()
+
+
+def getBreaker(url: str) -> CircuitBreaker:
+    """
+    Get the circuit breaker of the host of a URL.
+
+    Args:
+        - url (str): The URL of the request.
+
+    Returns:
+        - CircuitBreaker: The circuit breaker of the host.
+    """
+    host = urlparse(url).hostname
+
+    with BREAKERS_LOCK:
+        if host not in BREAKERS:
+            BREAKERS[host] = CircuitBreaker()
+
+        return BREAKERS[host]
@@ -0,0 +1,179 @@
+import networkx as nx
+import copy
+
+# The bit of each key that marks a node as searched. New keys must go at the end
+FLAGS = {
+    name: 1 << bit
+    for bit, name in enumerate(
+        [
+            "githubFollow",
+            "ownedGitHubRepositories",
+            "githubStarred",
+            "githubOwner",
+            "githubContributors",
+            "githubStargazers",
+            "githubParent",
+            "githubDependencies",
+            "friends",
+            "games",
+        ]
+    )
+}
+
+# The attributes of the nodes
+FLAGS_ATTRIBUTE = "searchFlags"
+INFO_ATTRIBUTE = "searchInfo"
+LEGACY_ATTRIBUTE = "searchData"
+
+
+def isSearched(attributes: dict, key: str) -> bool:
+    """
+    Check if a node is marked with a key.
+
+    The nodes of graphs saved before the flags existed
+    have a "searchData" dict, which is also checked.
+
+    Args:
+        - attributes (dict): The attributes of the node.
+        - key (str): The key, for example "githubFollow".
+
+    Returns:
+        - bool: True if it is marked.
+    """
+    bit = FLAGS.get(key)
+
+    if bit is not None:
+        if attributes.get(FLAGS_ATTRIBUTE, 0) & bit:
+            return True
+    elif (attributes.get(INFO_ATTRIBUTE) or {}).get(key, False):
+        return True
+
+    return bool((attributes.get(LEGACY_ATTRIBUTE) or {}).get(key, False))
+
+
+def getInfo(attributes: dict, key: str, default=None):
+    """
+    Get a value saved with a node that isn't a flag,
+    like the time of the last refresh of a list.
+
+    Args:
+        - attributes (dict): The attributes of the node.
+        - key (str): The key, for example "githubFollowRefreshed".
+        - default: The value if it isn't saved.
+
+    Returns:
+        - The value.
+    """
+    info = attributes.get(INFO_ATTRIBUTE) or {}
+    if key in info:
+        return info[key]
+
+    return (attributes.get(LEGACY_ATTRIBUTE) or {}).get(key, default)
+
+
+def searchedKeys(attributes: dict) -> list:
+    """
+    Get all the keys a node is marked with.
+
+    Args:
+        - attributes (dict): The attributes of the node.
+
+    Returns:
+        - list: The keys.
+    """
+    flags = attributes.get(FLAGS_ATTRIBUTE, 0)
+    keys = [key for key, bit in FLAGS.items() if flags & bit]
+
+    for data in (attributes.get(INFO_ATTRIBUTE), attributes.get(LEGACY_ATTRIBUTE)):
+        for key, value in (data or {}).items():
+            if value is True and key not in keys:
+                keys.append(key)
+
+    return keys
+
+
+def update(attributes: dict, values: dict) -> None:
+    """
+    Save keys in the attributes of a node.
+
+    The booleans of the keys of FLAGS set or clear their bit and
+    the rest of the values are kept in the "searchInfo" dict,
+    which is only created for the nodes that need it. That
+    dict is replaced instead of modified, so a graph from
+    graph.snapshot can share it without seeing the change.
+
+    A "searchData" dict of an old graph is moved to
+    the new attributes the first time the node changes.
+
+    Args:
+        - attributes (dict): The attributes of the node, they are modified.
+        - values (dict): The keys and their values.
+
+    Returns:
+        - None
+    """
+    legacy = attributes.pop(LEGACY_ATTRIBUTE, None) or {}
+    flags = attributes.get(FLAGS_ATTRIBUTE, 0)
+    info = dict(attributes.get(INFO_ATTRIBUTE) or {})
+
+    for key, value in {**legacy, **values}.items():
+        bit = FLAGS.get(key)
+
+        if bit is not None and isinstance(value, bool):
+            flags = flags | bit if value else flags & ~bit
+        else:
+            info[key] = value
+
+    if flags:
+        attributes[FLAGS_ATTRIBUTE] = flags
+    else:
+        attributes.pop(FLAGS_ATTRIBUTE, None)
+
+    if info:
+        attributes[INFO_ATTRIBUTE] = info
+    else:
+        attributes.pop(INFO_ATTRIBUTE, None)
+
+
+def toDict(attributes: dict) -> dict:
+    """
+    Get the flags and the values of a node as a "searchData" dict.
+
+    Args:
+        - attributes (dict): The attributes of the node.
+
+    Returns:
+        - dict: The keys and their values, like in the old graphs.
+    """
+    searchData = dict(attributes.get(LEGACY_ATTRIBUTE) or {})
+    searchData.update(attributes.get(INFO_ATTRIBUTE) or {})
+
+    flags = attributes.get(FLAGS_ATTRIBUTE, 0)
+    searchData.update({key: True for key, bit in FLAGS.items() if flags & bit})
+
+    return searchData
+
+
+def migrate(graph: nx.MultiDiGraph, inplace: bool = False) -> nx.MultiDiGraph:
+    """
+    Move the "searchData" dicts of a graph saved with
+    the old format to the flags and "searchInfo".
+
+    The graphs that aren't migrated still work, because the
+    old dicts are checked and moved when a node changes.
+
+    Args:
+        - graph (nx.MultiDiGraph): The graph to migrate.
+        - inplace (bool): Whether to modify the given graph instead of a copy.
+
+    Returns:
+        - nx.MultiDiGraph: The migrated graph.
+    """
+    if not inplace:
+        graph = copy.deepcopy(graph)
+
+    for _, attributes in graph.nodes(data=True):
+        if LEGACY_ATTRIBUTE in attributes:
+            update(attributes, {})
+
+    return graph
@@ -0,0 +1,857 @@
+from modules import searchFlags
+import networkx as nx
+import sqlite3
+import json
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    id INTEGER PRIMARY KEY,
+    url TEXT UNIQUE NOT NULL,
+    flags INTEGER NOT NULL DEFAULT 0,
+    attributes TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS types (
+    word TEXT NOT NULL,
+    node INTEGER NOT NULL,
+    PRIMARY KEY (word, node)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS typesNode ON types (node);
+CREATE TABLE IF NOT EXISTS edges (
+    id INTEGER PRIMARY KEY,
+    source INTEGER NOT NULL,
+    target INTEGER NOT NULL,
+    attributes TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS edgesSource ON edges (source, target);
+CREATE INDEX IF NOT EXISTS edgesTarget ON edges (target, source);
+"""
+
+# The distinct neighbours of each node without looking at the direction
+UNDIRECTED_PAIRS = (
+    "SELECT source AS node, target AS neighbor FROM edges "
+    "UNION SELECT target, source FROM edges"
+)
+
+
+class NodeAttributes(dict):
+    """
+    The attributes of a node of a SQLiteGraph.
+
+    It is a normal dict, so it can be read and dumped to JSON
+    like the ones of networkx, but every change is written to
+    the database, so searchFlags.update works with it.
+    """
+
+    def __init__(self, graph: "SQLiteGraph", node: str, attributes: dict) -> None:
+        """
+        Initialize the NodeAttributes.
+
+        Args:
+            - graph (SQLiteGraph): The graph of the node.
+            - node (str): The node.
+            - attributes (dict): The attributes read from the database.
+
+        Returns:
+            - None
+        """
+        super().__init__(attributes)
+        self.graph = graph
+        self.node = node
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        self.graph.writeNode(self.node, self, key == "type")
+
+    def __delitem__(self, key) -> None:
+        super().__delitem__(key)
+        self.graph.writeNode(self.node, self, key == "type")
+
+    def pop(self, key, *default):
+        changed = key in self
+        value = super().pop(key, *default)
+        if changed:
+            self.graph.writeNode(self.node, self, key == "type")
+        return value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs) -> None:
+        super().update(*args, **kwargs)
+        self.graph.writeNode(self.node, self, True)
+
+    def popitem(self) -> tuple:
+        item = super().popitem()
+        self.graph.writeNode(self.node, self, True)
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self.graph.writeNode(self.node, self, True)
+
+
+class NodeView:
+    """
+    The nodes of a SQLiteGraph, used like graph.nodes of networkx.
+    """
+
+    def __init__(self, graph: "SQLiteGraph") -> None:
+        self.graph = graph
+
+    def __call__(self, data: bool = False):
+        if not data:
+            return self
+
+        return self.graph.iterNodes()
+
+    def __getitem__(self, node: str) -> NodeAttributes:
+        row = self.graph.connection.execute(
+            "SELECT flags, attributes FROM nodes WHERE url = ?", (node,)
+        ).fetchone()
+
+        if row is None:
+            raise KeyError(node)
+
+        return NodeAttributes(self.graph, node, decodeAttributes(*row))
+
+    def __contains__(self, node: str) -> bool:
+        return self.graph.has_node(node)
+
+    def __iter__(self):
+        return iter(self.graph)
+
+    def __len__(self) -> int:
+        return len(self.graph)
+
+
+class EdgeView:
+    """
+    The edges of a SQLiteGraph, used like graph.edges of networkx.
+    """
+
+    def __init__(self, graph: "SQLiteGraph") -> None:
+        self.graph = graph
+
+    def __call__(self, data: bool = False):
+        return self.graph.iterEdges(data)
+
+    def __contains__(self, edge: tuple) -> bool:
+        return self.graph.has_edge(*edge[:2])
+
+    def __iter__(self):
+        return self.graph.iterEdges(False)
+
+    def __len__(self) -> int:
+        return self.graph.number_of_edges()
+
+
+class SQLiteGraph:
+    def __init__(self, path: str = "graph.sqlite", batchSize: int = 10000) -> None:
+        """
+        Initialize the SQLiteGraph.
+
+        It is a graph stored in a SQLite database instead of in
+        memory, for the crawls that don't fit in it as networkx
+        objects. It has the part of the API of nx.MultiDiGraph
+        that the managers use: add_node, add_nodes_from, add_edge,
+        add_edges_from, has_node, has_edge, nodes[...], nodes(data=True),
+        edges, successors, predecessors, neighbors, the remove methods
+        and copy, so GitHubGraphManager and SteamGraphManager work
+        with it. The words of the types and the search flags have
+        their own indexed columns, so graphIndex uses SQL to find
+        the pending nodes, and the cleaners of graph use SQL too.
+
+        The nodes keep the order in which they were added and the
+        edges are returned in that order too. The attributes are
+        stored as JSON, so the "type" is turned back into a tuple.
+        The changes are committed every "batchSize" changes and with
+        commit or close. A database in a file isn't copied without
+        a path for the copy, so it must be used with inplace=True
+        in the managers, and the cleaners of graph change it in place.
+
+        Args:
+            - path (str): The path of the database, ":memory:" for a temporary one.
+            - batchSize (int): The number of changes in each transaction.
+
+        Returns:
+            - None
+        """
+        self.path = path
+        self.batchSize = batchSize
+        self.pendingChanges = 0
+
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        self.connection.commit()
+
+    @property
+    def nodes(self) -> NodeView:
+        return NodeView(self)
+
+    @property
+    def edges(self) -> EdgeView:
+        return EdgeView(self)
+
+    def __iter__(self):
+        for _, url in self.iterRows(
+            "SELECT id, url FROM nodes WHERE id > ? ORDER BY id LIMIT ?"
+        ):
+            yield url
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+
+    def __contains__(self, node: str) -> bool:
+        return self.has_node(node)
+
+    def __deepcopy__(self, memo: dict) -> "SQLiteGraph":
+        if self.path != ":memory:":
+            raise TypeError(
+                "A SQLiteGraph in a file is only copied with copy(path), "
+                "use inplace=True with the managers"
+            )
+
+        return self.copy()
+
+    def changed(self, number: int = 1) -> None:
+        """
+        Count changes and commit them when there are "batchSize".
+
+        Args:
+            - number (int): The number of changes.
+
+        Returns:
+            - None
+        """
+        self.pendingChanges += number
+
+        if self.pendingChanges >= self.batchSize:
+            self.commit()
+
+    def commit(self) -> None:
+        """
+        Commit the changes.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.connection.commit()
+        self.pendingChanges = 0
+
+    def close(self) -> None:
+        """
+        Commit the changes and close the database.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.commit()
+        self.connection.close()
+
+    def copy(self, path: str = None) -> "SQLiteGraph":
+        """
+        Copy the graph to another database.
+
+        The caller owns the new file and has to remove it
+        when it isn't needed, because the copy of a big graph
+        takes as much disk as the original.
+
+        Args:
+            - path (str): The path of the new database. It can only be
+                None if this one is ":memory:", then the copy is too.
+
+        Returns:
+            - SQLiteGraph: The copy.
+        """
+        if path is None:
+            if self.path != ":memory:":
+                raise ValueError("The path of the copy is needed")
+            path = ":memory:"
+
+        self.commit()
+        graph = SQLiteGraph(path, self.batchSize)
+        self.connection.backup(graph.connection)
+
+        return graph
+
+    def getId(self, node: str) -> int:
+        """
+        Get the id of a node in the database.
+
+        Args:
+            - node (str): The node.
+
+        Returns:
+            - int: The id or None if it isn't in the graph.
+        """
+        row = self.connection.execute(
+            "SELECT id FROM nodes WHERE url = ?", (node,)
+        ).fetchone()
+
+        return row[0] if row else None
+
+    def writeNode(self, node: str, attributes: dict, updateTypes: bool) -> None:
+        """
+        Store the attributes of a node that is in the graph.
+
+        Args:
+            - node (str): The node.
+            - attributes (dict): All its attributes.
+            - updateTypes (bool): Whether the "type" may have changed.
+
+        Returns:
+            - None
+        """
+        flags, encoded = encodeAttributes(attributes)
+        self.connection.execute(
+            "UPDATE nodes SET flags = ?, attributes = ? WHERE url = ?",
+            (flags, encoded, node),
+        )
+
+        if updateTypes:
+            nodeId = self.getId(node)
+            self.connection.execute("DELETE FROM types WHERE node = ?", (nodeId,))
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO types (word, node) VALUES (?, ?)",
+                [(word, nodeId) for word in attributes.get("type", ())],
+            )
+
+        self.changed()
+
+    def add_node(self, node_for_adding: str, **attr) -> None:
+        """
+        Add a node or update its attributes like networkx.
+        """
+        if not isinstance(node_for_adding, str):
+            raise TypeError("The nodes of a SQLiteGraph must be strings")
+
+        row = self.connection.execute(
+            "SELECT flags, attributes FROM nodes WHERE url = ?", (node_for_adding,)
+        ).fetchone()
+
+        if row is not None:
+            attributes = decodeAttributes(*row)
+            attributes.update(attr)
+            self.writeNode(node_for_adding, attributes, "type" in attr)
+            return
+
+        flags, encoded = encodeAttributes(attr)
+        nodeId = self.connection.execute(
+            "INSERT INTO nodes (url, flags, attributes) VALUES (?, ?, ?)",
+            (node_for_adding, flags, encoded),
+        ).lastrowid
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO types (word, node) VALUES (?, ?)",
+            [(word, nodeId) for word in attr.get("type", ())],
+        )
+
+        self.changed()
+
+    def add_nodes_from(self, nodes_for_adding, **attr) -> None:
+        """
+        Add or update nodes like networkx, as nodes or (node, attributes).
+        """
+        for n in nodes_for_adding:
+            if isinstance(n, tuple):
+                n, attributes = n
+                self.add_node(n, **{**attr, **attributes})
+            else:
+                self.add_node(n, **attr)
+
+    def addMissingNodes(self, nodes: set) -> dict:
+        """
+        Add the nodes of some edges that aren't in the graph.
+
+        Args:
+            - nodes (set): The nodes.
+
+        Returns:
+            - dict: The id of each node.
+        """
+        ids = {}
+
+        for node in nodes:
+            nodeId = self.getId(node)
+            if nodeId is None:
+                self.add_node(node)
+                nodeId = self.getId(node)
+            ids[node] = nodeId
+
+        return ids
+
+    def add_edge(self, u_for_edge: str, v_for_edge: str, key=None, **attr) -> int:
+        """
+        Add an edge like networkx, adding its nodes if needed.
+        """
+        newKey = self.number_of_edges(u_for_edge, v_for_edge)
+        self.add_edges_from([(u_for_edge, v_for_edge, attr)])
+        return newKey
+
+    def add_edges_from(self, ebunch_to_add, **attr) -> None:
+        """
+        Add edges like networkx, as (u, v) or (u, v, attributes).
+        """
+        edges = []
+        for edge in ebunch_to_add:
+            attributes = (
+                edge[-1] if len(edge) > 2 and isinstance(edge[-1], dict) else {}
+            )
+            edges.append((edge[0], edge[1], {**attr, **attributes}))
+
+        ids = self.addMissingNodes({n for u, v, _ in edges for n in (u, v)})
+
+        self.connection.executemany(
+            "INSERT INTO edges (source, target, attributes) VALUES (?, ?, ?)",
+            [(ids[u], ids[v], json.dumps(attributes)) for u, v, attributes in edges],
+        )
+
+        self.changed(len(edges))
+
+    def has_node(self, n: str) -> bool:
+        """
+        Check if a node is in the graph.
+        """
+        return self.getId(n) is not None
+
+    def has_edge(self, u: str, v: str, key=None) -> bool:
+        """
+        Check if there is an edge from u to v.
+        """
+        return self.number_of_edges(u, v) > 0
+
+    def number_of_nodes(self) -> int:
+        """
+        Get the number of nodes.
+        """
+        return len(self)
+
+    def number_of_edges(self, u: str = None, v: str = None) -> int:
+        """
+        Get the number of edges, or the ones from u to v.
+        """
+        if u is None:
+            return self.connection.execute("SELECT COUNT(*) FROM edges").fetchone()[0]
+
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM edges "
+            "WHERE source = (SELECT id FROM nodes WHERE url = ?) "
+            "AND target = (SELECT id FROM nodes WHERE url = ?)",
+            (u, v),
+        ).fetchone()[0]
+
+    def getNeighbors(self, n: str, reverse: bool) -> list:
+        """
+        Get the successors or the predecessors of a node.
+
+        Args:
+            - n (str): The node.
+            - reverse (bool): Whether to get the predecessors.
+
+        Returns:
+            - list: The neighbours, each one once, in the order of their first edge.
+        """
+        nodeId = self.getId(n)
+        if nodeId is None:
+            raise nx.NetworkXError(f"The node {n} is not in the graph.")
+
+        this, other = ("target", "source") if reverse else ("source", "target")
+
+        return [
+            url
+            for (url,) in self.connection.execute(
+                f"SELECT nodes.url FROM edges JOIN nodes ON nodes.id = edges.{other} "
+                f"WHERE edges.{this} = ? GROUP BY edges.{other} ORDER BY MIN(edges.id)",
+                (nodeId,),
+            )
+        ]
+
+    def successors(self, n: str) -> list:
+        """
+        Get the successors of a node like networkx.
+        """
+        return self.getNeighbors(n, False)
+
+    def predecessors(self, n: str) -> list:
+        """
+        Get the predecessors of a node like networkx.
+        """
+        return self.getNeighbors(n, True)
+
+    def neighbors(self, n: str) -> list:
+        """
+        Get the successors of a node like networkx.
+        """
+        return self.successors(n)
+
+    def iterNodes(self):
+        """
+        Go through the nodes and their attributes, in order.
+
+        Args:
+            - None
+
+        Returns:
+            - Iterator[tuple]: The node and its NodeAttributes.
+        """
+        rows = self.iterRows(
+            "SELECT id, url, flags, attributes FROM nodes "
+            "WHERE id > ? ORDER BY id LIMIT ?"
+        )
+
+        for _, url, flags, attributes in rows:
+            yield url, NodeAttributes(self, url, decodeAttributes(flags, attributes))
+
+    def iterEdges(self, data: bool = False):
+        """
+        Go through the edges, in the order they were added.
+
+        Args:
+            - data (bool): Whether to add the attributes.
+
+        Returns:
+            - Iterator[tuple]: (u, v) or (u, v, attributes).
+        """
+        rows = self.iterRows(
+            "SELECT edges.id, u.url, v.url, edges.attributes FROM edges "
+            "JOIN nodes AS u ON u.id = edges.source "
+            "JOIN nodes AS v ON v.id = edges.target "
+            "WHERE edges.id > ? ORDER BY edges.id LIMIT ?"
+        )
+
+        for _, u, v, attributes in rows:
+            yield (u, v, json.loads(attributes)) if data else (u, v)
+
+    def iterRows(self, query: str, size: int = 1000):
+        """
+        Go through the rows of a query in chunks ordered by id,
+        so the graph can be modified while they are used.
+
+        Args:
+            - query (str): The query. It must select the id first and
+                have a parameter for the last id and another for the size.
+            - size (int): The number of rows in each chunk.
+
+        Returns:
+            - Iterator[tuple]: The rows.
+        """
+        lastId = -1
+
+        while True:
+            rows = self.connection.execute(query, (lastId, size)).fetchall()
+            yield from rows
+
+            if len(rows) < size:
+                return
+
+            lastId = rows[-1][0]
+
+    def removeIds(self, ids: list) -> None:
+        """
+        Remove some nodes, their types and their edges by their ids.
+
+        Args:
+            - ids (list): The ids of the nodes.
+
+        Returns:
+            - None
+        """
+        if not ids:
+            return
+
+        self.connection.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS removed (id INTEGER PRIMARY KEY)"
+        )
+        self.connection.execute("DELETE FROM removed")
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO removed (id) VALUES (?)", ((i,) for i in ids)
+        )
+
+        self.connection.execute(
+            "DELETE FROM edges WHERE source IN removed OR target IN removed"
+        )
+        self.connection.execute("DELETE FROM types WHERE node IN removed")
+        self.connection.execute("DELETE FROM nodes WHERE id IN removed")
+        self.connection.execute("DELETE FROM removed")
+
+        self.changed(len(ids))
+
+    def remove_node(self, n: str) -> None:
+        """
+        Remove a node and its edges like networkx.
+        """
+        nodeId = self.getId(n)
+        if nodeId is None:
+            raise nx.NetworkXError(f"The node {n} is not in the graph.")
+
+        self.removeIds([nodeId])
+
+    def remove_nodes_from(self, nodes) -> None:
+        """
+        Remove nodes and their edges like networkx, ignoring the missing ones.
+        """
+        ids = [self.getId(n) for n in nodes]
+        self.removeIds([nodeId for nodeId in ids if nodeId is not None])
+
+    def remove_edges_from(self, ebunch) -> None:
+        """
+        Remove edges like networkx, the last one added of each (u, v) given.
+        """
+        for edge in ebunch:
+            self.connection.execute(
+                "DELETE FROM edges WHERE id = (SELECT MAX(id) FROM edges "
+                "WHERE source = (SELECT id FROM nodes WHERE url = ?) "
+                "AND target = (SELECT id FROM nodes WHERE url = ?))",
+                edge[:2],
+            )
+            self.changed()
+
+    def reindex(self, node: str) -> None:
+        """
+        Do nothing, the tables are updated when the attributes change.
+
+        It is here because graphIndex.setSearchData calls it.
+        """
+
+    def nodesOfType(self, *words: str) -> list:
+        """
+        Get the nodes that have all the words in their "type".
+
+        Args:
+            - words (str): The words.
+
+        Returns:
+            - list: The nodes in the order they were added.
+        """
+        return self.selectNodes(words)
+
+    def pendingNodes(self, searchKey: str, *words: str) -> list:
+        """
+        Get the nodes of some types that aren't marked with a search flag.
+
+        Args:
+            - searchKey (str): The key of the flag.
+            - words (str): The words that the "type" of the nodes must have.
+
+        Returns:
+            - list: The nodes that still need to be searched.
+        """
+        bit = searchFlags.FLAGS.get(searchKey)
+
+        if bit is not None:
+            return self.selectNodes(words, "flags & ? = 0", (bit,))
+
+        return [
+            node
+            for node in self.selectNodes(words)
+            if not searchFlags.isSearched(self.nodes[node], searchKey)
+        ]
+
+    def selectNodes(
+        self, words: tuple, condition: str = None, parameters: tuple = ()
+    ) -> list:
+        """
+        Get the nodes with all some words in their type
+        that also meet a condition on the columns of nodes.
+
+        Args:
+            - words (tuple): The words.
+            - condition (str): The SQL condition or None.
+            - parameters (tuple): The values of the condition.
+
+        Returns:
+            - list: The nodes in the order they were added.
+        """
+        conditions = ["id IN (SELECT node FROM types WHERE word = ?)"] * len(words)
+        if condition:
+            conditions.append(condition)
+
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+
+        return [
+            url
+            for (url,) in self.connection.execute(
+                f"SELECT url FROM nodes {where}ORDER BY id", (*words, *parameters)
+            )
+        ]
+
+    def getTypeIds(self, desiredType: str) -> set:
+        """
+        Get the ids of the nodes with a word in their type.
+
+        Args:
+            - desiredType (str): The word.
+
+        Returns:
+            - set: The ids.
+        """
+        return {
+            nodeId
+            for (nodeId,) in self.connection.execute(
+                "SELECT node FROM types WHERE word = ?", (desiredType,)
+            )
+        }
+
+    def removeDuplicateEdges(self) -> None:
+        """
+        Remove the edges that have the same nodes and
+        attributes as an edge added before them.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.connection.execute(
+            "DELETE FROM edges WHERE id NOT IN "
+            "(SELECT MIN(id) FROM edges GROUP BY source, target, attributes)"
+        )
+        self.commit()
+
+    def removeDirectConnections(self, desiredType: str = "Known") -> None:
+        """
+        Remove the edges between nodes of the desiredType.
+
+        Args:
+            - desiredType (str): The word of the type of the nodes.
+
+        Returns:
+            - None
+        """
+        self.connection.execute(
+            "DELETE FROM edges "
+            "WHERE source IN (SELECT node FROM types WHERE word = ?) "
+            "AND target IN (SELECT node FROM types WHERE word = ?)",
+            (desiredType, desiredType),
+        )
+        self.commit()
+
+    def removeUnconnectedNodes(self, desiredType: str = "Known") -> None:
+        """
+        Remove the nodes that are not part of a path
+        between two nodes of the desiredType.
+
+        First the nodes with less than 2 distinct neighbours are
+        removed, and then the ones they leave like that, which
+        only needs the neighbours of each removed node. Then the
+        groups of connected nodes that aren't of the desiredType are
+        removed if they touch less than 2 nodes of the desiredType.
+        Only the ids are kept in memory.
+
+        Args:
+            - desiredType (str): The word of the type of the nodes to keep.
+
+        Returns:
+            - None
+        """
+        goodIds = self.getTypeIds(desiredType)
+
+        degrees = {
+            nodeId: 0 for (nodeId,) in self.connection.execute("SELECT id FROM nodes")
+        }
+        for nodeId, degree in self.connection.execute(
+            f"SELECT node, COUNT(*) FROM ({UNDIRECTED_PAIRS}) GROUP BY node"
+        ):
+            degrees[nodeId] = degree
+
+        queue = [n for n, d in degrees.items() if d < 2 and n not in goodIds]
+        removed = set(queue)
+
+        while queue:
+            node = queue.pop()
+
+            for (neighbor,) in self.connection.execute(
+                "SELECT target FROM edges WHERE source = ? "
+                "UNION SELECT source FROM edges WHERE target = ?",
+                (node, node),
+            ):
+                if neighbor == node or neighbor in removed:
+                    continue
+
+                degrees[neighbor] -= 1
+                if degrees[neighbor] < 2 and neighbor not in goodIds:
+                    removed.add(neighbor)
+                    queue.append(neighbor)
+
+        self.removeIds(list(removed))
+
+        # Union-find of the nodes that aren't of the desiredType
+        parents = {n: n for n in degrees if n not in removed and n not in goodIds}
+
+        def find(n: int) -> int:
+            while parents[n] != n:
+                parents[n] = parents[parents[n]]
+                n = parents[n]
+            return n
+
+        goodNeighbors = {}
+
+        for u, v in self.connection.execute("SELECT source, target FROM edges"):
+            if u in goodIds and v in goodIds:
+                continue
+            elif u in goodIds:
+                goodNeighbors.setdefault(v, set()).add(u)
+            elif v in goodIds:
+                goodNeighbors.setdefault(u, set()).add(v)
+            else:
+                parents[find(u)] = find(v)
+
+        componentGood = {}
+        for n, good in goodNeighbors.items():
+            componentGood.setdefault(find(n), set()).update(good)
+
+        self.removeIds([n for n in parents if len(componentGood.get(find(n), ())) < 2])
+        self.commit()
+
+
+def encodeAttributes(attributes: dict) -> tuple:
+    """
+    Get the columns of the attributes of a node.
+
+    The "searchData" of the old graphs is moved to the flags.
+
+    Args:
+        - attributes (dict): The attributes.
+
+    Returns:
+        - int: The search flags.
+        - str: The rest of the attributes as JSON.
+    """
+    attributes = dict(attributes)
+
+    if searchFlags.LEGACY_ATTRIBUTE in attributes:
+        searchFlags.update(attributes, {})
+
+    flags = attributes.pop(searchFlags.FLAGS_ATTRIBUTE, 0)
+
+    return flags, json.dumps(attributes)
+
+
+def decodeAttributes(flags: int, encoded: str) -> dict:
+    """
+    Get the attributes of a node from its columns.
+
+    Args:
+        - flags (int): The search flags.
+        - encoded (str): The rest of the attributes as JSON.
+
+    Returns:
+        - dict: The attributes, with the "type" as a tuple.
+    """
+    attributes = json.loads(encoded)
+
+    if "type" in attributes:
+        attributes["type"] = tuple(attributes["type"])
+
+    if flags:
+        attributes[searchFlags.FLAGS_ATTRIBUTE] = flags
+
+    return attributes
@@ -1,15 +1,91 @@
 from urllib.parse import urljoin, urlparse
+from modules import httpClient, extraction, metrics
 from typing import List
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import sys
 import re
 
 BASE = "https://steamcommunity.com/"
 COLOR = "#2a475e"
 COLOR_GAMES = "Green"
 
-NORMALCALLS = 0
-APICALLS = 0
+FRIEND_CLASSES = re.compile(r"\bfriend_block_v2\b")
+
+API_HOST = "api.steampowered.com"
+
+
+def __getattr__(name: str) -> int:
+    """
+    Get the counters of the requests done by the module.
+
+    NORMALCALLS, APICALLS, CACHEHITS and CACHEMISSES are views of
+    metrics.REGISTRY, use metrics.REGISTRY.reset() to set them to 0.
+    They can't be assigned.
+
+    Args:
+        - name (str): The name of the counter.
+
+    Returns:
+        - int: The value of the counter.
+    """
+    host = urlparse(BASE).hostname
+    counters = {
+        "NORMALCALLS": ("calls", (host,)),
+        "APICALLS": ("calls", (API_HOST,)),
+        "CACHEHITS": ("cacheHits", (host, API_HOST)),
+        "CACHEMISSES": ("cacheMisses", (host, API_HOST)),
+    }
+
+    if name not in counters:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    field, hosts = counters[name]
+    return metrics.REGISTRY.count(field, hosts)
+
+
+# Assigning a counter raises an error instead of hiding the view
+sys.modules[__name__].__class__ = metrics.CounterViews
+
+
+def request(url: str, params: dict = None) -> requests.Response:
+    """
+    Do a GET request with the shared session and the response cache.
+
+    Args:
+        - url (str): The URL of the request.
+        - params (dict): The query parameters.
+
+    Returns:
+        - requests.Response: The response.
+    """
+    return httpClient.get(url, params=params)
+
+
+def isValidResponse(response: requests.Response) -> bool:
+    """
+    Check if a response has a page that can be parsed.
+
+    The retries have already been done when we get the response,
+    so an error means the page can't be downloaded now. It is
+    raised instead of returning an empty list, so the caller
+    doesn't mark the user as searched without friends.
+
+    A 404 means the page doesn't exist, so there is nothing to parse.
+    A private profile is answered with a normal page without friends.
+
+    Args:
+        - response (requests.Response): The response to check.
+
+    Returns:
+        - bool: True if it can be parsed, False if it doesn't exist.
+    """
+    if response.status_code == 404:
+        return False
+
+    response.raise_for_status()
+
+    return True
 
 
 def resolveVanityURL(url: str, APIKEY: str) -> str:
@@ -25,7 +101,6 @@ def resolveVanityURL(url: str, APIKEY: str) -> str:
     Returns:
         - str: The SteamID64 or None if not found.
     """
-    global APICALLS
     parsedUrl = urlparse(url)
 
     finalPart = parsedUrl.path.strip("/").split("/")[-1]
@@ -34,14 +109,13 @@ def resolveVanityURL(url: str, APIKEY: str) -> str:
         # If the final part is already a valid SteamID64, return it
         return finalPart
 
-    endpoint = "https://api.steampowered.com/ISteamUser/ResolveVanityURL/v1/"
+    endpoint = f"https://{API_HOST}/ISteamUser/ResolveVanityURL/v1/"
     params = {
         "key": APIKEY,
         "vanityurl": finalPart,
     }
 
-    response = requests.get(endpoint, params=params)
-    APICALLS += 1
+    response = request(endpoint, params=params)
     data = response.json()
 
     if data["response"]["success"] == 1:
@@ -188,28 +262,12 @@ def getFriends(username: str, APIKEY: str = None) -> List[str]:
     Returns:
         - List[str]: The list of URLs for the friends' profiles.
     """
-    global NORMALCALLS
-    global APICALLS
     url = getCorrectPersonURL(username)
 
-    response = requests.get(urljoin(url, "friends/"))
-    NORMALCALLS += 1
-    soup = BeautifulSoup(response.text, "html.parser")
-
-    friendClasses = re.compile(r"\bfriend_block_v2\b")
-
-    # Find all elements containing friends' Steam IDs
-    friend_blocks = soup.find_all(
-        "div",
-        class_=friendClasses,
-    )
+    response = request(urljoin(url, "friends/"))
 
     # Extract Steam IDs
-    steam_ids = [
-        urljoin(BASE, f"profiles/{block.get("data-steamid")}")
-        for block in friend_blocks
-        if block.get("data-steamid")
-    ]
+    steam_ids = FRIENDS_EXTRACTOR(response.text) if isValidResponse(response) else []
 
     if steam_ids or not APIKEY:
         # We have found friends, return the list
@@ -217,7 +275,7 @@ def getFriends(username: str, APIKEY: str = None) -> List[str]:
 
     # Use the API to get friends if no friends were found
     steamid = resolveVanityURL(url, APIKEY)
-    endpoint = "https://api.steampowered.com/ISteamUser/GetFriendList/v0001/"
+    endpoint = f"https://{API_HOST}/ISteamUser/GetFriendList/v0001/"
     params = {
         "key": APIKEY,
         "steamid": steamid,
@@ -225,8 +283,7 @@ def getFriends(username: str, APIKEY: str = None) -> List[str]:
         "format": "json",
     }
 
-    response = requests.get(endpoint, params=params)
-    APICALLS += 1
+    response = request(endpoint, params=params)
 
     if response.status_code == 401:
         """
@@ -257,9 +314,6 @@ def getName(username: str, APIKEY: str = None) -> str:
     Returns:
         - str: The name of the user.
     """
-    global NORMALCALLS
-    global APICALLS
-
     url = getCorrectPersonURL(username)
 
     # If it is already the name, return it
@@ -267,11 +321,9 @@ def getName(username: str, APIKEY: str = None) -> str:
         return url.strip("/").split("/")[-1]
 
     # Try to get the name from the HTML
-    response = requests.get(url)
-    NORMALCALLS += 1
+    response = request(url)
     if response.status_code != 429:
-        soup = BeautifulSoup(response.text, "html.parser")
-        name = soup.find("span", class_="actual_persona_name").text
+        name = NAME_EXTRACTOR(response.text)
 
         return name
 
@@ -280,11 +332,10 @@ def getName(username: str, APIKEY: str = None) -> str:
     if not steamid:
         raise ValueError("Could not resolve vanity URL")
 
-    endpoint = "https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v2/"
+    endpoint = f"https://{API_HOST}/ISteamUser/GetPlayerSummaries/v2/"
     params = {"key": APIKEY, "steamids": steamid}
 
-    response = requests.get(endpoint, params=params)
-    APICALLS += 1
+    response = request(endpoint, params=params)
     data = response.json()
 
     players = data["response"]["players"]
@@ -309,12 +360,11 @@ def getGames(username: str, APIKEY: str) -> List[str]:
         - List[str]: The list of game names owned by the user.
             Free games are included if he has played them.
     """
-    global APICALLS
     url = getCorrectPersonURL(username)
 
     steamid = resolveVanityURL(url, APIKEY)
 
-    endpoint = "https://api.steampowered.com/IPlayerService/GetOwnedGames/v0001/"
+    endpoint = f"https://{API_HOST}/IPlayerService/GetOwnedGames/v0001/"
     params = {
         "key": APIKEY,
         "steamid": steamid,
@@ -323,10 +373,43 @@ def getGames(username: str, APIKEY: str) -> List[str]:
         "format": "json",
     }
 
-    response = requests.get(endpoint, params=params)
+    response = request(endpoint, params=params)
     response.raise_for_status()  # Ensure we raise an error for bad responses
-    APICALLS += 1
     data = response.json()
 
     games = data.get("response", {}).get("games", [])
     return [g["name"] for g in games]
+
+
+def extractFriends(soup: BeautifulSoup) -> List[str]:
+    """
+    Get the friends from the tree of a friends page.
+
+    Args:
+        - soup (BeautifulSoup): The parsed page.
+
+    Returns:
+        - List[str]: The list of URLs for the friends' profiles.
+    """
+    # Find all elements containing friends' Steam IDs
+    friend_blocks = soup.find_all(
+        "div",
+        class_=FRIEND_CLASSES,
+    )
+
+    # Extract Steam IDs
+    return [
+        urljoin(BASE, f"profiles/{block.get("data-steamid")}")
+        for block in friend_blocks
+        if block.get("data-steamid")
+    ]
+
+
+FRIENDS_EXTRACTOR = extraction.Extractor(
+    "steamFriends", extractFriends, SoupStrainer("div", class_=FRIEND_CLASSES)
+)
+NAME_EXTRACTOR = extraction.Extractor(
+    "steamName",
+    lambda soup: soup.find("span", class_="actual_persona_name").text,
+    SoupStrainer("span", class_=extraction.classRegex("actual_persona_name")),
+)
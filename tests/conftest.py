@@ -0,0 +1,27 @@
+from modules import github, httpClient, rateLimiter, retrying
+from tests import standIn
+import pytest
+
+
+@pytest.fixture
+def server(monkeypatch) -> standIn.StandInServer:
+    """
+    A StandInServer used as GitHub.
+
+    The failures aren't retried and the requests
+    don't wait for the rate limiter.
+    """
+    standInServer = standIn.StandInServer()
+    monkeypatch.setattr(github, "BASE", standInServer.start())
+    monkeypatch.setattr(retrying, "POLICY", retrying.RetryPolicy(maxRetries=0))
+    monkeypatch.setattr(retrying, "BREAKERS", {})
+    monkeypatch.setattr(
+        rateLimiter, "LIMITER", rateLimiter.RateLimiter(1000, 1000, defaultPause=0)
+    )
+    monkeypatch.setattr(httpClient, "CACHE", None)
+    github.clearRepositoryPages()
+
+    yield standInServer
+
+    github.clearRepositoryPages()
+    standInServer.stop()
@@ -0,0 +1,278 @@
+from modules.github import getCorrectURL, parseCount
+from bs4 import BeautifulSoup
+from urllib.parse import urljoin
+from typing import Tuple
+
+# The parsers of the GitHub pages as they were before modules.extraction.
+# They parse the whole page with html.parser, and they are kept to check
+# that the extractors give the same results and to measure the time
+# that they save with extraction.benchmark.
+
+
+def parseConnectionPage(html: str) -> Tuple[list, str]:
+    """
+    Parse a page of the followers or following tab.
+
+    Args:
+        - html (str): The HTML of the page.
+
+    Returns:
+        - list: The list of URLs for the people in the page.
+        - str: The URL of the next page or None if it is the last one.
+    """
+    people = []
+
+    # First we get the body of the page
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Loop through each 'div' element with the class 'd-table' in the HTML content
+    for follower in soup.find_all("div", class_="d-table"):
+
+        # Within each 'div' found, search for an 'a' (anchor) tag with the class 'd-inline-block'
+        link = follower.find("a", class_="d-inline-block")
+
+        # Check if the anchor tag ('a' tag) exists
+        if link:
+
+            # If found, add the value of the 'href' attribute (the URL) to the people list
+            people.append(getCorrectURL(link["href"]))
+
+    return people, getNextPage(soup)
+
+
+def getNextPage(soup: BeautifulSoup) -> str:
+    """
+    Get the URL of the next page from the 'Next' button.
+
+    Args:
+        - soup (BeautifulSoup): The parsed page.
+
+    Returns:
+        - str: The URL of the next page or None if there isn't one.
+    """
+    # Find the 'Next' button link to go to the next page
+    nextPage = soup.find("a", string="Next")
+
+    if nextPage:
+        return getCorrectURL(nextPage["href"])
+
+    # No more pages
+    return None
+
+
+def parseProfileCounts(html: str) -> dict:
+    """
+    Get the counts shown in the profile page of a user.
+
+    Args:
+        - html (str): The HTML of the profile page.
+
+    Returns:
+        - dict: The counts with the keys "followers", "following",
+            "repositories" and "stars". The ones that aren't shown are missing.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    counts = {}
+
+    for tab in ["followers", "following"]:
+        link = soup.find("a", href=lambda href: href and f"tab={tab}" in href)
+        if link and link.find("span"):
+            count = parseCount(link.find("span").text)
+            if count is not None:
+                counts[tab] = count
+
+    for tab in ["repositories", "stars"]:
+        link = soup.find("a", attrs={"data-tab-item": tab})
+        if link and link.find("span", class_="Counter"):
+            counter = link.find("span", class_="Counter")
+            count = parseCount(counter.get("title") or counter.text)
+            if count is not None:
+                counts[tab] = count
+
+    return counts
+
+
+def parseStargazerCount(html: str) -> int:
+    """
+    Get the number of stargazers shown in the page of a repository.
+
+    Args:
+        - html (str): The HTML of the repository page.
+
+    Returns:
+        - int: The number of stargazers or None if it isn't shown.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    counter = soup.find(id="repo-stars-counter-star")
+
+    if not counter:
+        return None
+
+    return parseCount(counter.get("title") or counter.text)
+
+
+def parseRepositoriesPage(html: str, username: str) -> Tuple[list, str]:
+    """
+    Parse a page of the repositories tab of a user.
+
+    Args:
+        - html (str): The HTML of the page.
+        - username (str): The URL of the owner of the repositories.
+
+    Returns:
+        - list: The list of URLs for the repositories in the page.
+        - str: The URL of the next page or None if it is the last one.
+    """
+    username = getCorrectURL(username)
+    repositories = []
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Get the repositories
+    repoBlocks = soup.find_all("h3", class_="wb-break-all")
+
+    # Extract the url of the repositories
+    for repo in repoBlocks:
+        if repo.find("a"):
+            repositories.append(
+                getCorrectURL(urljoin(f"{username}/", repo.find("a").text))
+            )
+
+    return repositories, getNextPage(soup)
+
+
+def hasContributors(html: str) -> bool:
+    """
+    Check if the page of a repository shows contributors.
+
+    Args:
+        - html (str): The HTML of the repository page.
+
+    Returns:
+        - bool: True if the repository has contributors.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    return "Contributors" in soup.text
+
+
+def parseRepositoryParent(html: str) -> Tuple[str, str]:
+    """
+    Get the parent repository from the page of a repository.
+
+    Args:
+        - html (str): The HTML of the repository page.
+
+    Returns:
+        - str: The parent repository URL or None.
+        - str: The type of parent ("fork" or "template") or None.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    parent = None
+    typeOfParent = None
+
+    parentLinkMeta = soup.find(
+        "meta", {"name": "octolytics-dimension-repository_parent_nwo"}
+    )
+
+    if parentLinkMeta:
+        parentRepository = parentLinkMeta["content"]
+        parent = getCorrectURL(parentRepository)
+        typeOfParent = "fork"
+
+    else:
+
+        # Check if the repository was created from a template
+
+        # Check both possible div structures
+        for div in soup.find_all(
+            "div", class_=["d-none", "d-md-block", "mb-2", "d-flex", "color-fg-muted"]
+        ):
+            if "generated from" in div.text.lower():
+                a_tag = div.find("a", class_="Link--inTextBlock")
+
+                if a_tag and "href" in a_tag.attrs:
+                    parent = getCorrectURL(a_tag["href"])
+                    typeOfParent = "template"
+                    break  # Stop once found
+
+    return parent, typeOfParent
+
+
+def parseStarredPage(html: str) -> Tuple[list, str]:
+    """
+    Parse a page of the stars tab of a user.
+
+    This tab uses cursors instead of page numbers,
+    so it can't be downloaded in parallel.
+
+    Args:
+        - html (str): The HTML of the page.
+
+    Returns:
+        - list: The list of URLs for the starred repositories in the page.
+        - str: The URL of the next page or None if it is the last one.
+    """
+    repositories = []
+
+    # First we get the body of the page
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Loop through each 'div' element with the class 'col-12 d-block width-full py-4 border-bottom color-border-muted' in the HTML content
+    repoContainers = soup.find_all(
+        "div",
+        class_="col-12 d-block width-full py-4 border-bottom color-border-muted",
+    )
+    for container in repoContainers:
+        link = container.find("h3").find("a")["href"]
+        if link:
+            # If found, add the value of the 'href' attribute (the URL) to the people list
+            repositories.append(getCorrectURL(link))
+
+    return repositories, getNextPage(soup)
+
+
+def parseStargazersPage(html: str) -> Tuple[list, str]:
+    """
+    Parse a page of the stargazers of a repository.
+
+    Args:
+        - html (str): The HTML of the page.
+
+    Returns:
+        - list: The list of URLs for the stargazers in the page.
+        - str: The URL of the next page or None if it is the last one.
+    """
+    stargazers = []
+
+    # First we get the body of the page
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Find the <ol> element with the specified class
+    stargazersBlock = soup.find(
+        "ol", class_="d-block d-md-flex flex-wrap gutter list-style-none"
+    )
+
+    if stargazersBlock:
+        for a in stargazersBlock.find_all("a", href=True):
+            if (
+                a.get("data-hovercard-type") == "user"
+            ):  # Check if the link has the "data-hovercard-type" attribute set to "user"
+                stargazers.append(getCorrectURL(a["href"]))
+
+    return stargazers, getNextPage(soup)
+
+
+def parseRepository(html: str) -> tuple:
+    """
+    Get everything that is read from the page of a repository.
+
+    Args:
+        - html (str): The HTML of the repository page.
+
+    Returns:
+        - tuple: The parent and its type, the number of
+            stargazers and whether it has contributors.
+    """
+    return parseRepositoryParent(html), parseStargazerCount(html), hasContributors(html)
@@ -0,0 +1,332 @@
+from urllib.parse import urlsplit
+import http.server
+import json
+import re
+import threading
+import time
+
+
+class StandInServer:
+    def __init__(self) -> None:
+        """
+        Initialize the StandInServer.
+
+        It is a local HTTP server that answers the pages added with
+        addPage, so the scrapers can be tested without the network.
+        The pages are found by their path with the query, like
+        "/owner/repo/stargazers?page=2". The rest get a 404.
+        The POST requests with a JSON body are answered by the
+        handlers added with addHandler, like a GraphQL API.
+
+        Returns:
+            - None
+        """
+        self.pages = {}
+        self.failures = {}
+        self.delays = {}
+        self.handlers = {}
+        self.requests = []
+        self.posts = []
+        self.lock = threading.Lock()
+        self.server = None
+
+    def addPage(
+        self, path: str, body: str, status: int = 200, headers: dict = None
+    ) -> None:
+        """
+        Add a page to the server.
+
+        Args:
+            - path (str): The path with the query.
+            - body (str): The body of the response.
+            - status (int): The status code.
+            - headers (dict): Extra headers of the response, like "Link".
+
+        Returns:
+            - None
+        """
+        self.pages[path] = (status, body, headers or {})
+
+    def addHandler(self, path: str, handler) -> None:
+        """
+        Answer the POST requests to a path with a function.
+
+        Args:
+            - path (str): The path.
+            - handler (Callable): Gets the JSON body of the request
+                and returns the JSON body of the response.
+
+        Returns:
+            - None
+        """
+        self.handlers[path] = handler
+
+    def fail(self, path: str, times: int = 1, status: int = 500) -> None:
+        """
+        Make the next requests to a page fail.
+
+        Args:
+            - path (str): The path with the query.
+            - times (int): The number of requests that fail.
+            - status (int): The status code of the failures.
+
+        Returns:
+            - None
+        """
+        self.failures[path] = [status] * times
+
+    def delay(self, path: str, seconds: float) -> None:
+        """
+        Make the answers to a page arrive late.
+
+        Args:
+            - path (str): The path with the query.
+            - seconds (float): The seconds to wait before answering.
+
+        Returns:
+            - None
+        """
+        self.delays[path] = seconds
+
+    def answer(self, path: str) -> tuple:
+        """
+        Get the response to a request.
+
+        Args:
+            - path (str): The path with the query.
+
+        Returns:
+            - int: The status code.
+            - str: The body.
+            - dict: The extra headers.
+        """
+        with self.lock:
+            self.requests.append(path)
+
+            if self.failures.get(path):
+                return self.failures[path].pop(0), "Error", {}
+
+        time.sleep(self.delays.get(path, 0))
+
+        return self.pages.get(path, (404, "Not Found", {}))
+
+    def answerPost(self, path: str, data: dict) -> tuple:
+        """
+        Get the response to a POST request.
+
+        Args:
+            - path (str): The path with the query.
+            - data (dict): The JSON body of the request.
+
+        Returns:
+            - int: The status code.
+            - str: The body.
+            - dict: The extra headers.
+        """
+        with self.lock:
+            self.requests.append(path)
+            self.posts.append(data)
+
+            if self.failures.get(path):
+                return self.failures[path].pop(0), "Error", {}
+
+        if path not in self.handlers:
+            return 404, "Not Found", {}
+
+        return 200, json.dumps(self.handlers[path](data)), {}
+
+    def start(self) -> str:
+        """
+        Start the server in a thread.
+
+        Args:
+            - None
+
+        Returns:
+            - str: The base URL, like "http://127.0.0.1:8000".
+        """
+        standIn = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def getPath(self) -> str:
+                parts = urlsplit(self.path)
+                return parts.path + (f"?{parts.query}" if parts.query else "")
+
+            def respond(self, status: int, body: str, headers: dict) -> None:
+                data = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self) -> None:
+                self.respond(*standIn.answer(self.getPath()))
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                data = json.loads(self.rfile.read(length) or b"{}")
+                self.respond(*standIn.answerPost(self.getPath(), data))
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def stop(self) -> None:
+        """
+        Stop the server.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def stargazersPage(users: list, nextPage: str = None) -> str:
+    """
+    Create a stargazers page of GitHub.
+
+    Args:
+        - users (list): The paths of the users, like "/alice".
+        - nextPage (str): The path of the next page or None.
+
+    Returns:
+        - str: The HTML.
+    """
+    links = "".join(
+        f'<li><a href="{user}" data-hovercard-type="user">{user}</a></li>'
+        for user in users
+    )
+    nextLink = f'<a href="{nextPage}">Next</a>' if nextPage else ""
+
+    return (
+        '<html><body><ol class="d-block d-md-flex flex-wrap gutter list-style-none">'
+        f"{links}</ol>{nextLink}</body></html>"
+    )
+
+
+def connectionPage(users: list, nextPage: str = None) -> str:
+    """
+    Create a followers or following page of GitHub.
+
+    Args:
+        - users (list): The paths of the users, like "/alice".
+        - nextPage (str): The path of the next page or None.
+
+    Returns:
+        - str: The HTML.
+    """
+    people = "".join(
+        f'<div class="d-table"><a class="d-inline-block" href="{user}">{user}</a></div>'
+        for user in users
+    )
+    nextLink = f'<a href="{nextPage}">Next</a>' if nextPage else ""
+
+    return f"<html><body>{people}{nextLink}</body></html>"
+
+
+class GraphQLStandIn:
+    def __init__(self, users: dict = None, repositories: dict = None) -> None:
+        """
+        Initialize the GraphQLStandIn.
+
+        It answers the queries of githubGraphQL.buildQuery like the
+        GraphQL API of GitHub. The cursors are the positions in the lists.
+        It is added to a StandInServer with addHandler.
+
+        Args:
+            - users (dict): The login of each user as key and a dict with
+                the lists of each field, like "followers", as value.
+            - repositories (dict): The "owner/name" of each repository as
+                key and a dict with the lists of each field as value.
+                A None in a list is given as a null node.
+
+        Returns:
+            - None
+        """
+        self.users = users or {}
+        self.repositories = repositories or {}
+        self.rateLimit = {
+            "cost": 1,
+            "remaining": 5000,
+            "resetAt": time.strftime(
+                "%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() + 3600)
+            ),
+        }
+        self.queries = []
+
+    def __call__(self, body: dict) -> dict:
+        """
+        Answer a query.
+
+        Args:
+            - body (dict): The "query" and the "variables".
+
+        Returns:
+            - dict: The "data" and the "errors" if there are any.
+        """
+        query, variables = body["query"], body["variables"]
+        self.queries.append((query, variables))
+
+        data = {"rateLimit": dict(self.rateLimit)}
+        errors = []
+
+        for part in re.split(r" (?=n\d+: (?:user|repository)\()", query)[1:]:
+            alias, kind, i = re.match(r"(n(\d+)): (user|repository)", part).group(
+                1, 3, 2
+            )
+
+            if kind == "user":
+                name = variables[f"login{i}"]
+                node = self.users.get(name)
+            else:
+                name = f"{variables[f'owner{i}']}/{variables[f'name{i}']}"
+                node = self.repositories.get(name)
+
+            if node is None:
+                data[alias] = None
+                errors.append(
+                    {
+                        "type": "NOT_FOUND",
+                        "path": [alias],
+                        "message": f"Could not resolve to a node with the name of '{name}'.",
+                    }
+                )
+                continue
+
+            data[alias] = {}
+            for connection, field, first, after, idField in re.findall(
+                r"(c\d+): (\w+)\(first: (\d+), after: \$(\w+)[^)]*\) "
+                r"\{ pageInfo \{ hasNextPage endCursor \} nodes \{ (\w+) \} \}",
+                part,
+            ):
+                elements = node.get(field, [])
+                start = int(variables[after] or 0)
+                end = min(start + int(first), len(elements))
+
+                data[alias][connection] = {
+                    "pageInfo": {
+                        "hasNextPage": end < len(elements),
+                        "endCursor": str(end),
+                    },
+                    "nodes": [
+                        {idField: element} if element else None
+                        for element in elements[start:end]
+                    ],
+                }
+
+        answer = {"data": data}
+        if errors:
+            answer["errors"] = errors
+
+        return answer
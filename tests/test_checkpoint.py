@@ -0,0 +1,73 @@
+from modules import checkpoint, github, graphGithub
+from tests.test_graphGithub import addStargazerPages, createGraph
+import pytest
+
+
+def resume(path: str) -> tuple:
+    """
+    Restore the log of a pass that stopped and run the pass again.
+
+    Returns:
+        - nx.MultiDiGraph: The restored graph.
+        - nx.MultiDiGraph: The graph after the resumed pass.
+    """
+    log = checkpoint.GraphCheckpoint(path, interval=0)
+    restored = log.restore(createGraph("o/a", "o/b"))
+
+    manager = graphGithub.GitHubGraphManager(checkpoint=log)
+    graph = manager.expand(restored, relations=("stargazers",), batchSize=1)
+    log.close()
+
+    return restored, graph
+
+
+def test_failedRelationIsNotLogged(server, tmp_path):
+    addStargazerPages(server, "o/a")
+    addStargazerPages(server, "o/b")
+    server.failures.pop("/o/a/stargazers?page=2")
+    path = str(tmp_path / "checkpoint.sqlite")
+
+    log = checkpoint.GraphCheckpoint(path, interval=0)
+    manager = graphGithub.GitHubGraphManager(checkpoint=log)
+    manager.expand(createGraph("o/a", "o/b"), relations=("stargazers",), batchSize=1)
+    log.connection.close()
+
+    restored, graph = resume(path)
+    expected = graphGithub.GitHubGraphManager().addStargazers(createGraph("o/a", "o/b"))
+
+    assert restored.number_of_edges() == 3
+    assert all(v == github.getCorrectURL("o/a") for _, v in restored.edges())
+    assert graph.number_of_edges() == len(set(graph.edges())) == 6
+    assert sorted(graph.edges()) == sorted(expected.edges())
+
+
+def test_interruptedRelationIsNotLogged(server, tmp_path, monkeypatch):
+    addStargazerPages(server, "o/a")
+    addStargazerPages(server, "o/b")
+    server.failures.clear()
+    path = str(tmp_path / "checkpoint.sqlite")
+
+    request = github.request
+
+    def interrupt(url, *args, **kwargs):
+        if url.endswith("/o/b/stargazers?page=2"):
+            raise KeyboardInterrupt
+        return request(url, *args, **kwargs)
+
+    monkeypatch.setattr(github, "request", interrupt)
+
+    log = checkpoint.GraphCheckpoint(path, interval=0)
+    manager = graphGithub.GitHubGraphManager(checkpoint=log)
+    with pytest.raises(KeyboardInterrupt):
+        manager.expand(
+            createGraph("o/a", "o/b"), relations=("stargazers",), batchSize=1
+        )
+
+    # The process dies without closing the log
+    log.connection.close()
+    monkeypatch.setattr(github, "request", request)
+
+    restored, graph = resume(path)
+
+    assert restored.number_of_edges() == 3
+    assert graph.number_of_edges() == len(set(graph.edges())) == 6
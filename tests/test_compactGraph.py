@@ -0,0 +1,133 @@
+from modules import compactGraph, graphIndex, searchFlags
+import networkx as nx
+import numpy as np
+
+
+def createGraph() -> nx.MultiDiGraph:
+    """
+    Create a graph with every kind of attribute that the managers use.
+    """
+    graph = nx.MultiDiGraph()
+
+    graph.add_node("a", type=("GitHub", "User", "Known"), color="red")
+    graph.add_node("b", type=("GitHub", "User"), color="#852fa4")
+    graph.add_node("c", type=["Steam", "User", "Known"], color="#2a475e")
+    graph.add_node("d", type=("GitHub", "Repository"), color="blue")
+    graph.add_node("e")
+
+    searchFlags.update(graph.nodes["a"], {"githubFollow": True, "githubStarred": True})
+    searchFlags.update(
+        graph.nodes["d"],
+        {
+            "githubStargazers": True,
+            "githubStargazersNewest": "b",
+            "githubStargazersRefreshed": 1.5,
+        },
+    )
+    graph.nodes["e"]["extra"] = [1, 2]
+
+    graph.add_edge("b", "a", label="follows")
+    graph.add_edge("b", "a", label="follows")
+    graph.add_edge("a", "d", label="starred")
+    graph.add_edge("b", "d")
+    graph.add_edge("d", "d", label="parent")
+    graph.add_edge("c", "a")
+    graph.add_edge("a", "c")
+
+    return graph
+
+
+def assertSameGraph(graph: nx.MultiDiGraph, expected: nx.MultiDiGraph) -> None:
+    assert list(graph.nodes(data=True)) == list(expected.nodes(data=True))
+    assert list(graph.edges(data=True)) == list(expected.edges(data=True))
+    for node in expected:
+        assert type(graph.nodes[node].get("type")) is type(
+            expected.nodes[node].get("type")
+        )
+
+
+def test_roundTripKeepsTheGraph():
+    graph = createGraph()
+
+    compact = compactGraph.CompactGraph.fromNetworkx(graph)
+
+    assert len(compact) == 5 and compact.numberOfEdges() == 7
+    assert compact.sources.dtype == np.int32 and compact.types.dtype == np.int16
+    assertSameGraph(compact.toNetworkx(), graph)
+
+
+def test_tablesKeepEachValueOnce():
+    compact = compactGraph.CompactGraph.fromNetworkx(createGraph())
+
+    assert compact.typeTable == [
+        ("GitHub", "User", "Known"),
+        ("GitHub", "User"),
+        ["Steam", "User", "Known"],
+        ("GitHub", "Repository"),
+    ]
+    assert compact.types.tolist() == [0, 1, 2, 3, compactGraph.MISSING]
+    assert compact.colors[4] == compactGraph.MISSING
+    # In the order of the edges of networkx, which are grouped by the source
+    assert compact.relations == [
+        {"label": "starred"},
+        {},
+        {"label": "follows"},
+        {"label": "parent"},
+    ]
+    assert compact.getRelation("parent") == 3
+    assert compact.getRelation("other") == compactGraph.MISSING
+
+
+def test_searchFlagsAndInfo():
+    compact = compactGraph.CompactGraph.fromNetworkx(createGraph())
+    attributes = compact.getAttributes(compact.ids["d"])
+
+    assert searchFlags.isSearched(attributes, "githubStargazers")
+    assert not searchFlags.isSearched(attributes, "githubParent")
+    assert attributes["searchInfo"] == {
+        "githubStargazersNewest": "b",
+        "githubStargazersRefreshed": 1.5,
+    }
+    assert searchFlags.FLAGS_ATTRIBUTE not in compact.getAttributes(compact.ids["b"])
+
+
+def test_csrNeighbors():
+    graph = createGraph()
+    compact = compactGraph.CompactGraph.fromNetworkx(graph)
+
+    for node in graph:
+        assert compact.successors(node) == list(graph.successors(node))
+        assert compact.predecessors(node) == list(graph.predecessors(node))
+
+    follows = compact.getRelation("follows")
+    assert compact.successors("b", follows) == ["a"]
+    assert compact.predecessors("a", follows) == ["b"]
+    assert compact.successors("d", compact.getRelation("parent")) == ["d"]
+
+    indptr, indices = compact.csr()
+    assert len(indptr) == len(compact) + 1 and indptr[-1] == len(indices) == 7
+
+
+def test_nodesOfTypeAndNeighborhood():
+    graph = createGraph()
+    compact = compactGraph.CompactGraph.fromNetworkx(graph)
+
+    assert compact.nodesOfType("Known") == graphIndex.nodesOfType(graph, "Known")
+    assert compact.nodesOfType("User", "GitHub") == ["a", "b"]
+    assert compact.neighborhood(["c"]) == ["a", "c"]
+    assert compact.neighborhood(["c"], radius=2) == ["a", "b", "c", "d"]
+
+    expected = nx.MultiDiGraph()
+    expected.add_nodes_from((n, graph.nodes[n]) for n in ("a", "b"))
+    expected.add_edges_from(
+        (u, v, d) for u, v, d in graph.edges(data=True) if {u, v} <= {"a", "b"}
+    )
+    assertSameGraph(compact.toNetworkx(["b", "a"]), expected)
+
+
+def test_emptyGraph():
+    compact = compactGraph.CompactGraph.fromNetworkx(nx.MultiDiGraph())
+
+    assert len(compact) == 0 and compact.numberOfEdges() == 0
+    assert compact.nodesOfType("Known") == []
+    assert len(compact.toNetworkx()) == 0
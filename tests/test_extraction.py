@@ -0,0 +1,53 @@
+from modules import extraction, github
+from tests import originalParsers
+import pytest
+import os
+
+PAGES = extraction.loadPages(os.path.join(os.path.dirname(__file__), "pages"))
+
+PARSERS = {
+    "connections": (github.parseConnectionPage, originalParsers.parseConnectionPage),
+    "repositories": (
+        lambda html: github.parseRepositoriesPage(html, "octocat"),
+        lambda html: originalParsers.parseRepositoriesPage(html, "octocat"),
+    ),
+    "starred": (github.parseStarredPage, originalParsers.parseStarredPage),
+    "stargazers": (github.parseStargazersPage, originalParsers.parseStargazersPage),
+    "profile": (github.parseProfileCounts, originalParsers.parseProfileCounts),
+    "repository": (
+        lambda html: (
+            github.parseRepositoryParent(html),
+            github.parseStargazerCount(html),
+            github.hasContributors(html),
+        ),
+        originalParsers.parseRepository,
+    ),
+}
+
+
+def test_everyTypeOfPageIsSaved():
+    assert sorted(PAGES) == sorted(PARSERS)
+    assert all(len(htmls) >= 2 for htmls in PAGES.values())
+
+
+@pytest.mark.parametrize(
+    "name, index",
+    [(name, i) for name, htmls in PAGES.items() for i in range(len(htmls))],
+)
+def test_extractorsGiveTheOriginalResult(name, index):
+    html = PAGES[name][index]
+    fastParser, fullParser = PARSERS[name]
+
+    result = fastParser(html)
+
+    assert result == fullParser(html)
+    # The pages have something to find, so an empty result can't be equal by chance
+    assert result if isinstance(result, dict) else result[0]
+
+
+def test_benchmark():
+    results = extraction.benchmark(PAGES, PARSERS, repeat=1)
+
+    assert sorted(results) == sorted(PARSERS)
+    assert all(result["equal"] for result in results.values())
+    assert all(result["full"] > 0 and result["fast"] > 0 for result in results.values())
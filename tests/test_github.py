@@ -0,0 +1,175 @@
+from modules import github
+from tests import standIn
+from collections import OrderedDict
+import json
+import time
+
+
+def test_repositoryPagesKeepTheRecentlyUsedOnes(monkeypatch):
+    monkeypatch.setattr(github, "REPOSITORY_PAGES", OrderedDict())
+    monkeypatch.setattr(github, "MAX_REPOSITORY_PAGES", 2)
+
+    for repository in ("o/a", "o/b"):
+        github.addRepositoryPage(
+            github.RepositoryPage(github.getCorrectURL(repository))
+        )
+
+    assert github.findRepositoryPage("o/a") is not None
+
+    github.addRepositoryPage(github.RepositoryPage(github.getCorrectURL("o/c")))
+
+    assert github.findRepositoryPage("o/b") is None
+    assert github.findRepositoryPage("o/a") is not None
+    assert github.findRepositoryPage("o/c") is not None
+    assert len(github.REPOSITORY_PAGES) == 2
+
+
+def test_iterAllPagesStopsDownloadingWhenTheCallerStops(server):
+    for page in range(1, 21):
+        path = f"/o/r/stargazers?page={page}"
+        server.addPage(path, standIn.stargazersPage([f"/user{page}"]))
+        if page > 1:
+            server.delay(path, 1)
+
+    pages = github.iterAllPages(
+        f"{github.BASE}/o/r/stargazers?page={{page}}",
+        20,
+        github.parseStargazersPage,
+        maxWorkers=2,
+    )
+
+    assert next(pages) == github.getCorrectURL("user1")
+
+    start = time.perf_counter()
+    pages.close()
+
+    # It doesn't wait for the pages that are being downloaded
+    assert time.perf_counter() - start < 0.5
+    assert len(server.requests) <= 4
+
+
+def test_iterAllPagesKeepsThePageOrder(server):
+    for page in range(1, 11):
+        server.addPage(
+            f"/o/r/stargazers?page={page}", standIn.stargazersPage([f"/user{page}"])
+        )
+
+    pages = github.iterAllPages(
+        f"{github.BASE}/o/r/stargazers?page={{page}}",
+        10,
+        github.parseStargazersPage,
+        maxWorkers=3,
+    )
+
+    assert list(pages) == [github.getCorrectURL(f"user{page}") for page in range(1, 11)]
+
+
+def test_iterStargazersFollowsTheNextPages(server):
+    server.addPage(
+        "/o/r/stargazers",
+        standIn.stargazersPage(["/a", "/b"], "/o/r/stargazers?page=2"),
+    )
+    # A new stargazer moved "b" to the second page
+    server.addPage(
+        "/o/r/stargazers?page=2",
+        standIn.stargazersPage(["/b", "/c"], "/o/r/stargazers?page=3"),
+    )
+    server.addPage("/o/r/stargazers?page=3", standIn.stargazersPage(["/a", "/d"]))
+
+    stargazers = github.iterStargazers("o/r")
+
+    assert next(stargazers) == github.getCorrectURL("a")
+    # The next pages are only downloaded when they are read
+    assert len(server.requests) == 1
+    assert list(stargazers) == [github.getCorrectURL(user) for user in "bcd"]
+    assert len(server.requests) == 3
+
+
+def test_parallelStargazersKeepThePageOrder(server):
+    server.addPage(
+        "/o/r", '<html><span id="repo-stars-counter-star" title="144">144</span></html>'
+    )
+    pages = [["/a", "/b"], ["/b", "/c"], ["/d", "/a"]]
+    for page, users in enumerate(pages, 1):
+        server.addPage(f"/o/r/stargazers?page={page}", standIn.stargazersPage(users))
+    server.delay("/o/r/stargazers?page=1", 0.2)
+
+    stargazers = list(github.iterStargazers("o/r", parallel=True, maxWorkers=3))
+
+    assert stargazers == [github.getCorrectURL(user) for user in "abcd"]
+
+
+def test_iterFollowersFollowsTheNextPages(server):
+    server.addPage(
+        "/u?tab=followers",
+        standIn.connectionPage(["/a", "/b"], "/u?page=2&tab=followers"),
+    )
+    server.addPage("/u?page=2&tab=followers", standIn.connectionPage(["/c"]))
+
+    followers = list(github.iterFollowers("u"))
+
+    assert followers == [github.getCorrectURL(user) for user in "abc"]
+
+
+def test_parallelFollowersKeepThePageOrder(server):
+    for page, users in enumerate([["/a", "/b"], ["/c"], ["/d"]], 1):
+        server.addPage(f"/u?page={page}&tab=followers", standIn.connectionPage(users))
+    server.delay("/u?page=1&tab=followers", 0.2)
+
+    followers = github.iterFollowers(
+        "u", parallel=True, maxWorkers=3, counts={"followers": 150}
+    )
+
+    assert list(followers) == [github.getCorrectURL(user) for user in "abcd"]
+    # The counts given aren't downloaded again
+    assert "/u" not in server.requests
+
+
+def addContributorPages(server: standIn.StandInServer, monkeypatch) -> list:
+    """
+    Add the contributors of "o/r" in 3 pages of the API joined by Link headers.
+    The second page isn't full.
+    """
+    monkeypatch.setattr(
+        github,
+        "getContributorsURL",
+        lambda repository, anonymous=False: (
+            f"{github.BASE}/repos/{repository}/contributors?per_page=100"
+        ),
+    )
+    server.addPage("/o/r", "<html><body>Contributors</body></html>")
+
+    pages = [
+        [f"{github.BASE}/user{page}-{i}" for i in range(size)]
+        for page, size in enumerate((100, 2, 1), 1)
+    ]
+
+    for page, users in enumerate(pages, 1):
+        path = "/repos/o/r/contributors?per_page=100"
+        headers = {}
+        if page > 1:
+            path += f"&page={page}"
+        if page < len(pages):
+            nextPage = (
+                f"{github.BASE}/repos/o/r/contributors?per_page=100&page={page + 1}"
+            )
+            headers["Link"] = f'<{nextPage}>; rel="next", <{nextPage}>; rel="last"'
+        server.addPage(
+            path,
+            json.dumps([{"html_url": user} for user in users]),
+            headers=headers,
+        )
+
+    return [user for users in pages for user in users]
+
+
+def test_contributorsFollowTheLinkHeader(server, monkeypatch):
+    expected = addContributorPages(server, monkeypatch)
+
+    assert github.getContributors("o/r") == expected
+    assert server.requests == [
+        "/o/r",
+        "/repos/o/r/contributors?per_page=100",
+        "/repos/o/r/contributors?per_page=100&page=2",
+        "/repos/o/r/contributors?per_page=100&page=3",
+    ]
@@ -0,0 +1,92 @@
+from modules import github, githubAsync, httpCache, httpClient, metrics
+from tests import standIn
+from tests.test_github import addContributorPages
+import requests
+import asyncio
+import pytest
+
+
+async def getStargazers(repository: str) -> list:
+    async with githubAsync.createSession() as session:
+        return await githubAsync.getStargazers(repository, session)
+
+
+def addStargazers(server: standIn.StandInServer) -> None:
+    """
+    Add a list of stargazers where one moves to the second page while it is read.
+    """
+    server.addPage(
+        "/o/r/stargazers",
+        standIn.stargazersPage(["/zoe", "/al", "/mia"], "/o/r/stargazers?page=2"),
+    )
+    server.addPage("/o/r/stargazers?page=2", standIn.stargazersPage(["/mia", "/bo"]))
+
+
+def test_getStargazersKeepsThePageOrder(server):
+    addStargazers(server)
+
+    stargazers = asyncio.run(getStargazers("o/r"))
+
+    assert stargazers == [
+        github.getCorrectURL(user) for user in ("zoe", "al", "mia", "bo")
+    ]
+    assert stargazers == list(github.iterStargazers("o/r"))
+
+
+def test_getStargazersRaisesOnAFailedPage(server):
+    addStargazers(server)
+    server.fail("/o/r/stargazers?page=2", status=503)
+
+    with pytest.raises(requests.HTTPError):
+        asyncio.run(getStargazers("o/r"))
+
+
+def test_getStargazersOfAMissingRepository(server):
+    assert asyncio.run(getStargazers("o/missing")) == []
+
+
+def test_getContributorsFollowsTheLinkHeader(server, monkeypatch):
+    expected = addContributorPages(server, monkeypatch)
+
+    async def getContributors() -> list:
+        async with githubAsync.createSession() as session:
+            return await githubAsync.getContributors("o/r", session)
+
+    assert asyncio.run(getContributors()) == expected
+    assert len(server.requests) == 4
+
+
+def test_theAsyncClientSharesTheResponseCache(server, tmp_path, monkeypatch):
+    addStargazers(server)
+    cache = httpCache.ResponseCache(str(tmp_path / "cache.sqlite"))
+    monkeypatch.setattr(httpClient, "CACHE", cache)
+    monkeypatch.setattr(metrics, "REGISTRY", metrics.MetricsRegistry())
+
+    first = asyncio.run(getStargazers("o/r"))
+    second = asyncio.run(getStargazers("o/r"))
+
+    assert first == second == list(github.iterStargazers("o/r"))
+    # Only the first walk used the network
+    assert len(server.requests) == 2
+    assert (cache.hits, cache.misses) == (4, 2)
+    assert metrics.REGISTRY.count("cacheHits") == 4
+
+    cache.close()
+
+
+def test_theAsyncClientRevalidatesTheStalePages(server, tmp_path, monkeypatch):
+    server.addPage(
+        "/o/r/stargazers", standIn.stargazersPage(["/zoe"]), headers={"ETag": '"1"'}
+    )
+    cache = httpCache.ResponseCache(str(tmp_path / "cache.sqlite"), defaultTTL=0)
+    monkeypatch.setattr(httpClient, "CACHE", cache)
+
+    first = asyncio.run(getStargazers("o/r"))
+    server.addPage("/o/r/stargazers", "", status=304)
+    second = asyncio.run(getStargazers("o/r"))
+
+    assert first == second == [github.getCorrectURL("zoe")]
+    assert len(server.requests) == 2
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.close()
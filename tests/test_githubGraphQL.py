@@ -0,0 +1,182 @@
+from modules import github, githubGraphQL, graphGithub, rateLimiter, searchFlags
+from tests import standIn
+import networkx as nx
+import pytest
+import time
+
+USERS = {
+    "alice": {
+        "followers": ["bob", "carol", "dave", "erin", "frank"],
+        "following": ["bob"],
+        "starredRepositories": ["o/r"],
+        "repositories": ["alice/tool"],
+    },
+    "bob": {"followers": ["alice"], "following": [None, "alice"]},
+    "carol": {"followers": []},
+}
+REPOSITORIES = {"o/r": {"stargazers": ["alice", "bob", "carol"]}}
+
+
+@pytest.fixture
+def graphQL(server) -> standIn.GraphQLStandIn:
+    """
+    A GraphQLStandIn added to the server at "/graphql".
+    """
+    api = standIn.GraphQLStandIn(USERS, REPOSITORIES)
+    server.addHandler("/graphql", api)
+
+    return api
+
+
+def createClient(
+    pageSize: int = githubGraphQL.PAGE_SIZE,
+) -> githubGraphQL.GitHubGraphQL:
+    return githubGraphQL.GitHubGraphQL(
+        "token", f"{github.BASE}/graphql", None, pageSize
+    )
+
+
+def urls(*names: str) -> list:
+    return [github.getCorrectURL(name) for name in names]
+
+
+def test_aliasesGetManyUsersInOneQuery(graphQL):
+    client = createClient()
+
+    results = client.fetchUsers(
+        {
+            github.getCorrectURL("alice"): ["followers", "following"],
+            github.getCorrectURL("carol"): ["followers"],
+        }
+    )
+
+    assert len(graphQL.queries) == client.queries == 1
+    assert "n0: user" in graphQL.queries[0][0] and "n1: user" in graphQL.queries[0][0]
+    assert results == {
+        github.getCorrectURL("alice"): {
+            "followers": urls("bob", "carol", "dave", "erin", "frank"),
+            "following": urls("bob"),
+        },
+        github.getCorrectURL("carol"): {"followers": []},
+    }
+
+
+def test_cursorsContinueOnlyTheUnfinishedLists(graphQL):
+    client = createClient(pageSize=2)
+
+    results = client.fetchUsers(
+        {
+            github.getCorrectURL("alice"): ["followers", "following"],
+            github.getCorrectURL("bob"): ["followers"],
+        }
+    )
+
+    assert results[github.getCorrectURL("alice")]["followers"] == urls(
+        "bob", "carol", "dave", "erin", "frank"
+    )
+    assert len(graphQL.queries) == 3
+
+    # After the first page only the followers of alice are left
+    for query, variables in graphQL.queries[1:]:
+        assert query.count("c0:") == 1 and "n1:" not in query
+        assert variables["after0_0"] is not None
+
+
+def test_missingNodesAndNullElementsAreSkipped(graphQL):
+    client = createClient()
+
+    results = client.fetchUsers(
+        {
+            github.getCorrectURL("nobody"): ["followers"],
+            github.getCorrectURL("bob"): ["following"],
+        }
+    )
+
+    assert results == {
+        github.getCorrectURL("nobody"): {"followers": []},
+        github.getCorrectURL("bob"): {"following": urls("alice")},
+    }
+
+
+def test_otherErrorsAreRaised(server):
+    server.addHandler(
+        "/graphql", lambda body: {"errors": [{"type": "FORBIDDEN", "message": "No"}]}
+    )
+
+    with pytest.raises(githubGraphQL.GraphQLError):
+        createClient().fetchUsers({github.getCorrectURL("alice"): ["followers"]})
+
+
+def test_rateLimitPausesTheEndpointWhenItRunsOut(graphQL):
+    graphQL.rateLimit["remaining"] = 0
+    client = createClient()
+
+    client.fetchUsers({github.getCorrectURL("carol"): ["followers"]})
+
+    bucket = rateLimiter.LIMITER.getBucket(client.endpoint)
+    assert client.remaining == 0
+    assert bucket.pausedUntil > time.monotonic() + 3000
+
+
+def test_addUsersWithGraphQL(graphQL):
+    manager = graphGithub.GitHubGraphManager(graphqlEndpoint=f"{github.BASE}/graphql")
+    graph = nx.MultiDiGraph()
+    for user in ("alice", "carol"):
+        graph.add_node(github.getCorrectURL(user), type=("GitHub", "User"))
+
+    graph = manager.addUsersWithGraphQL(graph, batchSize=1)
+
+    alice = github.getCorrectURL("alice")
+    assert len(graphQL.queries) == 2
+    assert sorted(graph.in_edges(alice)) == sorted(
+        (follower, alice) for follower in urls("bob", "carol", "dave", "erin", "frank")
+    )
+    assert graph.has_edge(alice, github.getCorrectURL("bob"))
+    assert graph.has_edge(alice, github.getCorrectURL("alice/tool"))
+    assert graph.has_edge(alice, github.getCorrectURL("o/r"))
+    for flag in ("githubFollow", "ownedGitHubRepositories", "githubStarred"):
+        assert searchFlags.isSearched(graph.nodes[alice], flag)
+        assert searchFlags.isSearched(graph.nodes[github.getCorrectURL("carol")], flag)
+
+
+def test_addStargazersWithGraphQL(graphQL):
+    manager = graphGithub.GitHubGraphManager(graphqlEndpoint=f"{github.BASE}/graphql")
+    graph = nx.MultiDiGraph()
+    repository = github.getCorrectURL("o/r")
+    graph.add_node(repository, type=("GitHub", "Repository"))
+    graph.add_node(github.getCorrectURL("o/missing"), type=("GitHub", "Repository"))
+
+    graph = manager.addStargazersWithGraphQL(graph)
+
+    assert len(graphQL.queries) == 1
+    assert sorted(graph.in_edges(repository)) == sorted(
+        (user, repository) for user in urls("alice", "bob", "carol")
+    )
+    assert searchFlags.isSearched(graph.nodes[repository], "githubStargazers")
+
+
+def test_refreshAfterGraphQLDoesNotUseItsOrder(graphQL, server):
+    manager = graphGithub.GitHubGraphManager(graphqlEndpoint=f"{github.BASE}/graphql")
+    alice = github.getCorrectURL("alice")
+    graph = nx.MultiDiGraph()
+    graph.add_node(alice, type=("GitHub", "User"))
+
+    graph = manager.addUsersWithGraphQL(graph, relations=("connections",))
+
+    # The order of the GraphQL lists isn't newest first
+    assert searchFlags.getInfo(graph.nodes[alice], "githubFollowersNewest") is None
+
+    # The pages show the new followers in front of the known ones
+    server.addPage(
+        "/alice?tab=followers",
+        standIn.connectionPage(["/new", "/frank", "/bob", "/newer", "/erin"]),
+    )
+    server.addPage("/alice?tab=following", standIn.connectionPage(["/bob"]))
+
+    graph = manager.refreshUserConnections(graph, maxAge=0)
+
+    assert graph.has_edge(github.getCorrectURL("new"), alice)
+    assert graph.has_edge(github.getCorrectURL("newer"), alice)
+    assert searchFlags.getInfo(graph.nodes[alice], "githubFollowersNewest") == (
+        github.getCorrectURL("new")
+    )
@@ -0,0 +1,177 @@
+from modules import graph, graphIndex, sqliteGraph
+import networkx as nx
+import pytest
+import random
+import copy
+
+
+def oldRemoveUnconnectedNodes(
+    graph: nx.MultiDiGraph, desiredType: str = "Known"
+) -> nx.MultiDiGraph:
+    """
+    The implementation before the queue and the groups, kept to compare.
+
+    Removes the nodes that do are not part
+    of a path bewteen two nodes of the desiredType.
+
+    Args:
+        - graph (nx.MultiDiGraph): The graph to be cleaned.
+        - desiredType (str): The desiredType of the nodes to be kept.
+
+    Returns:
+        nx.MultiDiGraph: The cleaned graph.
+    """
+    cleanedGraph = copy.deepcopy(graph)
+
+    """
+    We start by iteratively eliminating all the nodes
+    that only have one connection and are not of the desiredType.
+    """
+
+    continueFlag = True
+    nNodes = len(cleanedGraph.nodes())
+
+    while continueFlag:
+        cleanedGraph.remove_nodes_from(
+            [
+                node
+                for node in cleanedGraph
+                if len(
+                    set(n for n in cleanedGraph.successors(node)).union(
+                        set(n for n in cleanedGraph.predecessors(node))
+                    )
+                )
+                < 2
+                and desiredType not in cleanedGraph.nodes[node]["type"]
+            ]
+        )
+
+        if nNodes == len(cleanedGraph.nodes()):
+            continueFlag = False
+
+        nNodes = len(cleanedGraph.nodes())
+
+    """
+    Now we need to eliminate all the nodes that
+    can't reach directly 2 nodes of the desiredType.
+    """
+
+    goodNodes = [
+        node for node in cleanedGraph if desiredType in cleanedGraph.nodes[node]["type"]
+    ]
+
+    notCheckedSymbol = "Not Checked"
+
+    eliminateNodes = {
+        node: notCheckedSymbol for node in cleanedGraph if node not in goodNodes
+    }
+
+    for n in list(eliminateNodes.keys()):
+        if eliminateNodes[n] == notCheckedSymbol:
+            goodFoundNodes = set()
+            foundNodes = set([n])
+            frontier = [n]
+
+            while frontier:
+                node = frontier.pop()
+
+                for neighbor in set(cleanedGraph.successors(node)) | set(
+                    cleanedGraph.predecessors(node)
+                ):
+
+                    if neighbor in goodNodes:
+                        # It means there is a path to a desiredType node
+                        goodFoundNodes.add(neighbor)
+
+                    elif neighbor not in foundNodes:
+                        foundNodes.add(neighbor)
+                        frontier.append(neighbor)
+
+                        if (
+                            not eliminateNodes[neighbor]
+                            and eliminateNodes[neighbor] != notCheckedSymbol
+                        ):
+                            # The neighbour has been marked as safe
+                            # We fill the goodFoundNodes to mark all the foundNodes as not to be eliminated
+                            # 2 and 3 are just random numbers
+                            goodFoundNodes.add("Garbage 1")
+                            goodFoundNodes.add("Garbage 2")
+
+                if len(goodFoundNodes) >= 2:
+                    for node in foundNodes:
+                        eliminateNodes[node] = False
+                    frontier = []
+
+            if len(goodFoundNodes) < 2:
+                for node in foundNodes:
+                    eliminateNodes[node] = True
+
+    # We check that all the values are booleans
+    assert all(isinstance(eliminateNodes[node], bool) for node in eliminateNodes)
+
+    cleanedGraph.remove_nodes_from(
+        [node for node in eliminateNodes if eliminateNodes[node]]
+    )
+
+    return cleanedGraph
+
+
+def createRandomGraph(seed: int) -> nx.MultiDiGraph:
+    """
+    Create a random graph with parallel edges, self-loops and "Known" nodes.
+    """
+    generator = random.Random(seed)
+    nNodes = generator.randint(1, 60)
+    knownProbability = generator.choice((0.02, 0.1, 0.3))
+
+    randomGraph = nx.MultiDiGraph()
+
+    for i in range(nNodes):
+        known = generator.random() < knownProbability
+        randomGraph.add_node(
+            f"n{i}", type=("GitHub", "Known") if known else ("GitHub", "User")
+        )
+
+    for _ in range(int(nNodes * generator.choice((0.8, 1.2, 2.0)))):
+        u = f"n{generator.randrange(nNodes)}"
+        v = u if generator.random() < 0.05 else f"n{generator.randrange(nNodes)}"
+        randomGraph.add_edge(u, v)
+
+    return randomGraph
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_removeUnconnectedNodesIsTheSame(seed):
+    randomGraph = createRandomGraph(seed)
+    expected = oldRemoveUnconnectedNodes(randomGraph)
+
+    for graphClass in (nx.MultiDiGraph, graphIndex.IndexedGraph):
+        cleanedGraph = graph.removeUnconnectedNodes(graphClass(randomGraph))
+
+        assert list(cleanedGraph.nodes(data=True)) == list(expected.nodes(data=True))
+        assert list(cleanedGraph.edges(data=True)) == list(expected.edges(data=True))
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_removeUnconnectedNodesIsTheSameInSQLite(seed):
+    randomGraph = createRandomGraph(seed)
+    expected = oldRemoveUnconnectedNodes(randomGraph)
+
+    storedGraph = sqliteGraph.SQLiteGraph(":memory:")
+    storedGraph.add_nodes_from(randomGraph.nodes(data=True))
+    storedGraph.add_edges_from(randomGraph.edges(data=True))
+    cleanedGraph = graph.removeUnconnectedNodes(storedGraph)
+
+    assert list(cleanedGraph) == list(expected)
+    assert sorted(cleanedGraph.edges()) == sorted(expected.edges())
+
+
+def test_removeUnconnectedNodesOfAChain():
+    chain = nx.MultiDiGraph()
+    chain.add_node("n0", type=("GitHub", "Known"))
+
+    for i in range(1, 5000):
+        chain.add_node(f"n{i}", type=("GitHub", "User"))
+        chain.add_edge(f"n{i - 1}", f"n{i}")
+
+    assert list(graph.removeUnconnectedNodes(chain)) == ["n0"]
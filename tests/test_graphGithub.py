@@ -0,0 +1,195 @@
+from modules import github, graphGithub, searchFlags
+from tests import standIn
+import networkx as nx
+
+
+def addStargazerPages(server: standIn.StandInServer, repository: str) -> None:
+    """
+    Add a list of 3 stargazers in 2 pages and make the second page fail once.
+    """
+    server.addPage(
+        f"/{repository}/stargazers",
+        standIn.stargazersPage(
+            [f"/{repository}-s1", f"/{repository}-s2"],
+            f"/{repository}/stargazers?page=2",
+        ),
+    )
+    server.addPage(
+        f"/{repository}/stargazers?page=2",
+        standIn.stargazersPage([f"/{repository}-s3"]),
+    )
+    server.fail(f"/{repository}/stargazers?page=2")
+
+
+def createGraph(*repositories: str) -> nx.MultiDiGraph:
+    graph = nx.MultiDiGraph()
+
+    for repository in repositories:
+        graph.add_node(github.getCorrectURL(repository), type=("GitHub", "Repository"))
+
+    return graph
+
+
+def test_expandDoesNotKeepHalfOfAFailedRelation(server):
+    addStargazerPages(server, "o/r")
+    manager = graphGithub.GitHubGraphManager()
+    repository = github.getCorrectURL("o/r")
+
+    graph = manager.expand(createGraph("o/r"), relations=("stargazers",))
+
+    assert graph.number_of_edges() == 0
+    assert list(graph) == [repository]
+    assert not searchFlags.isSearched(graph.nodes[repository], "githubStargazers")
+
+    graph = manager.expand(graph, relations=("stargazers",))
+    expected = manager.addStargazers(createGraph("o/r"))
+
+    assert graph.number_of_edges() == expected.number_of_edges() == 3
+    assert sorted(graph.edges()) == sorted(expected.edges())
+    assert searchFlags.isSearched(graph.nodes[repository], "githubStargazers")
+
+
+def test_crawlDoesNotKeepHalfOfAFailedRelation(server):
+    addStargazerPages(server, "o/r")
+    manager = graphGithub.GitHubGraphManager()
+    repository = github.getCorrectURL("o/r")
+
+    graph = manager.crawl(
+        createGraph("o/r"), seeds=[repository], relations=("stargazers",)
+    )
+
+    assert graph.number_of_edges() == 0
+    assert not searchFlags.isSearched(graph.nodes[repository], "githubStargazers")
+
+    graph = manager.crawl(graph, seeds=[repository], relations=("stargazers",))
+
+    assert graph.number_of_edges() == 3
+    assert len(set(graph.edges())) == 3
+
+
+def test_rollbackKeepsTheEdgesAddedBefore():
+    graph = nx.MultiDiGraph()
+    batch = graphGithub.GraphBatch(graph)
+
+    batch.addNode("a", type=("GitHub", "User"))
+    batch.addEdge("a", "b")
+    savepoint = batch.savepoint()
+
+    batch.addNode("c", type=("GitHub", "User"))
+    batch.addEdge("a", "b")
+    batch.addEdge("a", "c")
+    batch.mark("a", githubFollow=True)
+    batch.rollback(savepoint)
+
+    assert list(batch.nodes) == ["a"]
+    assert batch.edges == [("a", "b", {})]
+    assert batch.hasEdge("a", "b")
+    assert not batch.hasEdge("a", "c")
+    assert batch.marks == {}
+
+
+def addParentPages(server: standIn.StandInServer) -> None:
+    """
+    Add the pages of some forks and make one of them fail once.
+    """
+    parents = {"o/a": "o/b", "o/b": "o/c", "o/c": None, "o/d": "o/i", "o/i": "o/c"}
+    parents.update({"o/e": "o/f", "o/f": None, "o/g": "o/h", "o/h": None})
+
+    for repository, parent in parents.items():
+        meta = (
+            f'<meta name="octolytics-dimension-repository_parent_nwo" content="{parent}">'
+            if parent
+            else ""
+        )
+        server.addPage(f"/{repository}", f"<html><head>{meta}</head></html>")
+
+    server.fail("/o/e")
+
+
+def test_parallelParentsAreAddedInTheSerialOrder(server):
+    graphs = []
+
+    for maxWorkers in (1, 4):
+        github.clearRepositoryPages()
+        addParentPages(server)
+        manager = graphGithub.GitHubGraphManager(maxWorkers=maxWorkers)
+
+        graphs.append(
+            manager.addParentsToRepository(createGraph("o/a", "o/d", "o/e", "o/g"))
+        )
+
+    serial, parallel = graphs
+
+    assert list(parallel.nodes(data=True)) == list(serial.nodes(data=True))
+    assert list(parallel.edges(data=True)) == list(serial.edges(data=True))
+    assert serial.number_of_edges() == 5
+    assert not searchFlags.isSearched(
+        serial.nodes[github.getCorrectURL("o/e")], "githubParent"
+    )
+
+
+def addFollowerPages(server: standIn.StandInServer, user: str, pages: list) -> None:
+    """
+    Add the followers of a user in some pages and an empty following list.
+    """
+    for page, followers in enumerate(pages, 1):
+        path = (
+            f"/{user}?tab=followers"
+            if page == 1
+            else f"/{user}?page={page}&tab=followers"
+        )
+        nextPage = (
+            f"/{user}?page={page + 1}&tab=followers" if page < len(pages) else None
+        )
+        server.addPage(path, standIn.connectionPage(followers, nextPage))
+
+    server.addPage(f"/{user}?tab=following", standIn.connectionPage([]))
+
+
+def test_refreshStopsAtTheNewestKnownFollower(server):
+    addFollowerPages(server, "u", [["/a", "/b"], ["/c"]])
+    manager = graphGithub.GitHubGraphManager()
+    user = github.getCorrectURL("u")
+    graph = nx.MultiDiGraph()
+    graph.add_node(user, type=("GitHub", "User"))
+
+    graph = manager.addUserConnections(graph)
+
+    assert searchFlags.getInfo(graph.nodes[user], "githubFollowersNewest") == (
+        github.getCorrectURL("a")
+    )
+
+    # The new followers are shown in front of the known ones
+    addFollowerPages(server, "u", [["/n1", "/n2", "/a"], ["/b", "/c"]])
+    server.requests.clear()
+
+    graph = manager.refreshUserConnections(graph, maxAge=0)
+
+    assert sorted(graph.predecessors(user)) == sorted(
+        github.getCorrectURL(name) for name in ("a", "b", "c", "n1", "n2")
+    )
+    assert "/u?page=2&tab=followers" not in server.requests
+    assert searchFlags.getInfo(graph.nodes[user], "githubFollowersNewest") == (
+        github.getCorrectURL("n1")
+    )
+
+
+def test_refreshStopsAfterTheKnownStargazers(server):
+    server.addPage("/o/r/stargazers", standIn.stargazersPage(["/a", "/b", "/c"]))
+    manager = graphGithub.GitHubGraphManager()
+    repository = github.getCorrectURL("o/r")
+    graph = manager.addStargazers(createGraph("o/r"))
+
+    server.addPage(
+        "/o/r/stargazers",
+        standIn.stargazersPage(["/n", "/c", "/b"], "/o/r/stargazers?page=2"),
+    )
+    server.addPage("/o/r/stargazers?page=2", standIn.stargazersPage(["/a"]))
+    server.requests.clear()
+    # The newest stargazer of the last walk left
+    searchFlags.update(graph.nodes[repository], {"githubStargazersNewest": None})
+
+    graph = manager.refreshStargazers(graph, maxAge=0, stopAfterKnown=2)
+
+    assert graph.has_edge(github.getCorrectURL("n"), repository)
+    assert server.requests == ["/o/r/stargazers"]
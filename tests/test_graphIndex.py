@@ -0,0 +1,91 @@
+from modules import graphIndex, searchFlags
+import networkx as nx
+
+
+def createGraph() -> graphIndex.IndexedGraph:
+    graph = graphIndex.IndexedGraph()
+    graph.add_node("a", type=("GitHub", "User"))
+    graph.add_node("r", type=("GitHub", "Repository"))
+    graph.add_node("b", type=("GitHub", "User"))
+    graph.add_node("c", type=("GitHub", "User"))
+
+    return graph
+
+
+def assertInSync(graph: graphIndex.IndexedGraph) -> None:
+    """
+    Check that the index gives the same nodes as going through the graph.
+    """
+    plain = nx.MultiDiGraph(graph)
+
+    for words in [("GitHub",), ("User",), ("Repository",), ("GitHub", "User")]:
+        assert graph.nodesOfType(*words) == graphIndex.nodesOfType(plain, *words)
+
+    # A node that comes back to the pending nodes goes to the end
+    for words, searchKey in list(graph.pendingIndex):
+        assert sorted(graph.pendingNodes(searchKey, *words)) == sorted(
+            graphIndex.pendingNodes(plain, searchKey, *words)
+        )
+
+    for key, nodes in graph.searchedIndex.items():
+        assert list(nodes) == [
+            node
+            for node, attributes in graph.nodes(data=True)
+            if key in searchFlags.searchedKeys(attributes)
+        ]
+
+
+def test_theIndexFollowsTheChanges():
+    graph = createGraph()
+    assert graph.pendingNodes("githubFollow", "User") == ["a", "b", "c"]
+
+    graphIndex.setSearchData(graph, "b", {"githubFollow": True})
+    assertInSync(graph)
+    assert graph.pendingNodes("githubFollow", "User") == ["a", "c"]
+
+    graph.add_edge("a", "d")
+    graph.add_node("d", type=("GitHub", "User"))
+    graph.add_nodes_from([("e", {"type": ("GitHub", "User")}), "f"])
+    graph.add_edges_from([("e", "g")])
+    assertInSync(graph)
+    assert graph.pendingNodes("githubFollow", "User") == ["a", "c", "d", "e"]
+
+    graph.remove_node("a")
+    graph.remove_nodes_from(["e", "missing"])
+    assertInSync(graph)
+    assert graph.nodesOfType("User") == ["b", "c", "d"]
+
+    # The type changes with add_node
+    graph.add_node("c", type=("GitHub", "Organization"))
+    assertInSync(graph)
+    assert graph.pendingNodes("githubFollow", "User") == ["d"]
+
+    graphIndex.setSearchData(graph, "b", {"githubFollow": False})
+    assertInSync(graph)
+    assert graph.pendingNodes("githubFollow", "User") == ["d", "b"]
+
+
+def test_touchingANodeKeepsTheOrder():
+    graph = createGraph()
+    graph.pendingNodes("githubFollow", "User")
+
+    graph.add_node("a", color="red")
+    graphIndex.setSearchData(graph, "a", {"githubFollowRefreshed": 5.0})
+    graphIndex.setSearchData(graph, "b", {"githubStarred": True})
+
+    assert graph.nodesOfType("User") == ["a", "b", "c"]
+    assert graph.pendingNodes("githubFollow", "User") == ["a", "b", "c"]
+    assertInSync(graph)
+
+
+def test_clearAndCopies():
+    graph = createGraph()
+    graphIndex.setSearchData(graph, "a", {"githubFollow": True})
+
+    copy = graphIndex.IndexedGraph(graph)
+    assert copy.nodesOfType("User") == ["a", "b", "c"]
+    assert copy.pendingNodes("githubFollow", "User") == ["b", "c"]
+
+    graph.clear()
+    assert graph.nodesOfType("User") == []
+    assert graph.pendingNodes("githubFollow", "User") == []
@@ -0,0 +1,52 @@
+from modules import github, httpCache, httpClient
+from concurrent.futures import ThreadPoolExecutor
+
+
+def test_secretsAreNotStored(server, tmp_path):
+    server.addPage("/api?steamid=1", "{}")
+    server.addPage("/api?steamid=1&key=secret", "{}")
+    cache = httpCache.ResponseCache(str(tmp_path / "cache.sqlite"))
+    url = f"{github.BASE}/api"
+
+    first = httpClient.getFromCache(url, {"steamid": 1, "key": "secret"}, cache=cache)
+    second = httpClient.getFromCache(url, {"steamid": 1, "key": "other"}, cache=cache)
+
+    assert (first.cacheResult, second.cacheResult) == ("miss", "hit")
+    assert second.url == f"{url}?steamid=1"
+
+    rows = cache.connection.execute("SELECT key, url FROM responses").fetchall()
+    assert len(rows) == 1
+    assert "secret" not in rows[0][1]
+    assert rows[0][0] == cache.getKey(url, {"steamid": 1})
+
+    cache.close()
+
+
+def test_removeSecretsKeepsTheOtherParameters():
+    url = "https://api.steampowered.com/x/?key=abc&steamid=1&format=json"
+
+    assert (
+        httpCache.removeSecrets(url)
+        == "https://api.steampowered.com/x/?steamid=1&format=json"
+    )
+
+
+def test_resultsAreCountedFromSeveralThreads(server, tmp_path):
+    server.addPage("/page", "Page")
+    cache = httpCache.ResponseCache(str(tmp_path / "cache.sqlite"))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(
+                lambda _: httpClient.getFromCache(
+                    f"{github.BASE}/page", cache=cache
+                ).cacheResult,
+                range(200),
+            )
+        )
+
+    assert cache.hits == results.count("hit")
+    assert cache.misses == results.count("miss")
+    assert cache.hits + cache.misses == 200
+
+    cache.close()
@@ -0,0 +1,26 @@
+from modules import httpClient, retrying
+import requests
+import socket
+import pytest
+
+
+def test_sendTimesOutWhenTheServerDoesNotAnswer(server, monkeypatch):
+    monkeypatch.setattr(
+        retrying, "POLICY", retrying.RetryPolicy(maxRetries=1, backoffFactor=0)
+    )
+
+    # It accepts the connections but never answers
+    silent = socket.socket()
+    silent.bind(("127.0.0.1", 0))
+    silent.listen()
+    url = f"http://127.0.0.1:{silent.getsockname()[1]}/"
+
+    with pytest.raises(requests.Timeout):
+        httpClient.send(httpClient.createSession(), url, timeout=(1, 0.2))
+
+    monkeypatch.setattr(httpClient, "DEFAULT_TIMEOUT", (1, 0.2))
+
+    with pytest.raises(requests.Timeout):
+        httpClient.send(httpClient.createSession(), url, json={})
+
+    silent.close()
@@ -0,0 +1,136 @@
+from modules import github, metrics
+import threading
+import json
+import pytest
+
+
+@pytest.fixture
+def registry(monkeypatch) -> metrics.MetricsRegistry:
+    registry = metrics.MetricsRegistry()
+    monkeypatch.setattr(metrics, "REGISTRY", registry)
+
+    return registry
+
+
+@pytest.mark.parametrize(
+    "url, endpoint",
+    [
+        ("https://github.com/alice", "/:user"),
+        ("https://github.com/alice?tab=followers&page=2", "/:user?tab=followers"),
+        ("https://github.com/o/r/stargazers?page=3", "/:owner/:repo/stargazers"),
+        (
+            "https://api.github.com/repos/o/r/contributors",
+            "/repos/:owner/:repo/contributors",
+        ),
+        ("https://api.github.com/users/alice", "/users/:user"),
+        ("https://steamcommunity.com/id/bob/friends", "/id/:user/friends"),
+        ("https://example.com", "/"),
+    ],
+)
+def test_getEndpoint(url, endpoint):
+    assert metrics.getEndpoint(url) == endpoint
+
+
+def test_theRequestsAreCountedByEndpoint(registry):
+    registry.recordCall("https://github.com/alice", "miss")
+    registry.recordRequest("https://github.com/alice", 200, 100, 0.07)
+    registry.recordCall("https://github.com/bob", "hit")
+    registry.recordCall("https://github.com/carol", "revalidated")
+    registry.recordRequest("https://github.com/carol", 304, 0, 3.0)
+    registry.recordRequest("https://github.com/dave", None, 0, 60.0)
+
+    stats = registry.snapshot()["endpoints"]["github.com"]["/:user"]
+
+    assert stats["calls"] == 3
+    assert stats["requests"] == 3
+    assert stats["bytes"] == 100
+    assert stats["statuses"] == {"200": 1, "304": 1, "error": 1}
+    assert (stats["cacheHits"], stats["cacheMisses"]) == (2, 1)
+    assert stats["latencySum"] == 63.07
+    assert stats["latencyBuckets"] == [0, 1, 0, 0, 0, 0, 1, 0, 1]
+
+
+def test_countAddsTheHosts(registry):
+    registry.recordCall("https://github.com/alice")
+    registry.recordCall("https://github.com/o/r")
+    registry.recordCall("https://api.github.com/users/alice", "miss")
+
+    assert registry.count("calls") == 3
+    assert registry.count("calls", ("github.com",)) == 2
+    assert registry.count("cacheMisses", ("github.com", "api.github.com")) == 1
+    assert registry.count("calls", ("example.com",)) == 0
+
+
+def test_theSnapshotIsACopy(registry):
+    registry.recordCall("https://github.com/alice")
+    registry.recordParse("githubConnection", 0.5)
+
+    snapshot = registry.snapshot()
+    registry.recordCall("https://github.com/alice")
+    registry.reset()
+
+    assert snapshot["endpoints"]["github.com"]["/:user"]["calls"] == 1
+    assert snapshot["parsers"] == {"githubConnection": {"parses": 1, "seconds": 0.5}}
+    assert registry.snapshot()["endpoints"] == {}
+    assert json.loads(registry.toJSON())["parsers"] == {}
+
+
+def test_theCountersAreThreadSafe(registry):
+    def record() -> None:
+        for _ in range(1000):
+            registry.recordCall("https://github.com/alice")
+
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert registry.count("calls") == 8000
+
+
+def test_toPrometheus(registry):
+    registry.recordCall("https://github.com/alice", "hit")
+    registry.recordRequest("https://github.com/alice", 200, 10, 0.3)
+    registry.recordParse("githubConnection", 0.25)
+
+    lines = registry.toPrometheus().splitlines()
+    labels = 'host="github.com",endpoint="/:user"'
+
+    assert f"scraper_calls_total{{{labels}}} 1" in lines
+    assert f"scraper_cache_hits_total{{{labels}}} 1" in lines
+    assert f'scraper_responses_total{{{labels},status="200"}} 1' in lines
+    assert f'scraper_request_latency_seconds_bucket{{{labels},le="0.25"}} 0' in lines
+    assert f'scraper_request_latency_seconds_bucket{{{labels},le="0.5"}} 1' in lines
+    assert f'scraper_request_latency_seconds_bucket{{{labels},le="+Inf"}} 1' in lines
+    assert f"scraper_request_latency_seconds_count{{{labels}}} 1" in lines
+    assert 'scraper_parse_seconds_total{parser="githubConnection"} 0.25' in lines
+
+
+def test_theCountersOfTheModulesAreViews(registry):
+    registry.recordCall("https://github.com/alice", "miss")
+    registry.recordCall("https://github.com/o/r", "hit")
+    registry.recordCall("https://api.github.com/repos/o/r/contributors", "miss")
+    registry.recordCall("https://steamcommunity.com/id/bob")
+
+    assert github.NORMALCALLS == 2
+    assert github.APICALLS == 1
+    assert github.CACHEHITS == 1
+    assert github.CACHEMISSES == 2
+
+    registry.reset()
+
+    assert github.NORMALCALLS == github.APICALLS == 0
+
+    with pytest.raises(AttributeError):
+        github.MISSING
+
+
+def test_theCountersCantBeAssigned(registry):
+    registry.recordCall("https://github.com/alice")
+
+    with pytest.raises(AttributeError, match="REGISTRY.reset"):
+        github.NORMALCALLS = 0
+
+    assert github.NORMALCALLS == 1
+    assert "NORMALCALLS" not in vars(github)
@@ -0,0 +1,167 @@
+from modules import graphGithub, rateLimiter
+from email.utils import formatdate
+import asyncio
+import pytest
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        """
+        Initialize the FakeClock.
+
+        It replaces the time module of rateLimiter, so the
+        sleeps move the clock instead of waiting.
+
+        Returns:
+            - None
+        """
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return 1_700_000_000 + self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(rateLimiter, "time", clock)
+
+    return clock
+
+
+def test_theBucketAllowsABurstAndThenTheRate(clock):
+    bucket = rateLimiter.TokenBucket(rate=2.0, capacity=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # The waiting callers are queued one after another
+    assert [bucket.reserve() for _ in range(3)] == [0.5, 1.0, 1.5]
+
+
+def test_theTokensAreRefilledUpToTheCapacity(clock):
+    bucket = rateLimiter.TokenBucket(rate=2.0, capacity=3)
+    for _ in range(3):
+        bucket.reserve()
+
+    clock.now += 100
+
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.0, 0.5]
+
+
+def test_acquireSleepsTheReservedTime(clock):
+    bucket = rateLimiter.TokenBucket(rate=4.0, capacity=1)
+
+    for _ in range(3):
+        bucket.acquire()
+
+    assert clock.sleeps == [0.25, 0.25]
+
+
+def test_acquireAsyncSleepsTheReservedTime(clock, monkeypatch):
+    sleeps = []
+
+    async def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(rateLimiter.asyncio, "sleep", sleep)
+    bucket = rateLimiter.TokenBucket(rate=4.0, capacity=1)
+
+    async def acquireAll() -> None:
+        for _ in range(3):
+            await bucket.acquireAsync()
+
+    asyncio.run(acquireAll())
+
+    assert sleeps == [0.25, 0.5]
+
+
+def test_theHostsHaveTheirOwnBuckets(clock):
+    limiter = rateLimiter.RateLimiter(1.0, 1, limits={"a.com": (10.0, 1)})
+
+    assert limiter.getBucket("https://a.com/x") is limiter.getBucket("https://a.com/y")
+    assert limiter.getBucket("https://a.com/x").rate == 10.0
+    assert limiter.getBucket("https://b.com/x").rate == 1.0
+
+    limiter.acquire("https://a.com/x")
+    limiter.acquire("https://b.com/x")
+    assert clock.sleeps == []
+
+
+def test_theHeadersSpreadTheRemainingRequests(clock):
+    limiter = rateLimiter.RateLimiter()
+    reset = str(int(clock.time() + 50))
+
+    limiter.update(
+        "https://api.com/x",
+        200,
+        {"X-RateLimit-Remaining": "100", "X-RateLimit-Reset": reset},
+    )
+
+    assert limiter.getBucket("https://api.com/").rate == 2.0
+
+
+def test_noRemainingRequestsPausesUntilTheReset(clock):
+    limiter = rateLimiter.RateLimiter()
+    reset = str(int(clock.time() + 50))
+
+    limiter.update(
+        "https://api.com/x",
+        403,
+        {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset},
+    )
+
+    # The pause empties the bucket, so the request also waits for its token
+    assert limiter.getBucket("https://api.com/").reserve() == 50.0 + 0.5
+
+
+@pytest.mark.parametrize(
+    "headers, pause",
+    [
+        ({"Retry-After": "30"}, 30.0),
+        ({"Retry-After": "soon"}, 60.0),
+        ({}, 60.0),
+    ],
+)
+def test_tooManyRequestsPauses(clock, headers, pause):
+    limiter = rateLimiter.RateLimiter(defaultPause=60.0)
+
+    limiter.update("https://api.com/x", 429, headers)
+
+    assert limiter.getBucket("https://api.com/").reserve() == pause + 0.5
+
+
+def test_retryAfterCanBeADate(clock):
+    assert rateLimiter.parseRetryAfter(formatdate(clock.time() + 120)) == 120.0
+    assert rateLimiter.parseRetryAfter(formatdate(clock.time() - 120)) == 0.0
+    assert rateLimiter.parseRetryAfter(None) is None
+
+
+def test_setLimitChangesABucketInUse(clock):
+    limiter = rateLimiter.RateLimiter(2.0, 10)
+    bucket = limiter.getBucket("https://github.com/a")
+
+    limiter.setLimit("github.com", 20.0, 2)
+
+    assert limiter.getBucket("https://github.com/b") is bucket
+    assert (bucket.rate, bucket.capacity) == (20.0, 2)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.05]
+
+    # A host without a bucket gets it when it is created
+    limiter.setLimit("example.com", 5.0)
+    assert limiter.getBucket("https://example.com").rate == 5.0
+    assert limiter.getBucket("https://example.com").capacity == 10
+
+
+def test_theManagerCanRaiseTheRateOfThePages(clock, monkeypatch):
+    monkeypatch.setattr(rateLimiter, "LIMITER", rateLimiter.RateLimiter(2.0, 10))
+
+    graphGithub.GitHubGraphManager(requestsPerSecond=8.0)
+
+    assert rateLimiter.LIMITER.getBucket("https://github.com/u").rate == 8.0
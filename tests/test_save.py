@@ -0,0 +1,69 @@
+from modules import compactGraph, graph
+from tests.test_compactGraph import assertSameGraph, createGraph
+import networkx as nx
+import numpy as np
+import pytest
+
+
+def test_saveAndLoad(tmp_path):
+    original = createGraph()
+
+    graph.save(original, str(tmp_path / "graph"))
+    loaded = graph.load(str(tmp_path / "graph"), mmap=False)
+
+    assertSameGraph(loaded.toNetworkx(), original)
+
+
+def test_loadMapsTheArrays(tmp_path):
+    original = createGraph()
+    graph.save(compactGraph.CompactGraph.fromNetworkx(original), str(tmp_path))
+
+    loaded = graph.load(str(tmp_path))
+
+    for name in compactGraph.NODE_ARRAYS + compactGraph.EDGE_ARRAYS:
+        assert isinstance(getattr(loaded, name), np.memmap)
+        assert not getattr(loaded, name).flags.writeable
+    assertSameGraph(loaded.toNetworkx(), original)
+    assert loaded.successors("b") == list(original.successors("b"))
+
+
+def test_loadWithoutTheEdges(tmp_path):
+    original = createGraph()
+    graph.save(original, str(tmp_path))
+
+    loaded = graph.load(str(tmp_path), edges=False)
+
+    assert loaded.numberOfEdges() == 0
+    assert list(loaded.toNetworkx().nodes(data=True)) == list(original.nodes(data=True))
+
+
+def test_loadWithoutTheNodes(tmp_path):
+    original = createGraph()
+    graph.save(original, str(tmp_path))
+
+    loaded = graph.load(str(tmp_path), nodes=False)
+
+    assert len(loaded) == len(original)
+    assert loaded.sources.tolist() == [0, 0, 1, 1, 1, 2, 3]
+
+    with pytest.raises(ValueError):
+        loaded.toNetworkx()
+    with pytest.raises(ValueError):
+        loaded.successors("a")
+
+
+def test_saveAndLoadAnEmptyGraph(tmp_path):
+    graph.save(nx.MultiDiGraph(), str(tmp_path))
+
+    loaded = graph.load(str(tmp_path))
+
+    assert len(loaded) == 0 and loaded.numberOfEdges() == 0
+    assert len(loaded.toNetworkx()) == 0
+
+
+def test_loadRefusesOtherVersions(tmp_path, monkeypatch):
+    graph.save(createGraph(), str(tmp_path))
+    monkeypatch.setattr(compactGraph, "FORMAT_VERSION", 2)
+
+    with pytest.raises(ValueError):
+        graph.load(str(tmp_path))
@@ -0,0 +1,154 @@
+from modules import graphIndex, searchFlags
+import networkx as nx
+import pytest
+
+
+def createLegacyGraph() -> nx.MultiDiGraph:
+    """
+    Create a graph saved before the flags existed.
+    """
+    graph = nx.MultiDiGraph()
+    graph.add_node(
+        "u",
+        type=("GitHub", "User"),
+        searchData={
+            "githubFollow": True,
+            "githubFollowRefreshed": 5.0,
+            "githubStarred": False,
+            "custom": True,
+        },
+    )
+    graph.add_node("v", type=("GitHub", "User"))
+
+    return graph
+
+
+@pytest.mark.parametrize("key", list(searchFlags.FLAGS))
+def test_eachFlagIsSetCheckedAndCleared(key):
+    graph = nx.MultiDiGraph()
+    graph.add_node("a", type=("T",))
+    graph.add_node("b", type=("T",))
+
+    assert graphIndex.pendingNodes(graph, key, "T") == ["a", "b"]
+
+    graphIndex.setSearchData(graph, "a", {key: True})
+    attributes = graph.nodes["a"]
+
+    assert attributes[searchFlags.FLAGS_ATTRIBUTE] == searchFlags.FLAGS[key]
+    assert searchFlags.INFO_ATTRIBUTE not in attributes
+    assert searchFlags.isSearched(attributes, key)
+    assert searchFlags.searchedKeys(attributes) == [key]
+    assert all(
+        not searchFlags.isSearched(attributes, other)
+        for other in searchFlags.FLAGS
+        if other != key
+    )
+    assert graphIndex.pendingNodes(graph, key, "T") == ["b"]
+
+    graphIndex.setSearchData(graph, "a", {key: False})
+
+    assert not searchFlags.isSearched(attributes, key)
+    assert searchFlags.FLAGS_ATTRIBUTE not in attributes
+    assert graphIndex.pendingNodes(graph, key, "T") == ["a", "b"]
+
+
+def test_flagsAreKeptTogether():
+    attributes = {}
+
+    searchFlags.update(attributes, {"githubFollow": True, "githubStarred": True})
+    searchFlags.update(attributes, {"githubFollow": False})
+
+    assert attributes[searchFlags.FLAGS_ATTRIBUTE] == searchFlags.FLAGS["githubStarred"]
+    assert searchFlags.searchedKeys(attributes) == ["githubStarred"]
+
+
+def test_otherValuesAreKeptInTheInfo():
+    attributes = {}
+
+    searchFlags.update(
+        attributes, {"githubFollow": True, "githubFollowRefreshed": 5.0, "custom": True}
+    )
+
+    assert attributes[searchFlags.INFO_ATTRIBUTE] == {
+        "githubFollowRefreshed": 5.0,
+        "custom": True,
+    }
+    assert searchFlags.getInfo(attributes, "githubFollowRefreshed") == 5.0
+    assert searchFlags.getInfo(attributes, "missing", 0) == 0
+    # A key without a bit can also mark a node
+    assert searchFlags.isSearched(attributes, "custom")
+    assert searchFlags.searchedKeys(attributes) == ["githubFollow", "custom"]
+
+
+def test_theInfoIsReplacedInsteadOfModified():
+    attributes = {}
+    searchFlags.update(attributes, {"githubFollowRefreshed": 5.0})
+    shared = attributes[searchFlags.INFO_ATTRIBUTE]
+
+    searchFlags.update(attributes, {"githubFollowRefreshed": 6.0})
+
+    assert shared == {"githubFollowRefreshed": 5.0}
+    assert searchFlags.getInfo(attributes, "githubFollowRefreshed") == 6.0
+
+
+def test_legacyNodesWorkWithoutMigrating():
+    attributes = createLegacyGraph().nodes["u"]
+
+    assert searchFlags.isSearched(attributes, "githubFollow")
+    assert not searchFlags.isSearched(attributes, "githubStarred")
+    assert searchFlags.isSearched(attributes, "custom")
+    assert searchFlags.getInfo(attributes, "githubFollowRefreshed") == 5.0
+    assert searchFlags.searchedKeys(attributes) == ["githubFollow", "custom"]
+
+
+def test_updateMovesTheLegacyData():
+    attributes = createLegacyGraph().nodes["u"]
+
+    searchFlags.update(attributes, {"githubStarred": True, "custom": False})
+
+    assert searchFlags.LEGACY_ATTRIBUTE not in attributes
+    assert attributes[searchFlags.FLAGS_ATTRIBUTE] == (
+        searchFlags.FLAGS["githubFollow"] | searchFlags.FLAGS["githubStarred"]
+    )
+    # The new values win over the old ones
+    assert attributes[searchFlags.INFO_ATTRIBUTE] == {
+        "githubFollowRefreshed": 5.0,
+        "custom": False,
+    }
+
+
+def test_migrate():
+    graph = createLegacyGraph()
+    legacy = dict(graph.nodes["u"][searchFlags.LEGACY_ATTRIBUTE])
+
+    migrated = searchFlags.migrate(graph)
+
+    # The given graph isn't modified
+    assert graph.nodes["u"][searchFlags.LEGACY_ATTRIBUTE] == legacy
+
+    attributes = migrated.nodes["u"]
+    assert searchFlags.LEGACY_ATTRIBUTE not in attributes
+    assert attributes[searchFlags.FLAGS_ATTRIBUTE] == searchFlags.FLAGS["githubFollow"]
+    assert attributes[searchFlags.INFO_ATTRIBUTE] == {
+        "githubFollowRefreshed": 5.0,
+        "custom": True,
+    }
+    assert migrated.nodes["v"] == {"type": ("GitHub", "User")}
+
+    # The same keys are found before and after
+    for key in legacy:
+        assert searchFlags.isSearched(attributes, key) == searchFlags.isSearched(
+            graph.nodes["u"], key
+        )
+    assert searchFlags.toDict(attributes) == {
+        key: value for key, value in legacy.items() if key != "githubStarred"
+    }
+    assert graphIndex.pendingNodes(migrated, "githubFollow", "User") == ["v"]
+    assert graphIndex.pendingNodes(migrated, "githubStarred", "User") == ["u", "v"]
+
+
+def test_migrateInPlace():
+    graph = createLegacyGraph()
+
+    assert searchFlags.migrate(graph, inplace=True) is graph
+    assert searchFlags.LEGACY_ATTRIBUTE not in graph.nodes["u"]
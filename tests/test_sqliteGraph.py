@@ -0,0 +1,140 @@
+from modules import graph, graphGithub, graphIndex, github, searchFlags, sqliteGraph
+from tests.test_graphGithub import createGraph
+import networkx as nx
+import pytest
+import copy
+import os
+
+
+def fillGraph(g) -> None:
+    """
+    Add the same nodes and edges to a graph using the API of networkx.
+    """
+    g.add_node("a", type=("GitHub", "User", "Known"), color="red")
+    g.add_nodes_from(["b", "c"], type=("GitHub", "User"))
+    g.add_nodes_from([("d", {"type": ("GitHub", "Repository")})])
+    g.add_edge("a", "b")
+    g.add_edge("a", "b", label="follows")
+    g.add_edges_from([("b", "c"), ("c", "a", {"label": "follows"}), ("d", "d")])
+    g.add_edge("e", "a")
+
+
+@pytest.fixture
+def stored(tmp_path) -> sqliteGraph.SQLiteGraph:
+    storedGraph = sqliteGraph.SQLiteGraph(str(tmp_path / "graph.sqlite"))
+    fillGraph(storedGraph)
+
+    yield storedGraph
+
+    storedGraph.close()
+
+
+def test_apiIsTheSameAsNetworkx(stored):
+    expected = nx.MultiDiGraph()
+    fillGraph(expected)
+
+    assert list(stored) == list(expected)
+    assert len(stored) == stored.number_of_nodes() == len(expected)
+    assert list(stored.nodes(data=True)) == list(expected.nodes(data=True))
+    assert sorted(stored.edges(data=True), key=str) == sorted(
+        expected.edges(data=True), key=str
+    )
+    assert stored.number_of_edges() == len(stored.edges) == 6
+    assert stored.number_of_edges("a", "b") == 2
+
+    for node in expected:
+        assert node in stored and stored.has_node(node)
+        assert stored.successors(node) == list(expected.successors(node))
+        assert stored.predecessors(node) == list(expected.predecessors(node))
+        assert stored.neighbors(node) == list(expected.neighbors(node))
+
+    assert stored.has_edge("c", "a") and ("c", "a") in stored.edges
+    assert not stored.has_edge("a", "c") and "z" not in stored.nodes
+
+    with pytest.raises(KeyError):
+        stored.nodes["z"]
+    with pytest.raises(nx.NetworkXError):
+        stored.successors("z")
+
+
+def test_attributesAreWrittenToTheDatabase(stored, tmp_path):
+    stored.nodes["b"]["color"] = "blue"
+    searchFlags.update(stored.nodes["b"], {"githubFollow": True})
+    stored.nodes["c"]["type"] = ("GitHub", "User", "Known")
+    stored.commit()
+
+    reopened = sqliteGraph.SQLiteGraph(str(tmp_path / "graph.sqlite"))
+
+    assert reopened.nodes["b"]["color"] == "blue"
+    assert searchFlags.isSearched(reopened.nodes["b"], "githubFollow")
+    assert reopened.nodesOfType("Known") == ["a", "c"]
+    assert graphIndex.pendingNodes(reopened, "githubFollow", "User") == ["a", "c"]
+    reopened.close()
+
+
+def test_removeNodesAndEdges(stored):
+    stored.remove_node("a")
+    stored.remove_edges_from([("d", "d")])
+
+    assert list(stored) == ["b", "c", "d", "e"]
+    assert sorted(stored.edges()) == [("b", "c")]
+
+    stored.remove_nodes_from(["b", "e"])
+
+    assert list(stored) == ["c", "d"] and stored.number_of_edges() == 0
+
+
+def test_copiesAreOwnedByTheCaller(stored, tmp_path):
+    with pytest.raises(TypeError):
+        copy.deepcopy(stored)
+    with pytest.raises(ValueError):
+        stored.copy()
+
+    copied = stored.copy(str(tmp_path / "copy.sqlite"))
+    copied.add_node("z")
+
+    assert "z" not in stored and list(copied.edges()) == list(stored.edges())
+    copied.close()
+
+    memory = sqliteGraph.SQLiteGraph(":memory:")
+    fillGraph(memory)
+    assert list(copy.deepcopy(memory).edges()) == list(memory.edges())
+
+
+def test_cleanersDontCopyTheDatabase(stored, tmp_path):
+    stored.commit()
+    files = sorted(os.listdir(tmp_path))
+
+    assert graph.removeDuplicateEdges(stored) is stored
+    assert graph.removeDirectConnections(stored) is stored
+    assert graph.removeUnconnectedNodes(stored) is stored
+
+    stored.commit()
+    assert sorted(os.listdir(tmp_path)) == files
+
+
+def test_managerRunsOnASQLiteGraph(server, tmp_path):
+    repository = github.getCorrectURL("o/r")
+    server.addPage(
+        "/o/r/stargazers",
+        '<ol class="d-block d-md-flex flex-wrap gutter list-style-none">'
+        '<li><a href="/s1" data-hovercard-type="user">s1</a></li>'
+        '<li><a href="/s2" data-hovercard-type="user">s2</a></li></ol>',
+    )
+    stored = sqliteGraph.SQLiteGraph(str(tmp_path / "graph.sqlite"))
+    stored.add_node(repository, type=("GitHub", "Repository"))
+    manager = graphGithub.GitHubGraphManager()
+
+    result = manager.addStargazers(stored, inplace=True)
+    expected = manager.addStargazers(createGraph("o/r"))
+
+    assert result is stored
+    assert list(stored) == list(expected)
+    for node in expected:
+        assert stored.nodes[node]["type"] == expected.nodes[node]["type"]
+        assert stored.nodes[node].get("searchFlags") == expected.nodes[node].get(
+            "searchFlags"
+        )
+    assert list(stored.edges(data=True)) == list(expected.edges(data=True))
+    assert graphIndex.pendingNodes(stored, "githubStargazers", "Repository") == []
+    stored.close()
@@ -0,0 +1,101 @@
+import sys
+import pytest
+
+if sys.version_info < (3, 12):
+    pytest.skip("steam needs Python 3.12", allow_module_level=True)
+
+from modules import graphIndex, graphSteam, github, retrying, steam
+import networkx as nx
+import requests
+
+USER = "id/alice/"
+FRIENDS = ["76561190000000001", "76561190000000002"]
+
+
+class PasswordManager:
+    def getValue(self, key: str) -> str:
+        """
+        Get no API key, so only the pages are used.
+
+        Args:
+            - key (str): The key to get the value for.
+
+        Returns:
+            - str: None.
+        """
+        return None
+
+
+def friendsPage(steamIDs: list) -> str:
+    """
+    Create a friends page of Steam.
+
+    Args:
+        - steamIDs (list): The IDs of the friends.
+
+    Returns:
+        - str: The HTML.
+    """
+    blocks = "".join(
+        f'<div class="selectable friend_block_v2 persona offline" data-steamid="{i}"></div>'
+        for i in steamIDs
+    )
+
+    return f"<html><body>{blocks}</body></html>"
+
+
+@pytest.fixture
+def steamServer(server, monkeypatch):
+    """
+    The StandInServer used as Steam, with two retries without waiting.
+    """
+    monkeypatch.setattr(steam, "BASE", f"{github.BASE}/")
+    monkeypatch.setattr(
+        retrying, "POLICY", retrying.RetryPolicy(maxRetries=2, backoffFactor=0)
+    )
+    server.addPage(f"/{USER}friends/", friendsPage(FRIENDS))
+
+    return server
+
+
+def createGraph() -> nx.MultiDiGraph:
+    graph = nx.MultiDiGraph()
+    graph.add_node(steam.getCorrectPersonURL(USER), type=["Steam", "User", "Known"])
+
+    return graph
+
+
+def test_getFriendsRetriesAFlakyServer(steamServer):
+    steamServer.fail(f"/{USER}friends/", times=2, status=503)
+
+    assert steam.getFriends(USER) == [
+        steam.getCorrectPersonURL(f"profiles/{i}").rstrip("/") for i in FRIENDS
+    ]
+    assert len(steamServer.requests) == 3
+
+
+def test_getFriendsRaisesWhenTheRetriesRunOut(steamServer):
+    steamServer.fail(f"/{USER}friends/", times=3, status=503)
+
+    with pytest.raises(requests.HTTPError):
+        steam.getFriends(USER)
+
+
+def test_getFriendsOfAMissingProfile(steamServer):
+    assert steam.getFriends("id/nobody/") == []
+
+
+def test_addFriendsKeepsAFailedUserPending(steamServer):
+    steamServer.fail(f"/{USER}friends/", times=3, status=503)
+    manager = graphSteam.SteamGraphManager(PasswordManager())
+    node = steam.getCorrectPersonURL(USER)
+
+    graph = manager.addFriends(createGraph())
+
+    assert graph.number_of_edges() == 0
+    assert graphIndex.pendingNodes(graph, "friends", "Steam", "User", "Known") == [node]
+
+    graph = manager.addFriends(graph)
+
+    assert graph.number_of_edges() == 2 * len(FRIENDS)
+    assert graphIndex.pendingNodes(graph, "friends", "Steam", "User", "Known") == []